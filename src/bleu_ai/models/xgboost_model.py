@@ -349,9 +349,15 @@ class XGBoostModel:
         if self.enable_monitoring and self.performance_tracker is not None:
             self.performance_tracker.start_tracking()
 
-    def _process_features(self, features: np.ndarray) -> np.ndarray:
+    def _process_features(self, features: Union[np.ndarray, bytes]) -> np.ndarray:
         """Process features through encryption, scaling, and quantum enhancement."""
-        if self.enable_encryption and self.encryption_manager is not None:
+        # Only encrypted payloads (from EncryptionManager.encrypt_data) need
+        # decrypting; plain arrays are used as they are
+        if (
+            self.enable_encryption
+            and self.encryption_manager is not None
+            and isinstance(features, bytes)
+        ):
             features = self.encryption_manager.decrypt_data(features)
 
         if self.scaler is None:
@@ -4,11 +4,15 @@ Provides dynamic learning rate optimization for neural networks.
 """
 
 import logging
-from typing import Optional
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Optional
 
 import numpy as np
 import optuna
 import torch
+import torch.multiprocessing
 import torch.nn as nn
 from sklearn.metrics import roc_auc_score
 from torch.optim.lr_scheduler import (
@@ -17,9 +21,27 @@ from torch.optim.lr_scheduler import (
     OneCycleLR,
     ReduceLROnPlateau,
 )
+from torch.utils.data import DataLoader, TensorDataset
 
 logger = logging.getLogger(__name__)
 
+# Schedule policies the range test can sweep together
+SCHEDULE_METHODS = ("cosine", "one_cycle", "cyclic", "reduce_on_plateau")
+
+
+@dataclass
+class _Run:
+    """One model trained under one schedule policy during a sweep."""
+
+    method: str
+    model: nn.Module
+    optimizer: torch.optim.Optimizer
+    scheduler: Any = None
+    lr: float = 0.0
+    best_lr: float = 0.0
+    best_score: float = -math.inf
+    history: list = field(default_factory=list)
+
 
 class AdaptiveLearningRate:
     def __init__(
@@ -30,13 +52,44 @@ class AdaptiveLearningRate:
         patience: int = 10,
         factor: float = 0.5,
         n_trials: int = 20,
+        n_steps: int = 100,
+        batch_size: int = 1024,
+        eval_every: int = 10,
+        eval_size: int = 10_000,
+        n_jobs: int = 1,
+        device: str = "cpu",
+        seed: int = 42,
     ):
+        """Initialize adaptive learning rate optimizer.
+
+        Args:
+            method: Default policy (one of ``SCHEDULE_METHODS`` or "optuna")
+            min_lr: Lower learning rate bound
+            max_lr: Upper learning rate bound
+            patience: Steps without improvement before reduce-on-plateau decays
+            factor: Reduce-on-plateau decay factor
+            n_trials: Optuna trials
+            n_steps: Mini-batch steps per range test
+            batch_size: Training mini-batch size
+            eval_every: Steps between evaluations on the held-out subsample
+            eval_size: Rows held out for evaluation (at most 20% of the data)
+            n_jobs: Processes sweeping policies in parallel
+            device: Torch device models are trained on
+            seed: Seed for the held-out split, batch order and model init
+        """
         self.method = method
         self.min_lr = min_lr
         self.max_lr = max_lr
         self.patience = patience
         self.factor = factor
         self.n_trials = n_trials
+        self.n_steps = n_steps
+        self.batch_size = batch_size
+        self.eval_every = eval_every
+        self.eval_size = eval_size
+        self.n_jobs = n_jobs
+        self.device = device
+        self.seed = seed
         self.optimizer = None
         self.scheduler = None
         self.best_lr = None
@@ -68,14 +121,8 @@ class AdaptiveLearningRate:
                 raise ValueError("No learning rate method specified")
             method = method or self.method
 
-            if method == "cosine":
-                return self._cosine_schedule(features, targets)
-            elif method == "one_cycle":
-                return self._one_cycle_schedule(features, targets)
-            elif method == "cyclic":
-                return self._cyclic_schedule(features, targets)
-            elif method == "reduce_on_plateau":
-                return self._reduce_on_plateau(features, targets)
+            if method in SCHEDULE_METHODS:
+                return self.find_learning_rates(features, targets, [method])[method]
             elif method == "optuna":
                 return self._optuna_optimization(features, targets)
             else:
@@ -85,235 +132,200 @@ class AdaptiveLearningRate:
             logging.error(f"❌ Learning rate calculation failed: {str(e)}")
             raise
 
-    def _cosine_schedule(self, features: np.ndarray, targets: np.ndarray) -> float:
-        """Calculate optimal learning rate using cosine annealing."""
+    def find_learning_rates(
+        self,
+        features: np.ndarray,
+        targets: np.ndarray,
+        methods: Optional[list[str]] = None,
+    ) -> dict[str, float]:
+        """Run the learning rate range test for several policies at once.
+
+        Features are converted to tensors once. Every policy trains its own
+        model on the same mini-batches, so one pass over the data serves all
+        of them; with ``n_jobs > 1`` the policies are split across processes
+        that share the tensors. Each policy's best learning rate is the one in
+        use at the evaluation with the highest held-out ROC AUC.
+
+        Returns:
+            dict[str, float]: Best learning rate per policy
+        """
         try:
+            if not self.initialized:
+                self.initialize()
+
+            methods = list(methods or SCHEDULE_METHODS)
+            unsupported = [m for m in methods if m not in SCHEDULE_METHODS]
+            if unsupported:
+                raise ValueError(f"Unsupported learning rate methods: {unsupported}")
             if self.max_lr is None or self.min_lr is None:
                 raise ValueError("Learning rate bounds not initialized")
 
-            # Create PyTorch model for learning rate search
-            model = self._create_model(features.shape[1])
-            optimizer = torch.optim.Adam(
-                model.parameters(), lr=self.max_lr, weight_decay=1e-4
-            )
-            scheduler = CosineAnnealingLR(optimizer, T_max=100, eta_min=self.min_lr)
-
-            # Train model with cosine annealing
-            best_lr = self.max_lr
-            best_score = 0
-
-            for _ in range(100):
-                # Train one epoch
-                model.train()
-                optimizer.zero_grad()
-                outputs = model(torch.FloatTensor(features))
-                loss = nn.BCEWithLogitsLoss()(outputs, torch.FloatTensor(targets))
-                loss.backward()
-                optimizer.step()
-                scheduler.step()
-
-                # Evaluate
-                model.eval()
-                with torch.no_grad():
-                    outputs = model(torch.FloatTensor(features))
-                    predictions = torch.sigmoid(outputs).numpy()
-                    score = roc_auc_score(targets, predictions)
-
-                    if score > best_score:
-                        best_score = score
-                        best_lr = optimizer.param_groups[0]["lr"]
+            data = self._prepare_data(features, targets)
+            n_jobs = min(self.n_jobs, len(methods))
+            if n_jobs > 1:
+                for tensor in data:
+                    tensor.share_memory_()
+                groups = [methods[i::n_jobs] for i in range(n_jobs)]
+                context = torch.multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(n_jobs, mp_context=context) as pool:
+                    results = {}
+                    for part in pool.map(self._sweep, groups, [data] * n_jobs):
+                        results.update(part)
+            else:
+                results = self._sweep(methods, data)
 
-            return best_lr
+            rates = {}
+            for method in methods:
+                rates[method], history = results[method]
+                self.learning_history.extend(history)
+            return rates
 
         except Exception as e:
-            logging.error(f"❌ Cosine schedule failed: {str(e)}")
+            logging.error(f"❌ Learning rate range test failed: {str(e)}")
             raise
 
-    def _one_cycle_schedule(self, features: np.ndarray, targets: np.ndarray) -> float:
-        """Calculate optimal learning rate using one cycle policy."""
-        try:
-            if self.max_lr is None:
-                raise ValueError("Maximum learning rate not initialized")
-
-            # Create PyTorch model for learning rate search
-            model = self._create_model(features.shape[1])
-            optimizer = torch.optim.Adam(
-                model.parameters(), lr=self.max_lr, weight_decay=1e-4
+    def _prepare_data(
+        self, features: np.ndarray, targets: np.ndarray
+    ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Materialize tensors once and hold out an evaluation subsample."""
+        x = torch.as_tensor(np.asarray(features, dtype=np.float32))
+        y = torch.as_tensor(np.asarray(targets, dtype=np.float32).reshape(-1))
+        n_eval = min(self.eval_size, max(1, len(x) // 5))
+        order = torch.randperm(
+            len(x), generator=torch.Generator().manual_seed(self.seed)
+        )
+        held_out, train = order[:n_eval], order[n_eval:]
+        return x[train], y[train], x[held_out], y[held_out]
+
+    def _start_run(self, method: str, input_size: int, lr: float) -> _Run:
+        """Create the model, optimizer and scheduler for one policy."""
+        torch.manual_seed(self.seed)
+        model = self._create_model(input_size).to(self.device)
+        optimizer = torch.optim.Adam(model.parameters(), lr=lr, weight_decay=1e-4)
+        if method == "cosine":
+            scheduler = CosineAnnealingLR(
+                optimizer, T_max=self.n_steps, eta_min=self.min_lr
             )
+        elif method == "one_cycle":
             scheduler = OneCycleLR(
                 optimizer,
                 max_lr=self.max_lr,
-                epochs=100,
-                steps_per_epoch=1,
+                total_steps=self.n_steps,
                 pct_start=0.3,
             )
-
-            # Train model with one cycle policy
-            best_lr = self.max_lr
-            best_score = 0
-
-            for _ in range(100):
-                # Train one epoch
-                model.train()
-                optimizer.zero_grad()
-                outputs = model(torch.FloatTensor(features))
-                loss = nn.BCEWithLogitsLoss()(outputs, torch.FloatTensor(targets))
-                loss.backward()
-                optimizer.step()
-                scheduler.step()
-
-                # Evaluate
-                model.eval()
-                with torch.no_grad():
-                    outputs = model(torch.FloatTensor(features))
-                    predictions = torch.sigmoid(outputs).numpy()
-                    score = roc_auc_score(targets, predictions)
-
-                    if score > best_score:
-                        best_score = score
-                        best_lr = optimizer.param_groups[0]["lr"]
-
-            return best_lr
-
-        except Exception as e:
-            logging.error(f"❌ One cycle schedule failed: {str(e)}")
-            raise
-
-    def _cyclic_schedule(self, features: np.ndarray, targets: np.ndarray) -> float:
-        """Calculate optimal learning rate using cyclic learning rate."""
-        try:
-            if self.max_lr is None or self.min_lr is None:
-                raise ValueError("Learning rate bounds not initialized")
-
-            # Create PyTorch model for learning rate search
-            model = self._create_model(features.shape[1])
-            optimizer = torch.optim.Adam(
-                model.parameters(), lr=self.max_lr, weight_decay=1e-4
-            )
+        elif method == "cyclic":
+            step_size = max(1, self.n_steps // 5)
             scheduler = CyclicLR(
                 optimizer,
                 base_lr=self.min_lr,
                 max_lr=self.max_lr,
-                step_size_up=20,
-                step_size_down=20,
-            )
-
-            # Train model with cyclic learning rate
-            best_lr = self.max_lr
-            best_score = 0
-
-            for _ in range(100):
-                # Train one epoch
-                model.train()
-                optimizer.zero_grad()
-                outputs = model(torch.FloatTensor(features))
-                loss = nn.BCEWithLogitsLoss()(outputs, torch.FloatTensor(targets))
-                loss.backward()
-                optimizer.step()
-                scheduler.step()
-
-                # Evaluate
-                model.eval()
-                with torch.no_grad():
-                    outputs = model(torch.FloatTensor(features))
-                    predictions = torch.sigmoid(outputs).numpy()
-                    score = roc_auc_score(targets, predictions)
-
-                    if score > best_score:
-                        best_score = score
-                        best_lr = optimizer.param_groups[0]["lr"]
-
-            return best_lr
-
-        except Exception as e:
-            logging.error(f"❌ Cyclic schedule failed: {str(e)}")
-            raise
-
-    def _reduce_on_plateau(self, features: np.ndarray, targets: np.ndarray) -> float:
-        """Calculate optimal learning rate using reduce on plateau."""
-        try:
-            if (
-                self.max_lr is None
-                or self.min_lr is None
-                or self.factor is None
-                or self.patience is None
-            ):
-                raise ValueError("Learning rate parameters not initialized")
-
-            # Create PyTorch model for learning rate search
-            model = self._create_model(features.shape[1])
-            optimizer = torch.optim.Adam(
-                model.parameters(), lr=self.max_lr, weight_decay=1e-4
+                step_size_up=step_size,
+                step_size_down=step_size,
             )
+        elif method == "reduce_on_plateau":
+            # Stepped once per evaluation, so patience is counted in evaluations
             scheduler = ReduceLROnPlateau(
                 optimizer,
                 mode="max",
                 factor=self.factor,
-                patience=self.patience,
+                patience=max(1, self.patience // self.eval_every),
                 min_lr=self.min_lr,
             )
+        else:
+            # Constant learning rate (Optuna trials)
+            scheduler = None
+        return _Run(method, model, optimizer, scheduler, lr=lr, best_lr=lr)
 
-            # Train model with reduce on plateau
-            best_lr = self.max_lr
-            best_score = 0
-
-            for _ in range(100):
-                # Train one epoch
-                model.train()
-                optimizer.zero_grad()
-                outputs = model(torch.FloatTensor(features))
-                loss = nn.BCEWithLogitsLoss()(outputs, torch.FloatTensor(targets))
+    def _sweep(
+        self,
+        methods: list[str],
+        data: tuple[torch.Tensor, ...],
+        lr: Optional[float] = None,
+        n_steps: Optional[int] = None,
+    ) -> dict[str, tuple[float, list[dict]]]:
+        """Train one model per policy on shared mini-batches.
+
+        Returns:
+            dict[str, tuple[float, list[dict]]]: Best learning rate and the
+            evaluation history for each policy
+        """
+        x_train, y_train, x_eval, y_eval = data
+        n_steps = n_steps or self.n_steps
+        runs = [
+            self._start_run(method, x_train.shape[1], lr or self.max_lr)
+            for method in methods
+        ]
+        loader = DataLoader(
+            TensorDataset(x_train, y_train),
+            batch_size=self.batch_size,
+            shuffle=True,
+            generator=torch.Generator().manual_seed(self.seed),
+            pin_memory=self.device.startswith("cuda"),
+        )
+        x_eval, y_eval = x_eval.to(self.device), y_eval.numpy()
+        loss_fn = nn.BCEWithLogitsLoss()
+
+        batches = iter(loader)
+        for step in range(1, n_steps + 1):
+            batch = next(batches, None)
+            if batch is None:
+                batches = iter(loader)
+                batch = next(batches)
+            inputs, labels = (t.to(self.device, non_blocking=True) for t in batch)
+
+            for run in runs:
+                run.model.train()
+                run.optimizer.zero_grad()
+                loss = loss_fn(run.model(inputs).squeeze(-1), labels)
                 loss.backward()
-                optimizer.step()
-
-                # Evaluate
-                model.eval()
-                with torch.no_grad():
-                    outputs = model(torch.FloatTensor(features))
-                    predictions = torch.sigmoid(outputs).numpy()
-                    score = roc_auc_score(targets, predictions)
-
-                    if score > best_score:
-                        best_score = score
-                        best_lr = optimizer.param_groups[0]["lr"]
-
-                    scheduler.step(score)
-
-            return best_lr
-
-        except Exception as e:
-            logging.error(f"❌ Reduce on plateau failed: {str(e)}")
-            raise
+                run.lr = run.optimizer.param_groups[0]["lr"]
+                run.optimizer.step()
+                if run.scheduler is not None and run.method != "reduce_on_plateau":
+                    run.scheduler.step()
+
+            if step % self.eval_every and step != n_steps:
+                continue
+            for run in runs:
+                score = self._evaluate(run.model, x_eval, y_eval)
+                run.history.append(
+                    {"method": run.method, "step": step, "lr": run.lr, "score": score}
+                )
+                if score > run.best_score:
+                    run.best_score, run.best_lr = score, run.lr
+                if run.method == "reduce_on_plateau":
+                    run.scheduler.step(score)
+
+        # one_cycle warms up from max_lr / div_factor and anneals far below
+        # min_lr, so keep the reported rate inside the configured bounds
+        return {
+            run.method: (min(max(run.best_lr, self.min_lr), self.max_lr), run.history)
+            for run in runs
+        }
+
+    @staticmethod
+    def _evaluate(model: nn.Module, inputs: torch.Tensor, labels: np.ndarray) -> float:
+        """ROC AUC on the held-out subsample (negative loss if one class)."""
+        model.eval()
+        with torch.no_grad():
+            logits = model(inputs).squeeze(-1)
+        if len(np.unique(labels)) < 2:
+            return -nn.BCEWithLogitsLoss()(
+                logits, torch.as_tensor(labels, device=logits.device)
+            ).item()
+        return roc_auc_score(labels, torch.sigmoid(logits).cpu().numpy())
 
     def _optuna_optimization(self, features: np.ndarray, targets: np.ndarray) -> float:
         """Calculate optimal learning rate using Optuna optimization."""
         try:
+            data = self._prepare_data(features, targets)
 
             def objective(trial):
-                # Create PyTorch model for learning rate search
+                # Train with a constant learning rate on the shared tensors
                 lr = trial.suggest_float("lr", self.min_lr, self.max_lr, log=True)
-                model = self._create_model(features.shape[1])
-                optimizer = torch.optim.Adam(
-                    model.parameters(), lr=lr, weight_decay=1e-4
-                )
-
-                # Train model
-                for _ in range(50):
-                    model.train()
-                    optimizer.zero_grad()
-                    outputs = model(torch.FloatTensor(features))
-                    loss = nn.BCEWithLogitsLoss()(outputs, torch.FloatTensor(targets))
-                    loss.backward()
-                    optimizer.step()
-
-                # Evaluate
-                model.eval()
-                with torch.no_grad():
-                    outputs = model(torch.FloatTensor(features))
-                    predictions = torch.sigmoid(outputs).numpy()
-                    score = roc_auc_score(targets, predictions)
-
-                return score
+                history = self._sweep(
+                    ["constant"], data, lr=lr, n_steps=max(1, self.n_steps // 2)
+                )["constant"][1]
+                return history[-1]["score"]
 
             # Run Optuna optimization
             study = optuna.create_study(direction="maximize")
@@ -10,6 +10,89 @@ import numpy as np
 import pennylane as qml
 import torch
 
+# Devices whose exact expectation values the batched statevector kernel
+# reproduces; other devices (e.g. hardware) are evaluated row by row
+STATEVECTOR_DEVICES = ("default.qubit", "lightning.qubit")
+# Amplitudes simulated at once, bounding kernel memory (64 MB of complex128)
+MAX_BATCH_AMPLITUDES = 2**22
+
+
+def _ring_permutation(n_qubits: int) -> torch.Tensor:
+    """Gather indices applying the CNOT ring to a flattened statevector."""
+    index = np.arange(2**n_qubits)
+    moved = index.copy()
+    pairs = [(i, i + 1) for i in range(n_qubits - 1)] + [(n_qubits - 1, 0)]
+    for control, target in pairs:
+        # Wire 0 is the most significant bit, as in PennyLane
+        control_bit = (moved >> (n_qubits - 1 - control)) & 1
+        moved ^= control_bit << (n_qubits - 1 - target)
+    # Amplitude of basis state x moves to moved[x]
+    gather = np.empty_like(index)
+    gather[moved] = index
+    return torch.as_tensor(gather)
+
+
+def _z_signs(n_qubits: int) -> torch.Tensor:
+    """PauliZ eigenvalue of each basis state on each wire, (2**n, n)."""
+    index = np.arange(2**n_qubits)[:, None]
+    bits = (index >> (n_qubits - 1 - np.arange(n_qubits))) & 1
+    return torch.as_tensor(1.0 - 2.0 * bits, dtype=torch.float64)
+
+
+def _rot_matrices(weights: torch.Tensor) -> torch.Tensor:
+    """Rot(phi, theta, omega) = RZ(omega) RY(theta) RZ(phi), (..., 2, 2)."""
+    phi, theta, omega = weights.unbind(-1)
+    cos = torch.cos(theta / 2).to(torch.complex128)
+    sin = torch.sin(theta / 2).to(torch.complex128)
+    plus = torch.exp(-0.5j * (phi + omega).to(torch.complex128))
+    minus = torch.exp(-0.5j * (phi - omega).to(torch.complex128))
+    return torch.stack(
+        [
+            torch.stack([plus * cos, -minus.conj() * sin], dim=-1),
+            torch.stack([minus * sin, plus.conj() * cos], dim=-1),
+        ],
+        dim=-2,
+    )
+
+
+def simulate_expectations(angles: torch.Tensor, weights: torch.Tensor) -> torch.Tensor:
+    """Evaluate the processor circuit for a batch of inputs in one pass.
+
+    Simulates the RX/RY encoding and the Rot/CNOT-ring layers on a batched
+    statevector and returns the PauliZ expectation of every wire. Results
+    match ``default.qubit``; the computation is differentiable in torch.
+
+    Args:
+        angles: Encoded inputs, shape (n_samples, n_qubits)
+        weights: Variational weights, shape (n_layers, n_qubits, 3)
+
+    Returns:
+        torch.Tensor: Expectation values, shape (n_samples, n_qubits)
+    """
+    n_samples, n_qubits = angles.shape
+    # RY(a) RX(a) |0> = [cos^2 + i sin^2, sin cos (1 - i)] with half angles
+    cos, sin = torch.cos(angles / 2), torch.sin(angles / 2)
+    qubits = torch.stack(
+        [torch.complex(cos**2, sin**2), torch.complex(sin * cos, -sin * cos)],
+        dim=-1,
+    )
+    state = qubits[:, 0]
+    for wire in range(1, n_qubits):
+        state = (state[:, :, None] * qubits[:, None, wire]).reshape(n_samples, -1)
+
+    gather = _ring_permutation(n_qubits)
+    rotations = _rot_matrices(weights)
+    shape = (n_samples,) + (2,) * n_qubits
+    for layer in rotations:
+        state = state.reshape(shape)
+        for wire in range(n_qubits):
+            state = torch.tensordot(state, layer[wire], dims=([wire + 1], [1]))
+            state = torch.movedim(state, -1, wire + 1)
+        state = state.reshape(n_samples, -1)[:, gather]
+
+    probabilities = state.real**2 + state.imag**2
+    return probabilities @ _z_signs(n_qubits)
+
 
 class QuantumProcessor:
     def __init__(
@@ -56,9 +139,16 @@ class QuantumProcessor:
             raise
 
     def enhance_input(
-        self, data: np.ndarray, weights: Optional[np.ndarray] = None
+        self,
+        data: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+        chunk_size: Optional[int] = None,
     ) -> np.ndarray:
-        """Enhance input data using quantum processing."""
+        """Enhance input data using quantum processing.
+
+        On statevector devices all rows are simulated together, ``chunk_size``
+        rows at a time (default: bounded by ``MAX_BATCH_AMPLITUDES``).
+        """
         try:
             if not self.initialized:
                 self.initialize()
@@ -67,67 +157,126 @@ class QuantumProcessor:
             if weights is None:
                 weights = self.rng.standard_normal((self.n_layers, self.n_qubits, 3))
 
-            # Process data in batches
-            enhanced_data = []
-            for batch in data:
-                # Normalize batch to [-π, π]
-                normalized = np.interp(
-                    batch, (batch.min(), batch.max()), (-np.pi, np.pi)
-                )
-
-                # Pad or truncate to match number of qubits
-                if len(normalized) < self.n_qubits:
-                    normalized = np.pad(
-                        normalized, (0, self.n_qubits - len(normalized))
-                    )
-                else:
-                    normalized = normalized[: self.n_qubits]
-
-                # Apply quantum circuit
-                if self.circuit is None:
-                    raise RuntimeError(
-                        "Quantum circuit not initialized. Call initialize() first."
-                    )
-                result = self.circuit(normalized, weights)
-                enhanced_data.append(result)
+            angles = self._encode(np.asarray(data, dtype=np.float64))
+            if self.device not in STATEVECTOR_DEVICES:
+                return self._enhance_rows(angles, weights)
 
-            return np.array(enhanced_data)
+            if chunk_size is None:
+                chunk_size = max(1, MAX_BATCH_AMPLITUDES // 2**self.n_qubits)
+            weights = torch.as_tensor(weights, dtype=torch.float64)
+            enhanced = np.empty(angles.shape)
+            with torch.no_grad():
+                for start in range(0, len(angles), chunk_size):
+                    chunk = torch.as_tensor(angles[start : start + chunk_size])
+                    enhanced[start : start + chunk_size] = simulate_expectations(
+                        chunk, weights
+                    ).numpy()
+            return enhanced
 
         except Exception as e:
             logging.error(f"❌ Quantum enhancement failed: {str(e)}")
             raise
 
+    def _encode(self, data: np.ndarray) -> np.ndarray:
+        """Scale each row to [-π, π] and pad or truncate it to n_qubits."""
+        low = data.min(axis=1, keepdims=True)
+        span = data.max(axis=1, keepdims=True) - low
+        # Constant rows map to π, as np.interp does
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scaled = np.where(span > 0, (data - low) / span * 2 * np.pi - np.pi, np.pi)
+
+        if scaled.shape[1] < self.n_qubits:
+            return np.pad(scaled, ((0, 0), (0, self.n_qubits - scaled.shape[1])))
+        return scaled[:, : self.n_qubits]
+
+    def _enhance_rows(self, angles: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Evaluate the QNode once per row (devices without the batched kernel)."""
+        if self.circuit is None:
+            raise RuntimeError(
+                "Quantum circuit not initialized. Call initialize() first."
+            )
+        return np.array([self.circuit(row, weights) for row in angles])
+
+    def _expectations(
+        self, angles: torch.Tensor, weights: torch.Tensor
+    ) -> torch.Tensor:
+        """Differentiable circuit outputs for a batch of encoded rows."""
+        if self.device in STATEVECTOR_DEVICES:
+            return simulate_expectations(angles, weights)
+        # Other devices: torch-interfaced QNode, one row at a time
+        return torch.stack(
+            [torch.stack(list(self.circuit(row, weights))) for row in angles]
+        )
+
     def optimize_weights(
-        self, data: np.ndarray, target: np.ndarray, n_steps: int = 100
+        self,
+        data: np.ndarray,
+        target: np.ndarray,
+        n_steps: int = 100,
+        batch_size: int = 64,
+        learning_rate: float = 0.01,
+        patience: int = 10,
+        min_delta: float = 1e-4,
     ) -> np.ndarray:
-        """Optimize quantum circuit weights."""
+        """Optimize quantum circuit weights.
+
+        Each step fits one random mini-batch, with gradients taken through
+        the circuit. Training stops early once the smoothed mini-batch loss
+        has not improved by ``min_delta`` for ``patience`` steps, and the
+        weights with the best smoothed loss are returned.
+        """
         try:
             if not self.initialized:
                 self.initialize()
 
+            angles = torch.as_tensor(self._encode(np.asarray(data, dtype=np.float64)))
+            target = torch.as_tensor(np.asarray(target, dtype=np.float64))
+            if len(angles) != len(target):
+                raise ValueError("data and target must have the same number of rows")
+            batch_size = min(batch_size, len(angles))
+
             # Initialize weights
             weights = self.rng.standard_normal((self.n_layers, self.n_qubits, 3))
             weights = torch.tensor(weights, requires_grad=True)
-            optimizer = torch.optim.Adam([weights], lr=0.01, weight_decay=1e-4)
+            optimizer = torch.optim.Adam([weights], lr=learning_rate, weight_decay=1e-4)
+            loss_fn = torch.nn.MSELoss()
+
+            best_weights = weights.detach().clone()
+            best_loss = smoothed = None
+            stale = 0
 
             # Training loop
             for step in range(n_steps):
                 optimizer.zero_grad()
 
-                # Forward pass
-                enhanced = self.enhance_input(data, weights.detach().numpy())
-
-                # Calculate loss
-                loss = torch.nn.MSELoss()(torch.tensor(enhanced), torch.tensor(target))
+                # Forward pass on a random mini-batch
+                batch = self.rng.choice(len(angles), size=batch_size, replace=False)
+                batch = torch.as_tensor(batch)
+                loss = loss_fn(
+                    self._expectations(angles[batch], weights), target[batch]
+                )
 
-                # Backward pass
+                # Backward pass (keeping the weights this loss was measured at)
                 loss.backward()
+                evaluated = weights.detach().clone()
                 optimizer.step()
 
                 if step % 10 == 0:
                     logging.info(f"Step {step}, Loss: {loss.item():.4f}")
 
-            return weights.detach().numpy()
+                # Early stopping on an exponential moving average of the loss
+                value = loss.item()
+                smoothed = value if smoothed is None else 0.9 * smoothed + 0.1 * value
+                if best_loss is None or smoothed < best_loss - min_delta:
+                    best_loss, stale = smoothed, 0
+                    best_weights = evaluated
+                else:
+                    stale += 1
+                    if stale >= patience:
+                        logging.info(f"Early stopping at step {step}")
+                        break
+
+            return best_weights.numpy()
 
         except Exception as e:
             logging.error(f"❌ Weight optimization failed: {str(e)}")
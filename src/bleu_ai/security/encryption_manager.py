@@ -4,13 +4,16 @@ Provides secure data handling and model protection capabilities.
 """
 
 import base64
+import contextlib
 import hashlib
 import hmac
+import io
 import json
 import logging
 import os
+import shutil
 from pathlib import Path
-from typing import Dict, Optional, Tuple, Union
+from typing import BinaryIO, Dict, Optional, Tuple, Union
 
 import msgpack
 import numpy as np
@@ -19,8 +22,30 @@ import torch.nn as nn
 from cryptography.fernet import Fernet
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
+from .stream_cipher import (
+    STREAM_CHUNK_SIZE,
+    STREAM_MAGIC,
+    ChunkedStreamReader,
+    ChunkedStreamWriter,
+)
+
+PathOrFile = Union[str, os.PathLike, BinaryIO]
+
+
+@contextlib.contextmanager
+def _open(target: PathOrFile, mode: str):
+    """Open a path, or pass an already open binary file through."""
+    if isinstance(target, (str, os.PathLike)):
+        if "w" in mode:
+            Path(target).parent.mkdir(parents=True, exist_ok=True)
+        with open(target, mode) as f:
+            yield f
+    else:
+        yield target
+
 
 class EncryptionManager:
     """Advanced encryption and security management system."""
@@ -37,6 +62,7 @@ class EncryptionManager:
         self.key = key
         self.salt = salt or os.urandom(16)
         self.cipher_suite: Optional[Fernet] = None
+        self.stream_key: Optional[bytes] = None
         self.initialized = False
         self.signing_key: Optional[bytes] = None
 
@@ -55,6 +81,13 @@ class EncryptionManager:
                 self.key = base64.urlsafe_b64encode(kdf.derive(os.urandom(32)))
 
             self.cipher_suite = Fernet(self.key)
+            # Separate key for the chunked stream format, derived from the same secret
+            self.stream_key = HKDF(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=None,
+                info=b"bleu-ai chunked stream v1",
+            ).derive(base64.urlsafe_b64decode(self.key))
             self.initialized = True
             logging.info("✅ Encryption manager initialized successfully")
         except Exception as e:
@@ -64,29 +97,19 @@ class EncryptionManager:
     def encrypt_data(
         self, data: Union[np.ndarray, torch.Tensor, Dict], data_type: str = "numpy"
     ) -> bytes:
-        """Encrypt data using Fernet symmetric encryption."""
+        """Encrypt data.
+
+        Arrays and tensors use the chunked AES-GCM stream format, encrypted
+        straight from the array buffer; dicts use Fernet.
+        """
         try:
             if not self.initialized or self.cipher_suite is None:
                 self.initialize()
 
-            # Convert data to bytes using msgpack for binary data
-            if data_type == "numpy":
-                data_bytes = msgpack.packb(
-                    {
-                        "data": data.tobytes(),
-                        "shape": data.shape,
-                        "dtype": str(data.dtype),
-                    }
-                )
-            elif data_type == "torch":
-                data_bytes = msgpack.packb(
-                    {
-                        "data": data.cpu().numpy().tobytes(),
-                        "shape": data.shape,
-                        "dtype": str(data.dtype),
-                        "requires_grad": data.requires_grad,
-                    }
-                )
+            if data_type in ("numpy", "torch"):
+                sink = io.BytesIO()
+                self.encrypt_array_stream(data, sink)
+                return sink.getvalue()
             elif data_type == "dict":
                 data_bytes = json.dumps(data).encode()
             else:
@@ -105,11 +128,18 @@ class EncryptionManager:
     def decrypt_data(
         self, encrypted_data: bytes, data_type: str = "numpy"
     ) -> Union[np.ndarray, torch.Tensor, Dict]:
-        """Decrypt data using Fernet symmetric encryption."""
+        """Decrypt data from ``encrypt_data`` (stream or legacy Fernet format)."""
         try:
             if not self.initialized or self.cipher_suite is None:
                 self.initialize()
 
+            if data_type in ("numpy", "torch") and encrypted_data.startswith(
+                STREAM_MAGIC
+            ):
+                with self.open_stream(io.BytesIO(encrypted_data)) as reader:
+                    array = reader.read_array()
+                    return self._restore_array(array, reader.metadata, data_type)
+
             # Decrypt data
             if self.cipher_suite is None:
                 raise ValueError("Cipher suite not initialized")
@@ -139,6 +169,103 @@ class EncryptionManager:
             logging.error(f"❌ Data decryption failed: {str(e)}")
             raise
 
+    @staticmethod
+    def _restore_array(
+        array: np.ndarray, metadata: Dict, data_type: str
+    ) -> Union[np.ndarray, torch.Tensor]:
+        if data_type != "torch":
+            return array
+        tensor = torch.from_numpy(array)
+        tensor.requires_grad = metadata.get("requires_grad", False)
+        return tensor
+
+    def encrypt_array_stream(
+        self,
+        data: Union[np.ndarray, torch.Tensor],
+        destination: PathOrFile,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> None:
+        """Encrypt an array or tensor in chunks, without copying its buffer.
+
+        Args:
+            data: Array or tensor (non-contiguous inputs are copied once)
+            destination: Output path or binary file
+            chunk_size: Plaintext bytes per chunk
+        """
+        try:
+            if not self.initialized or self.stream_key is None:
+                self.initialize()
+
+            metadata: Dict = {}
+            if isinstance(data, torch.Tensor):
+                metadata["requires_grad"] = data.requires_grad
+                data = data.detach().cpu().numpy()
+            array = np.ascontiguousarray(data)
+            metadata.update(dtype=array.dtype.str, shape=list(array.shape))
+            buffer = memoryview(array.reshape(-1).view(np.uint8))
+
+            with _open(destination, "wb") as sink:
+                writer = ChunkedStreamWriter(
+                    self.stream_key, sink, chunk_size, metadata
+                )
+                writer.write(buffer)
+                writer.finish()
+
+        except Exception as e:
+            logging.error(f"❌ Array stream encryption failed: {str(e)}")
+            raise
+
+    def open_stream(self, source: PathOrFile) -> ChunkedStreamReader:
+        """Open a chunked stream for random-access decryption.
+
+        Use as a context manager; see ``ChunkedStreamReader.read_rows`` and
+        ``readinto`` for partial decryption.
+        """
+        if not self.initialized or self.stream_key is None:
+            self.initialize()
+        if isinstance(source, (str, os.PathLike)):
+            f = open(source, "rb")
+            try:
+                return ChunkedStreamReader(self.stream_key, f, owns_source=True)
+            except Exception:
+                f.close()
+                raise
+        return ChunkedStreamReader(self.stream_key, source)
+
+    def decrypt_array_stream(
+        self,
+        source: PathOrFile,
+        out: Optional[np.ndarray] = None,
+        mmap_path: Optional[str] = None,
+    ) -> np.ndarray:
+        """Decrypt a chunked array stream into a preallocated buffer.
+
+        Args:
+            source: Encrypted path or binary file
+            out: Array to decrypt into (must match dtype and shape)
+            mmap_path: Decrypt into a new ``.npy`` memory map at this path
+                instead, keeping memory use constant for arrays of any size
+
+        Returns:
+            np.ndarray: The decrypted array (``out`` or the memory map)
+        """
+        try:
+            with self.open_stream(source) as reader:
+                if mmap_path is not None:
+                    dtype, shape = reader.array_layout()
+                    Path(mmap_path).parent.mkdir(parents=True, exist_ok=True)
+                    out = np.lib.format.open_memmap(
+                        mmap_path, mode="w+", dtype=dtype, shape=shape
+                    )
+                array = reader.read_array(out)
+                if isinstance(array, np.memmap):
+                    array.flush()
+                return array
+
+        except Exception as e:
+            logging.error(f"❌ Array stream decryption failed: {str(e)}")
+            raise
+
     def encrypt_model(self, model: nn.Module, save_path: Optional[str] = None) -> bytes:
         """Encrypt PyTorch model state."""
         try:
@@ -283,6 +410,49 @@ class EncryptionManager:
             logging.error(f"❌ File decryption failed: {str(e)}")
             raise
 
+    def encrypt_file_stream(
+        self,
+        file_path: str,
+        output_path: PathOrFile,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> None:
+        """Encrypt a file in chunks, in constant memory."""
+        try:
+            if not self.initialized or self.stream_key is None:
+                self.initialize()
+
+            with open(file_path, "rb") as source, _open(output_path, "wb") as sink:
+                writer = ChunkedStreamWriter(
+                    self.stream_key, sink, chunk_size, {"name": Path(file_path).name}
+                )
+                shutil.copyfileobj(source, writer, chunk_size)
+                writer.finish()
+
+        except Exception as e:
+            logging.error(f"❌ File stream encryption failed: {str(e)}")
+            raise
+
+    def decrypt_file_stream(self, input_path: PathOrFile, output_path: str) -> None:
+        """Decrypt a chunked file stream to ``output_path``, in constant memory.
+
+        The output is written to a temporary file and renamed into place only
+        after every chunk has been authenticated.
+        """
+        path = Path(output_path)
+        partial = path.with_name(path.name + ".partial")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with self.open_stream(input_path) as reader, open(partial, "wb") as sink:
+                for index in range(reader.n_chunks):
+                    sink.write(reader.read_chunk(index))
+            os.replace(partial, path)
+
+        except Exception as e:
+            with contextlib.suppress(OSError):
+                os.remove(partial)
+            logging.error(f"❌ File stream decryption failed: {str(e)}")
+            raise
+
     def secure_data_transfer(
         self,
         data: Union[np.ndarray, torch.Tensor, Dict],
@@ -328,6 +498,7 @@ class EncryptionManager:
         """Clean up resources."""
         try:
             self.cipher_suite = None
+            self.stream_key = None
             self.signing_key = None
             self.initialized = False
             logging.info("✅ Encryption manager disposed successfully")
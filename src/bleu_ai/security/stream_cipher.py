@@ -0,0 +1,233 @@
+"""
+Chunked AES-GCM Stream Format
+Incremental encryption and random-access decryption of byte streams of any
+length, in memory bounded by the chunk size.
+"""
+
+import io
+import json
+import os
+import struct
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+
+import numpy as np
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+# Chunked AES-GCM stream format:
+#   header = magic | chunk size (u32) | key salt (16 bytes)
+#            | nonce prefix (7 bytes) | metadata length (u32) | metadata JSON
+#   chunks = AES-GCM(chunk) for each chunk_size slice of the plaintext
+# Each stream is encrypted under its own key, HKDF-derived from the caller's
+# key and the random salt, so nonces only need to be unique within a stream
+# (random prefixes alone would collide across many streams under one key).
+# Chunk i uses nonce = prefix | i (u32) | last-chunk flag, and the whole header
+# as associated data, so reordered, truncated or spliced streams fail to
+# decrypt. Every chunk but the last is exactly chunk_size + 16 bytes long,
+# which makes any chunk addressable without reading the ones before it, and
+# lets the plaintext length follow from the stream size so writers never need
+# to know it up front.
+STREAM_MAGIC = b"BLEUSTR1"
+STREAM_CHUNK_SIZE = 1 << 20
+_STREAM_HEADER = struct.Struct(">8sI16s7sI")
+_TAG_SIZE = 16
+_MAX_CHUNKS = 1 << 32
+
+
+def _stream_cipher(key: bytes, salt: bytes) -> AESGCM:
+    """AES-GCM cipher for one stream, keyed by ``key`` and the stream's salt."""
+    stream_key = HKDF(
+        algorithm=hashes.SHA256(),
+        length=len(key),
+        salt=salt,
+        info=b"bleu-ai chunked stream key",
+    ).derive(key)
+    return AESGCM(stream_key)
+
+
+def _nonce(prefix: bytes, index: int, last: bool) -> bytes:
+    return prefix + index.to_bytes(4, "big") + (b"\x01" if last else b"\x00")
+
+
+class ChunkedStreamWriter(io.RawIOBase):
+    """Write-only file object that encrypts the stream format chunk by chunk.
+
+    Whole chunks are sealed straight from the caller's buffer. Call
+    ``finish`` once all data is written to seal the final chunk.
+    """
+
+    def __init__(
+        self,
+        key: bytes,
+        sink: BinaryIO,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        metadata: Optional[Dict] = None,
+    ):
+        """Initialize the writer and emit the stream header.
+
+        Args:
+            key: 16, 24 or 32-byte AES key the stream key is derived from
+            sink: Binary output
+            chunk_size: Plaintext bytes per chunk
+            metadata: JSON-serializable description stored in the header
+        """
+        if not 0 < chunk_size < 1 << 32:
+            raise ValueError("Invalid chunk size")
+        salt = os.urandom(16)
+        self._aead = _stream_cipher(key, salt)
+        self._sink = sink
+        self._chunk_size = chunk_size
+        self._prefix = os.urandom(7)
+        meta = json.dumps(metadata or {}).encode()
+        self._header = (
+            _STREAM_HEADER.pack(STREAM_MAGIC, chunk_size, salt, self._prefix, len(meta))
+            + meta
+        )
+        self._pending = bytearray()
+        self._index = 0
+        self._finished = False
+        sink.write(self._header)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        if self._finished:
+            raise ValueError("Stream already finished")
+        view = memoryview(data).cast("B")
+        written = len(view)
+
+        # Complete a partially filled chunk, then seal whole chunks straight
+        # from the caller's buffer. A full chunk is only sealed once more data
+        # follows it, since the final chunk is sealed differently.
+        if self._pending:
+            take = min(written, self._chunk_size - len(self._pending))
+            self._pending += view[:take]
+            view = view[take:]
+            if not view:
+                return written
+            self._seal(self._pending, last=False)
+            self._pending = bytearray()
+        while len(view) > self._chunk_size:
+            self._seal(view[: self._chunk_size], last=False)
+            view = view[self._chunk_size :]
+        self._pending += view
+        return written
+
+    def _seal(self, chunk: Any, last: bool) -> None:
+        if self._index >= _MAX_CHUNKS:
+            raise ValueError("Stream too long for its chunk size")
+        nonce = _nonce(self._prefix, self._index, last)
+        self._sink.write(self._aead.encrypt(nonce, chunk, self._header))
+        self._index += 1
+
+    def finish(self) -> None:
+        """Seal the final (possibly empty) chunk."""
+        if not self._finished:
+            self._seal(self._pending, last=True)
+            self._pending = bytearray()
+            self._finished = True
+
+
+class ChunkedStreamReader:
+    """Random-access decryption of the chunked AES-GCM stream format.
+
+    Only the chunks overlapping a requested range are read and decrypted, so
+    memory use is bounded by the chunk size regardless of the stream length.
+    """
+
+    def __init__(self, key: bytes, source: BinaryIO, owns_source: bool = False):
+        self._source = source
+        self._owns_source = owns_source
+        fixed = source.read(_STREAM_HEADER.size)
+        if len(fixed) != _STREAM_HEADER.size:
+            raise ValueError("Truncated stream header")
+        magic, self.chunk_size, salt, self._prefix, meta_length = _STREAM_HEADER.unpack(
+            fixed
+        )
+        if magic != STREAM_MAGIC:
+            raise ValueError("Not a chunked encryption stream")
+        self._aead = _stream_cipher(key, salt)
+        meta = source.read(meta_length)
+        self._header = fixed + meta
+        self._data_offset = source.tell()
+        self.metadata: Dict = json.loads(meta)
+
+        # An empty stream still has one (empty, authenticated) final chunk
+        sealed_size = source.seek(0, io.SEEK_END) - self._data_offset
+        sealed_chunk = self.chunk_size + _TAG_SIZE
+        self.n_chunks = max(1, -(-sealed_size // sealed_chunk))
+        if sealed_size - (self.n_chunks - 1) * sealed_chunk < _TAG_SIZE:
+            raise ValueError("Truncated stream")
+        self.length = sealed_size - self.n_chunks * _TAG_SIZE
+
+    def __enter__(self) -> "ChunkedStreamReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the source if the reader opened it."""
+        if self._owns_source:
+            self._source.close()
+
+    def read_chunk(self, index: int) -> bytes:
+        """Decrypt and authenticate one chunk."""
+        if not 0 <= index < self.n_chunks:
+            raise IndexError(f"Chunk {index} out of range")
+        size = min(self.chunk_size, self.length - index * self.chunk_size)
+        self._source.seek(self._data_offset + index * (self.chunk_size + _TAG_SIZE))
+        sealed = self._source.read(size + _TAG_SIZE)
+        nonce = _nonce(self._prefix, index, index == self.n_chunks - 1)
+        return self._aead.decrypt(nonce, sealed, self._header)
+
+    def readinto(self, buffer, offset: int = 0) -> int:
+        """Decrypt plaintext bytes starting at ``offset`` into ``buffer``.
+
+        Returns:
+            int: Number of bytes written (``len(buffer)``)
+        """
+        view = memoryview(buffer).cast("B")
+        stop = offset + len(view)
+        if offset < 0 or stop > self.length:
+            raise ValueError("Byte range outside the stream")
+        position = 0
+        while position < len(view):
+            index, start = divmod(offset + position, self.chunk_size)
+            plain = memoryview(self.read_chunk(index))
+            take = min(len(plain) - start, len(view) - position)
+            view[position : position + take] = plain[start : start + take]
+            position += take
+        return position
+
+    def array_layout(self) -> Tuple[np.dtype, Tuple[int, ...]]:
+        """Dtype and shape of the encrypted array."""
+        if not {"dtype", "shape"} <= self.metadata.keys():
+            raise ValueError("Stream does not contain an array")
+        return np.dtype(self.metadata["dtype"]), tuple(self.metadata["shape"])
+
+    def read_array(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Decrypt the whole array, into ``out`` if given (e.g. a memmap)."""
+        dtype, shape = self.array_layout()
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        elif out.dtype != dtype or out.shape != shape or not out.flags.c_contiguous:
+            raise ValueError(f"out must be a C-contiguous {dtype} array of {shape}")
+        if out.nbytes != self.length:
+            raise ValueError("Stream length does not match the array")
+        self.readinto(out.reshape(-1).view(np.uint8))
+        return out
+
+    def read_rows(self, start: int, stop: int) -> np.ndarray:
+        """Decrypt rows [start, stop) along the first axis only."""
+        dtype, shape = self.array_layout()
+        if not shape:
+            raise ValueError("Cannot read rows of a 0-d array")
+        start, stop, _ = slice(start, stop).indices(shape[0])
+        stop = max(start, stop)
+        out = np.empty((stop - start,) + shape[1:], dtype=dtype)
+        row_bytes = int(np.prod(shape[1:], dtype=np.int64)) * dtype.itemsize
+        self.readinto(out.reshape(-1).view(np.uint8), start * row_bytes)
+        return out
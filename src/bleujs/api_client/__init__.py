@@ -18,6 +18,7 @@ Usage:
 Best practice: Use context manager for cleanup: ``with BleuAPIClient(...) as c: ...``
 """
 
+from .cache import MemoryCache, ResponseCache, SQLiteCache
 from .client import BleuAPIClient
 from .exceptions import (
     APIError,
@@ -63,6 +64,9 @@ try:
         "EmbeddingResponse",
         "Model",
         "ModelListResponse",
+        "ResponseCache",
+        "MemoryCache",
+        "SQLiteCache",
     ]
 except ImportError:
     __all__ = [
@@ -83,6 +87,9 @@ except ImportError:
         "EmbeddingResponse",
         "Model",
         "ModelListResponse",
+        "ResponseCache",
+        "MemoryCache",
+        "SQLiteCache",
     ]
 
 # Get version from main package
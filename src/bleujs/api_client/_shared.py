@@ -8,19 +8,44 @@ of response parsing and error mapping.
 import json
 import logging
 import random
-from typing import Any, Dict, List, Optional
+import time
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
 
 try:
     import httpx
 except ImportError:
     httpx = None
 
-from .constants import DEFAULT_MAX_RETRY_DELAY
-from .exceptions import _parse_retry_after, parse_api_error
-from .models import ChatCompletionResponse, EmbeddingResponse, GenerationResponse
+from .constants import DEFAULT_MAX_RETRY_DELAY, MAX_EMBED_BATCH_SIZE
+from .exceptions import (
+    BleuAPIError,
+    ValidationError,
+    _parse_retry_after,
+    parse_api_error,
+)
+from .models import (
+    ChatCompletionRequest,
+    ChatCompletionResponse,
+    ChatMessage,
+    EmbeddingResponse,
+    GenerationResponse,
+)
 
 logger = logging.getLogger(__name__)
 
+# Sentinel data payload that ends a server-sent event stream
+STREAM_DONE = "[DONE]"
+STREAM_HEADERS = {"Accept": "text/event-stream"}
+
 
 def compute_retry_delay(
     response: "httpx.Response",
@@ -42,6 +67,61 @@ def compute_retry_delay(
     return base + jitter
 
 
+class SharedBackoff:
+    """
+    Pause shared by concurrent batches of one bulk call.
+
+    When any batch is rate limited, every batch waits until the deadline
+    before sending, so the whole job backs off instead of each worker
+    hitting the limit in turn.
+    """
+
+    def __init__(self) -> None:
+        self._resume_at = 0.0
+
+    def extend(self, delay: float) -> None:
+        """Push the resume time to at least ``delay`` seconds from now."""
+        self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+    def remaining(self) -> float:
+        """Seconds left before requests may be sent again."""
+        return max(0.0, self._resume_at - time.monotonic())
+
+
+def check_embed_many_args(batch_size: int, concurrency: int) -> None:
+    """Validate embed_many batching arguments (shared by sync and async)."""
+    if not 1 <= batch_size <= MAX_EMBED_BATCH_SIZE:
+        raise ValidationError(
+            f"batch_size must be between 1 and {MAX_EMBED_BATCH_SIZE}"
+        )
+    if concurrency < 1:
+        raise ValidationError("concurrency must be at least 1")
+
+
+def iter_batches(texts: Iterable[str], batch_size: int) -> Iterator[List[str]]:
+    """Lazily split texts into lists of at most batch_size."""
+    batch: List[str] = []
+    for text in texts:
+        batch.append(text)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def check_batch_embeddings(
+    embeddings: List[List[float]], batch: List[str]
+) -> List[List[float]]:
+    """Ensure a batch response has one vector per text, so order is preserved."""
+    if len(embeddings) != len(batch):
+        raise BleuAPIError(
+            f"Expected {len(batch)} embeddings in batch response, "
+            f"got {len(embeddings)}"
+        )
+    return embeddings
+
+
 def handle_response(response: "httpx.Response") -> Any:
     """
     Parse HTTP response: return JSON body on 200, else raise appropriate BleuAPIError.
@@ -60,6 +140,134 @@ def handle_response(response: "httpx.Response") -> Any:
     )
 
 
+def build_chat_request(
+    messages: List[Dict[str, str]],
+    model: str,
+    temperature: float,
+    max_tokens: Optional[int],
+    session_seed_goal: Optional[str],
+    **kwargs: Any,
+) -> ChatCompletionRequest:
+    """Validate chat arguments into a ChatCompletionRequest (sync and async)."""
+    # Convert dict messages to ChatMessage objects
+    chat_messages = [ChatMessage(**msg) for msg in messages]
+
+    req_kwargs = dict(kwargs)
+    if session_seed_goal is not None:
+        req_kwargs["session_seed_goal"] = session_seed_goal
+
+    return ChatCompletionRequest(
+        messages=chat_messages,
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        **req_kwargs,
+    )
+
+
+class SSEDecoder:
+    """
+    Incremental server-sent events decoder.
+
+    Feed response lines one at a time; returns the event's data (multiple
+    ``data:`` lines joined by newlines) when a blank line ends an event.
+    """
+
+    def __init__(self) -> None:
+        self._data: List[str] = []
+
+    def decode(self, line: str) -> Optional[str]:
+        """Consume one line; return event data when an event completes."""
+        line = line.rstrip("\r\n")
+        if not line:
+            return self.flush()
+        if line.startswith(":"):
+            return None  # comment / keep-alive
+        field, _, value = line.partition(":")
+        if field == "data":
+            self._data.append(value[1:] if value.startswith(" ") else value)
+        return None
+
+    def flush(self) -> Optional[str]:
+        """Return buffered event data, if any (call at end of stream)."""
+        if not self._data:
+            return None
+        data = "\n".join(self._data)
+        self._data = []
+        return data
+
+
+def parse_stream_delta(data: str) -> Optional[str]:
+    """
+    Extract the text delta from one stream event's data.
+
+    Handles OpenAI-style chunks (choices[].delta.content), flat
+    ``content``/``delta``/``text`` keys, and non-JSON text. Error events are
+    raised as BleuAPIError.
+    """
+    try:
+        event = json.loads(data)
+    except (json.JSONDecodeError, ValueError):
+        return data
+    if isinstance(event, str):
+        return event
+    if not isinstance(event, dict):
+        return None
+    if event.get("error"):
+        raise parse_api_error(500, event)
+    choices = event.get("choices")
+    if isinstance(choices, list) and choices and isinstance(choices[0], dict):
+        for key in ("delta", "message"):
+            part = choices[0].get(key)
+            if isinstance(part, dict) and isinstance(part.get("content"), str):
+                return part["content"]
+            if isinstance(part, str):
+                return part
+        return None
+    for key in ("content", "delta", "text"):
+        if isinstance(event.get(key), str):
+            return event[key]
+    return None
+
+
+def iter_stream_deltas(lines: Iterable[str]) -> Iterator[str]:
+    """Yield text deltas from SSE response lines until ``[DONE]``."""
+    decoder = SSEDecoder()
+    for line in lines:
+        data = decoder.decode(line)
+        if data is None:
+            continue
+        if data == STREAM_DONE:
+            return
+        delta = parse_stream_delta(data)
+        if delta:
+            yield delta
+    data = decoder.flush()
+    if data is not None and data != STREAM_DONE:
+        delta = parse_stream_delta(data)
+        if delta:
+            yield delta
+
+
+async def aiter_stream_deltas(lines: AsyncIterable[str]) -> AsyncIterator[str]:
+    """Async variant of iter_stream_deltas."""
+    decoder = SSEDecoder()
+    async for line in lines:
+        data = decoder.decode(line)
+        if data is None:
+            continue
+        if data == STREAM_DONE:
+            return
+        delta = parse_stream_delta(data)
+        if delta:
+            yield delta
+    data = decoder.flush()
+    if data is not None and data != STREAM_DONE:
+        delta = parse_stream_delta(data)
+        if delta:
+            yield delta
+
+
 def _safe_str(v: Any, default: str = "") -> str:
     """Coerce value to str; None or missing becomes default."""
     if v is None:
@@ -6,10 +6,23 @@ the Bleu.js cloud API at https://api.bleujs.org
 """
 
 import asyncio
+import copy
+import json
 import os
 import random
+from collections import deque
 from types import TracebackType
-from typing import Any, Dict, List, Optional, Type, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Type,
+    Union,
+)
 from urllib.parse import urljoin
 
 try:
@@ -23,15 +36,25 @@ except ImportError:
     _CLIENT_VERSION = "0.0.0"
 
 from ._shared import (
+    STREAM_HEADERS,
+    SharedBackoff,
+    aiter_stream_deltas,
+    build_chat_request,
     build_chat_response,
     build_embed_response,
     build_generate_response,
+    check_batch_embeddings,
+    check_embed_many_args,
     compute_retry_delay,
     handle_response,
+    iter_batches,
 )
+from .cache import ResponseCache, cache_key
 from .constants import (
+    CACHE_TTLS,
     DEFAULT_BASE_URL,
     DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_EMBED_CONCURRENCY,
     DEFAULT_MAX_RETRIES,
     DEFAULT_MODEL_CHAT,
     DEFAULT_MODEL_EMBED,
@@ -42,13 +65,12 @@ from .constants import (
     ENDPOINT_GENERATE,
     ENDPOINT_HEALTH,
     ENDPOINT_MODELS,
+    MAX_EMBED_BATCH_SIZE,
 )
 from .constants import get_headers as _get_headers_shared
 from .exceptions import AuthenticationError, BleuAPIError, NetworkError, ValidationError
 from .models import (
-    ChatCompletionRequest,
     ChatCompletionResponse,
-    ChatMessage,
     EmbeddingRequest,
     EmbeddingResponse,
     GenerationRequest,
@@ -73,6 +95,9 @@ class AsyncBleuAPIClient:
             (default: 60; connect uses 5s). Industry-standard.
         max_retries: Max retries for network/timeout and 429/503 (default: 3).
         retry_on_rate_limit: If True (default), retry on 429/503 with backoff.
+        cache: Optional response cache (MemoryCache, SQLiteCache) for
+            list_models(), health() and embed() (default: no caching).
+            Concurrent identical calls to these are coalesced either way.
     """
 
     DEFAULT_BASE_URL = DEFAULT_BASE_URL
@@ -86,6 +111,7 @@ class AsyncBleuAPIClient:
         timeout: Union[float, tuple] = DEFAULT_TIMEOUT,
         max_retries: int = DEFAULT_MAX_RETRIES,
         retry_on_rate_limit: bool = True,
+        cache: Optional[ResponseCache] = None,
     ):
         if httpx is None:
             raise ImportError(
@@ -103,6 +129,7 @@ class AsyncBleuAPIClient:
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_on_rate_limit = retry_on_rate_limit
+        self.cache = cache
 
         if isinstance(timeout, (int, float)):
             read_secs = float(timeout)
@@ -121,6 +148,8 @@ class AsyncBleuAPIClient:
             timeout=_timeout,
             headers=_get_headers_shared(self.api_key, _CLIENT_VERSION),
         )
+        # Shared in-flight calls for coalesced requests, by cache key
+        self._inflight: Dict[str, "asyncio.Future"] = {}
 
     def _build_url(self, endpoint: str) -> str:
         """Build full URL from endpoint"""
@@ -132,15 +161,90 @@ class AsyncBleuAPIClient:
         endpoint: str,
         data: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
+        backoff: Optional[SharedBackoff] = None,
+    ) -> Dict[str, Any]:
+        """
+        Make async HTTP request, coalesced and cached when possible
+
+        Concurrent identical requests to idempotent endpoints (CACHE_TTLS)
+        share one in-flight HTTP call. Responses are also cached when the
+        client was created with ``cache=``.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint path
+            data: Request body (for POST/PUT)
+            params: Query parameters
+            backoff: Rate limit pause shared with other requests (see _send)
+
+        Returns:
+            Response data as dictionary
+
+        Raises:
+            BleuAPIError: On API errors
+            NetworkError: On network errors
+        """
+        ttl = CACHE_TTLS.get(endpoint)
+        if ttl is None:
+            return await self._send(method, endpoint, data, params, backoff)
+
+        key = cache_key(self.api_key, self.base_url, method, endpoint, data, params)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return json.loads(cached)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._send_and_cache(key, ttl, method, endpoint, data, params, backoff)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish_inflight(key, t))
+        # Shield so one caller's cancellation does not cancel the shared call
+        return copy.deepcopy(await asyncio.shield(task))
+
+    async def _send_and_cache(
+        self,
+        key: str,
+        ttl: float,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        params: Optional[Dict[str, Any]],
+        backoff: Optional[SharedBackoff],
+    ) -> Dict[str, Any]:
+        """Send a coalesced request and store its response in the cache."""
+        result = await self._send(method, endpoint, data, params, backoff)
+        if self.cache is not None:
+            self.cache.set(key, json.dumps(result), ttl)
+        return result
+
+    def _finish_inflight(self, key: str, task: "asyncio.Future") -> None:
+        """Drop a completed shared call; mark its error retrieved if all waiters left."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        backoff: Optional[SharedBackoff] = None,
     ) -> Dict[str, Any]:
         """
-        Make async HTTP request with retries and error handling
+        Send async HTTP request with retries and error handling (no coalescing)
 
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint path
             data: Request body (for POST/PUT)
             params: Query parameters
+            backoff: When given, a 429/503 pauses every request sharing it
+                instead of only this one
 
         Returns:
             Response data as dictionary
@@ -153,6 +257,8 @@ class AsyncBleuAPIClient:
         last_error = None
 
         for attempt in range(self.max_retries):
+            if backoff is not None:
+                await asyncio.sleep(backoff.remaining())
             try:
                 response = await self._client.request(
                     method=method,
@@ -163,7 +269,10 @@ class AsyncBleuAPIClient:
                 if response.status_code in (429, 503) and self.retry_on_rate_limit:
                     if attempt < self.max_retries - 1:
                         delay = compute_retry_delay(response, attempt)
-                        await asyncio.sleep(delay)
+                        if backoff is None:
+                            await asyncio.sleep(delay)
+                        else:
+                            backoff.extend(delay)
                         continue
                 return handle_response(response)
             except BleuAPIError:
@@ -180,6 +289,61 @@ class AsyncBleuAPIClient:
             raise last_error
         raise NetworkError("Request failed after all retries")
 
+    async def _stream(
+        self,
+        endpoint: str,
+        data: Dict[str, Any],
+    ) -> AsyncIterator[str]:
+        """
+        POST a streaming request and yield text deltas as events arrive (async)
+
+        Retries like ``_request`` until the first delta is received; after that,
+        a dropped connection raises NetworkError instead of replaying output.
+
+        Raises:
+            BleuAPIError: On API errors (including error events in the stream)
+            NetworkError: On network errors
+        """
+        url = self._build_url(endpoint)
+        last_error = None
+
+        for attempt in range(self.max_retries):
+            delay = 2**attempt + (random.random() * 0.5)
+            started = False
+            try:
+                async with self._client.stream(
+                    "POST", url, json=data, headers=STREAM_HEADERS
+                ) as response:
+                    if (
+                        response.status_code in (429, 503)
+                        and self.retry_on_rate_limit
+                        and attempt < self.max_retries - 1
+                    ):
+                        delay = compute_retry_delay(response, attempt)
+                    else:
+                        if response.status_code != 200:
+                            await response.aread()
+                            handle_response(response)
+                        async for delta in aiter_stream_deltas(response.aiter_lines()):
+                            started = True
+                            yield delta
+                        return
+            except BleuAPIError:
+                raise
+            except httpx.TimeoutException as e:
+                last_error = NetworkError(f"Request timeout: {str(e)}")
+            except httpx.NetworkError as e:
+                last_error = NetworkError(f"Network error: {str(e)}")
+            if started:
+                raise last_error
+
+            if attempt < self.max_retries - 1:
+                await asyncio.sleep(delay)
+
+        if last_error:
+            raise last_error
+        raise NetworkError("Request failed after all retries")
+
     async def chat(
         self,
         messages: List[Dict[str, str]],
@@ -212,20 +376,9 @@ class AsyncBleuAPIClient:
             ])
             print(response.content)
         """
-        # Convert dict messages to ChatMessage objects
-        chat_messages = [ChatMessage(**msg) for msg in messages]
-
-        req_kwargs = dict(kwargs)
-        if session_seed_goal is not None:
-            req_kwargs["session_seed_goal"] = session_seed_goal
-
         # Build request
-        request = ChatCompletionRequest(
-            messages=chat_messages,
-            model=model,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            **req_kwargs,
+        request = build_chat_request(
+            messages, model, temperature, max_tokens, session_seed_goal, **kwargs
         )
 
         # Make API call
@@ -236,6 +389,35 @@ class AsyncBleuAPIClient:
         )
         return build_chat_response(response_data)
 
+    async def chat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = DEFAULT_MODEL_CHAT,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        session_seed_goal: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion, yielding text deltas as they arrive (async)
+
+        Takes the same arguments as ``chat``.
+
+        Example:
+            async for delta in client.chat_stream(
+                [{"role": "user", "content": "Hello!"}]
+            ):
+                print(delta, end="", flush=True)
+        """
+        kwargs["stream"] = True
+        request = build_chat_request(
+            messages, model, temperature, max_tokens, session_seed_goal, **kwargs
+        )
+        async for delta in self._stream(
+            ENDPOINT_CHAT, request.model_dump(exclude_none=True)
+        ):
+            yield delta
+
     async def generate(
         self,
         prompt: str,
@@ -286,7 +468,7 @@ class AsyncBleuAPIClient:
         Create embeddings for texts (async)
 
         Args:
-            texts: List of texts to embed (max 100)
+            texts: List of texts to embed (max 100; see embed_many)
             model: Model to use (default: bleu-embed-v1)
             **kwargs: Additional parameters
 
@@ -299,9 +481,22 @@ class AsyncBleuAPIClient:
         """
         if not texts:
             raise ValidationError("texts list cannot be empty")
-        if len(texts) > 100:
-            raise ValidationError("Maximum 100 texts allowed per request")
+        if len(texts) > MAX_EMBED_BATCH_SIZE:
+            raise ValidationError(
+                f"Maximum {MAX_EMBED_BATCH_SIZE} texts allowed per request; "
+                "use embed_many for larger inputs"
+            )
+
+        return await self._embed(texts, model, kwargs)
 
+    async def _embed(
+        self,
+        texts: List[str],
+        model: str,
+        kwargs: Dict[str, Any],
+        backoff: Optional[SharedBackoff] = None,
+    ) -> EmbeddingResponse:
+        """Send one embed request (texts already validated)."""
         request = EmbeddingRequest(
             input=texts,
             model=model,
@@ -312,9 +507,74 @@ class AsyncBleuAPIClient:
             method="POST",
             endpoint=ENDPOINT_EMBED,
             data=request.model_dump(exclude_none=True),
+            backoff=backoff,
         )
         return build_embed_response(response_data)
 
+    async def embed_many(
+        self,
+        texts: Iterable[str],
+        model: str = DEFAULT_MODEL_EMBED,
+        batch_size: int = MAX_EMBED_BATCH_SIZE,
+        concurrency: int = DEFAULT_EMBED_CONCURRENCY,
+        **kwargs: Any,
+    ) -> AsyncIterator[List[float]]:
+        """
+        Embed any number of texts, yielding one vector per text in input order (async)
+
+        Texts are consumed lazily in batches of ``batch_size``, and at most
+        ``concurrency`` batches are in flight over the client's shared
+        connection pool. A rate-limited batch pauses all batches for the
+        server's Retry-After and is retried like any request (see
+        ``retry_on_rate_limit`` and ``max_retries``).
+
+        Args:
+            texts: Iterable of texts (e.g. a generator over a file)
+            model: Model to use (default: bleu-embed-v1)
+            batch_size: Texts per request, 1-100 (default: 100)
+            concurrency: Maximum batches in flight (default: 4)
+            **kwargs: Additional parameters passed to each embed request
+
+        Yields:
+            Embedding vector for each text, in the order given
+
+        Example:
+            async for vector in client.embed_many(texts, concurrency=8):
+                index.add(vector)
+        """
+        check_embed_many_args(batch_size, concurrency)
+        backoff = SharedBackoff()
+        pending: Deque[asyncio.Task] = deque()
+        try:
+            for batch in iter_batches(texts, batch_size):
+                pending.append(
+                    asyncio.ensure_future(
+                        self._embed_batch(batch, model, backoff, kwargs)
+                    )
+                )
+                if len(pending) >= concurrency:
+                    for vector in await pending.popleft():
+                        yield vector
+            while pending:
+                for vector in await pending.popleft():
+                    yield vector
+        finally:
+            # Stop in-flight batches if the caller stops early or a batch fails
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _embed_batch(
+        self,
+        batch: List[str],
+        model: str,
+        backoff: SharedBackoff,
+        kwargs: Dict[str, Any],
+    ) -> List[List[float]]:
+        """Embed one batch for embed_many; rate limits pause every batch."""
+        response = await self._embed(batch, model, kwargs, backoff)
+        return check_batch_embeddings(response.embeddings, batch)
+
     async def health(self) -> Dict[str, Any]:
         """
         Check API health (GET /health). Async.
@@ -0,0 +1,160 @@
+"""
+Client-side response caches for Bleu.js API client.
+
+Only idempotent calls are cached (see ``CACHE_TTLS`` in constants): model
+listing, health, and embeddings. Entries are stored as JSON text so a cached
+response can never be mutated by the caller that received it.
+
+Usage:
+    from bleujs.api_client import BleuAPIClient, MemoryCache, SQLiteCache
+
+    client = BleuAPIClient(cache=MemoryCache())
+    client = BleuAPIClient(cache=SQLiteCache("~/.cache/bleujs/responses.db"))
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def cache_key(
+    api_key: str,
+    base_url: str,
+    method: str,
+    endpoint: str,
+    data: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Stable key for a request (SHA-256 of its canonical JSON form).
+
+    The API key is part of the hashed material so a shared on-disk cache
+    never serves one account's responses to another.
+    """
+    material = json.dumps(
+        [api_key, base_url, method.upper(), endpoint, data, params],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class ResponseCache(ABC):
+    """
+    Interface for client response caches.
+
+    Implementations must be safe to call from several threads. Values are
+    JSON text; expired entries must not be returned.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None if missing or expired."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all entries."""
+        pass
+
+
+class MemoryCache(ResponseCache):
+    """
+    In-process LRU cache with per-entry TTL.
+
+    Args:
+        max_entries: Maximum number of responses kept (default: 1024)
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(ResponseCache):
+    """
+    On-disk cache in a SQLite file, shared across processes and restarts.
+
+    Expired rows are skipped on read and pruned on write.
+
+    Args:
+        path: Database file path (``~`` is expanded; parent dirs are created)
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, value, now + ttl),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -5,10 +5,13 @@ This module provides a synchronous HTTP client for interacting with
 the Bleu.js cloud API at https://api.bleujs.org
 """
 
+import json
 import os
 import random
 import time
-from typing import Any, Dict, List, Optional, Union
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Union
 from urllib.parse import urljoin
 
 try:
@@ -22,15 +25,25 @@ except ImportError:
     _CLIENT_VERSION = "0.0.0"
 
 from ._shared import (
+    STREAM_HEADERS,
+    SharedBackoff,
+    build_chat_request,
     build_chat_response,
     build_embed_response,
     build_generate_response,
+    check_batch_embeddings,
+    check_embed_many_args,
     compute_retry_delay,
     handle_response,
+    iter_batches,
+    iter_stream_deltas,
 )
+from .cache import ResponseCache, cache_key
 from .constants import (
+    CACHE_TTLS,
     DEFAULT_BASE_URL,
     DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_EMBED_CONCURRENCY,
     DEFAULT_MAX_RETRIES,
     DEFAULT_MODEL_CHAT,
     DEFAULT_MODEL_EMBED,
@@ -42,13 +55,12 @@ from .constants import (
     ENDPOINT_GENERATE,
     ENDPOINT_HEALTH,
     ENDPOINT_MODELS,
+    MAX_EMBED_BATCH_SIZE,
 )
 from .constants import get_headers as _get_headers_shared
 from .exceptions import AuthenticationError, BleuAPIError, NetworkError, ValidationError
 from .models import (
-    ChatCompletionRequest,
     ChatCompletionResponse,
-    ChatMessage,
     EmbeddingRequest,
     EmbeddingResponse,
     GenerationRequest,
@@ -75,6 +87,8 @@ class BleuAPIClient:
             retry_on_rate_limit is True (default: 3).
         retry_on_rate_limit: If True (default), retry on 429/503 with backoff
             and optional Retry-After header. Set False to fail immediately.
+        cache: Optional response cache (MemoryCache, SQLiteCache) for
+            list_models(), health() and embed() (default: no caching).
     """
 
     DEFAULT_BASE_URL = DEFAULT_BASE_URL
@@ -88,6 +102,7 @@ class BleuAPIClient:
         timeout: Union[float, tuple] = DEFAULT_TIMEOUT,
         max_retries: int = DEFAULT_MAX_RETRIES,
         retry_on_rate_limit: bool = True,
+        cache: Optional[ResponseCache] = None,
     ):
         if httpx is None:
             raise ImportError(
@@ -105,6 +120,7 @@ class BleuAPIClient:
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_on_rate_limit = retry_on_rate_limit
+        self.cache = cache
 
         if isinstance(timeout, (int, float)):
             read_secs = float(timeout)
@@ -135,15 +151,58 @@ class BleuAPIClient:
         endpoint: str,
         data: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
+        backoff: Optional[SharedBackoff] = None,
     ) -> Dict[str, Any]:
         """
-        Make HTTP request with retries and error handling
+        Make HTTP request, served from the response cache when possible
+
+        Only idempotent endpoints (CACHE_TTLS) are cached, and only when the
+        client was created with ``cache=``.
 
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint path
             data: Request body (for POST/PUT)
             params: Query parameters
+            backoff: Rate limit pause shared with other requests (see _send)
+
+        Returns:
+            Response data as dictionary
+
+        Raises:
+            BleuAPIError: On API errors
+            NetworkError: On network errors
+        """
+        ttl = CACHE_TTLS.get(endpoint)
+        if ttl is None or self.cache is None:
+            return self._send(method, endpoint, data, params, backoff)
+
+        key = cache_key(self.api_key, self.base_url, method, endpoint, data, params)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return json.loads(cached)
+        result = self._send(method, endpoint, data, params, backoff)
+        self.cache.set(key, json.dumps(result), ttl)
+        return result
+
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        backoff: Optional[SharedBackoff] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send HTTP request with retries and error handling (no caching)
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint path
+            data: Request body (for POST/PUT)
+            params: Query parameters
+            backoff: When given, a 429/503 pauses every request sharing it
+                instead of only this one
 
         Returns:
             Response data as dictionary
@@ -156,6 +215,8 @@ class BleuAPIClient:
         last_error = None
 
         for attempt in range(self.max_retries):
+            if backoff is not None:
+                time.sleep(backoff.remaining())
             try:
                 response = self._client.request(
                     method=method,
@@ -167,7 +228,10 @@ class BleuAPIClient:
                 if response.status_code in (429, 503) and self.retry_on_rate_limit:
                     if attempt < self.max_retries - 1:
                         delay = compute_retry_delay(response, attempt)
-                        time.sleep(delay)
+                        if backoff is None:
+                            time.sleep(delay)
+                        else:
+                            backoff.extend(delay)
                         continue
                 return handle_response(response)
             except BleuAPIError:
@@ -185,6 +249,61 @@ class BleuAPIClient:
             raise last_error
         raise NetworkError("Request failed after all retries")
 
+    def _stream(
+        self,
+        endpoint: str,
+        data: Dict[str, Any],
+    ) -> Iterator[str]:
+        """
+        POST a streaming request and yield text deltas as events arrive
+
+        Retries like ``_request`` until the first delta is received; after that,
+        a dropped connection raises NetworkError instead of replaying output.
+
+        Raises:
+            BleuAPIError: On API errors (including error events in the stream)
+            NetworkError: On network errors
+        """
+        url = self._build_url(endpoint)
+        last_error = None
+
+        for attempt in range(self.max_retries):
+            delay = 2**attempt + (random.random() * 0.5)
+            started = False
+            try:
+                with self._client.stream(
+                    "POST", url, json=data, headers=STREAM_HEADERS
+                ) as response:
+                    if (
+                        response.status_code in (429, 503)
+                        and self.retry_on_rate_limit
+                        and attempt < self.max_retries - 1
+                    ):
+                        delay = compute_retry_delay(response, attempt)
+                    else:
+                        if response.status_code != 200:
+                            response.read()
+                            handle_response(response)
+                        for delta in iter_stream_deltas(response.iter_lines()):
+                            started = True
+                            yield delta
+                        return
+            except BleuAPIError:
+                raise
+            except httpx.TimeoutException as e:
+                last_error = NetworkError(f"Request timeout: {str(e)}")
+            except httpx.NetworkError as e:
+                last_error = NetworkError(f"Network error: {str(e)}")
+            if started:
+                raise last_error
+
+            if attempt < self.max_retries - 1:
+                time.sleep(delay)
+
+        if last_error:
+            raise last_error
+        raise NetworkError("Request failed after all retries")
+
     def chat(
         self,
         messages: List[Dict[str, str]],
@@ -217,20 +336,9 @@ class BleuAPIClient:
             ])
             print(response.content)
         """
-        # Convert dict messages to ChatMessage objects
-        chat_messages = [ChatMessage(**msg) for msg in messages]
-
-        req_kwargs = dict(kwargs)
-        if session_seed_goal is not None:
-            req_kwargs["session_seed_goal"] = session_seed_goal
-
         # Build request
-        request = ChatCompletionRequest(
-            messages=chat_messages,
-            model=model,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            **req_kwargs,
+        request = build_chat_request(
+            messages, model, temperature, max_tokens, session_seed_goal, **kwargs
         )
 
         # Make API call
@@ -241,6 +349,30 @@ class BleuAPIClient:
         )
         return build_chat_response(response_data)
 
+    def chat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = DEFAULT_MODEL_CHAT,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        session_seed_goal: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Iterator[str]:
+        """
+        Stream a chat completion, yielding text deltas as they arrive
+
+        Takes the same arguments as ``chat``.
+
+        Example:
+            for delta in client.chat_stream([{"role": "user", "content": "Hello!"}]):
+                print(delta, end="", flush=True)
+        """
+        kwargs["stream"] = True
+        request = build_chat_request(
+            messages, model, temperature, max_tokens, session_seed_goal, **kwargs
+        )
+        yield from self._stream(ENDPOINT_CHAT, request.model_dump(exclude_none=True))
+
     def generate(
         self,
         prompt: str,
@@ -291,7 +423,7 @@ class BleuAPIClient:
         Create embeddings for texts
 
         Args:
-            texts: List of texts to embed (max 100)
+            texts: List of texts to embed (max 100; see embed_many)
             model: Model to use (default: bleu-embed-v1)
             **kwargs: Additional parameters
 
@@ -304,9 +436,22 @@ class BleuAPIClient:
         """
         if not texts:
             raise ValidationError("texts list cannot be empty")
-        if len(texts) > 100:
-            raise ValidationError("Maximum 100 texts allowed per request")
+        if len(texts) > MAX_EMBED_BATCH_SIZE:
+            raise ValidationError(
+                f"Maximum {MAX_EMBED_BATCH_SIZE} texts allowed per request; "
+                "use embed_many for larger inputs"
+            )
+
+        return self._embed(texts, model, kwargs)
 
+    def _embed(
+        self,
+        texts: List[str],
+        model: str,
+        kwargs: Dict[str, Any],
+        backoff: Optional[SharedBackoff] = None,
+    ) -> EmbeddingResponse:
+        """Send one embed request (texts already validated)."""
         request = EmbeddingRequest(
             input=texts,
             model=model,
@@ -317,9 +462,72 @@ class BleuAPIClient:
             method="POST",
             endpoint=ENDPOINT_EMBED,
             data=request.model_dump(exclude_none=True),
+            backoff=backoff,
         )
         return build_embed_response(response_data)
 
+    def embed_many(
+        self,
+        texts: Iterable[str],
+        model: str = DEFAULT_MODEL_EMBED,
+        batch_size: int = MAX_EMBED_BATCH_SIZE,
+        concurrency: int = DEFAULT_EMBED_CONCURRENCY,
+        **kwargs: Any,
+    ) -> Iterator[List[float]]:
+        """
+        Embed any number of texts, yielding one vector per text in input order
+
+        Texts are consumed lazily in batches of ``batch_size``, and at most
+        ``concurrency`` batches are in flight on a bounded thread pool, so
+        neither inputs nor results need to fit in memory. A rate-limited
+        batch pauses all batches for the server's Retry-After and is retried
+        like any request (see ``retry_on_rate_limit`` and ``max_retries``).
+
+        Args:
+            texts: Iterable of texts (e.g. a generator over a file)
+            model: Model to use (default: bleu-embed-v1)
+            batch_size: Texts per request, 1-100 (default: 100)
+            concurrency: Maximum batches in flight (default: 4)
+            **kwargs: Additional parameters passed to each embed request
+
+        Yields:
+            Embedding vector for each text, in the order given
+
+        Example:
+            with open("corpus.txt") as f:
+                for vector in client.embed_many(line.strip() for line in f):
+                    index.add(vector)
+        """
+        check_embed_many_args(batch_size, concurrency)
+        backoff = SharedBackoff()
+        pending: Deque[Future] = deque()
+        pool = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="bleujs-embed"
+        )
+        try:
+            for batch in iter_batches(texts, batch_size):
+                pending.append(
+                    pool.submit(self._embed_batch, batch, model, backoff, kwargs)
+                )
+                if len(pending) >= concurrency:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            # Stop queued batches if the caller stops early or a batch fails
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _embed_batch(
+        self,
+        batch: List[str],
+        model: str,
+        backoff: SharedBackoff,
+        kwargs: Dict[str, Any],
+    ) -> List[List[float]]:
+        """Embed one batch for embed_many; rate limits pause every batch."""
+        response = self._embed(batch, model, kwargs, backoff)
+        return check_batch_embeddings(response.embeddings, batch)
+
     def health(self) -> Dict[str, Any]:
         """
         Check API health (GET /health).
@@ -22,6 +22,17 @@ DEFAULT_MODEL_CHAT = "bleu-chat-v1"
 DEFAULT_MODEL_GENERATE = "bleu-gen-v1"
 DEFAULT_MODEL_EMBED = "bleu-embed-v1"
 
+# Embeddings: server-side cap on texts per request; default in-flight batches
+MAX_EMBED_BATCH_SIZE = 100
+DEFAULT_EMBED_CONCURRENCY = 4
+
+# Client-side cache TTLs (seconds) for idempotent endpoints; others are never cached
+CACHE_TTLS = {
+    ENDPOINT_HEALTH: 5.0,
+    ENDPOINT_MODELS: 300.0,
+    ENDPOINT_EMBED: 86400.0,
+}
+
 # Request defaults (industry-standard: short connect, longer read)
 DEFAULT_CONNECT_TIMEOUT = 5.0
 DEFAULT_READ_TIMEOUT = 60.0
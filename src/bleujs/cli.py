@@ -288,6 +288,7 @@ def config_reset():
 )
 @click.option("--system", "-s", help="System message to set context")
 @click.option("--json", "output_json", is_flag=True, help="Output as JSON")
+@click.option("--stream", is_flag=True, help="Print the response as it is generated")
 @click.option(
     "--file", "-f", type=click.Path(exists=True), help="Read message from file"
 )
@@ -299,6 +300,7 @@ def chat(
     session_seed_goal: Optional[str],
     system: Optional[str],
     output_json: bool,
+    stream: bool,
     file: Optional[str],
 ):
     """
@@ -307,6 +309,7 @@ def chat(
     Examples:
       bleu chat "What is quantum computing?"
       bleu chat "Explain AI" --temperature 0.9
+      bleu chat "Tell me a story" --stream
       bleu chat --file prompt.txt
     """
     # Get message
@@ -326,6 +329,10 @@ def chat(
         click.echo("❌ --session-seed-goal must be at most 500 characters", err=True)
         sys.exit(1)
 
+    if stream and output_json:
+        click.echo("❌ --stream cannot be combined with --json", err=True)
+        sys.exit(1)
+
     # Build messages
     messages = []
     if system:
@@ -335,6 +342,18 @@ def chat(
     # Make request
     try:
         client = get_client()
+        if stream:
+            for delta in client.chat_stream(
+                messages=messages,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                session_seed_goal=session_seed_goal,
+            ):
+                click.echo(delta, nl=False)
+            click.echo()
+            return
+
         response = client.chat(
             messages=messages,
             model=model,
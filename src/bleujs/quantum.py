@@ -4,6 +4,8 @@ Requires: pip install 'bleu-js[quantum]'
 """
 
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from typing import Any, Optional
 
 import numpy as np
@@ -11,6 +13,56 @@ import numpy as np
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _cnot_ladder_permutation(num_qubits: int) -> np.ndarray:
+    """
+    Basis-state permutation applied by CNOT(0,1), CNOT(1,2), ..., CNOT(n-2,n-1).
+
+    The ladder maps bit k to the XOR of bits 0..k, so entry ``b`` holds the
+    index that basis state ``b`` is sent to (qubit i is bit i, as in Qiskit).
+    """
+    indices = np.arange(2**num_qubits, dtype=np.int64)
+    permuted = np.zeros_like(indices)
+    prefix = np.zeros_like(indices)
+    for k in range(num_qubits):
+        prefix ^= (indices >> k) & 1
+        permuted |= prefix << k
+    permuted.setflags(write=False)
+    return permuted
+
+
+def _batch_probabilities(
+    data: np.ndarray, num_qubits: int, entangle: bool
+) -> np.ndarray:
+    """
+    Measurement probabilities of the RY-encoding circuit for every row of data.
+
+    Row ``r`` encodes ``data[r, i]`` as RY(x * pi / 2) on qubit ``i``; the
+    encoded state is a product state, so its probabilities are an outer
+    product of per-qubit (cos^2, sin^2) pairs. The CNOT ladder only permutes
+    basis states and is applied as a precomputed index permutation.
+    """
+    n_rows = data.shape[0]
+    n_encoded = min(data.shape[1], num_qubits)
+    # Unencoded qubits keep a zero angle and stay in |0>
+    half_angles = np.zeros((n_rows, num_qubits))
+    half_angles[:, :n_encoded] = data[:, :n_encoded] * (np.pi / 4)
+    cos2 = np.cos(half_angles) ** 2
+    sin2 = 1.0 - cos2
+
+    # Build the product from the most significant qubit down
+    probs = np.ones((n_rows, 1))
+    for qubit in range(num_qubits - 1, -1, -1):
+        pair = np.stack([cos2[:, qubit], sin2[:, qubit]], axis=1)
+        probs = (probs[:, :, None] * pair[:, None, :]).reshape(n_rows, -1)
+
+    if not entangle:
+        return probs
+    entangled = np.empty_like(probs)
+    entangled[:, _cnot_ladder_permutation(num_qubits)] = probs
+    return entangled
+
+
 class QuantumFeatureExtractor:
     """
     Extract quantum-enhanced features from data.
@@ -92,6 +144,57 @@ class QuantumFeatureExtractor:
             logger.info("Using classical simulation of quantum features")
             return self._classical_simulation(data)
 
+    def extract_batch(
+        self,
+        data: np.ndarray,
+        use_entanglement: bool = True,
+        chunk_size: int = 100_000,
+        n_jobs: int = 1,
+    ) -> np.ndarray:
+        """
+        Extract quantum features for every row of a 2D array at once.
+
+        Computes the same features as the Qiskit path of ``extract`` (RY
+        encoding of the first ``num_qubits`` columns, then a CNOT chain when
+        entanglement is enabled) with a closed-form NumPy simulation, so no
+        circuit is built per row.
+
+        Args:
+            data: Input matrix of shape (n_samples, n_features)
+            use_entanglement: Enable quantum entanglement
+            chunk_size: Rows simulated per chunk, bounding peak memory
+            n_jobs: Worker processes used to simulate chunks in parallel
+
+        Returns:
+            Array of shape (n_samples, 2 ** num_qubits) with the measurement
+            probabilities of each row
+        """
+        data = np.asarray(data, dtype=np.float64)
+        if data.ndim == 1:
+            data = data.reshape(1, -1)
+        if data.ndim != 2:
+            raise ValueError(f"Expected a 2D array, got shape {data.shape}")
+
+        entangle = use_entanglement and self.entanglement_type == "full"
+        simulate = partial(
+            _batch_probabilities, num_qubits=self.num_qubits, entangle=entangle
+        )
+        chunks = [
+            data[start : start + chunk_size]
+            for start in range(0, len(data), max(chunk_size, 1))
+        ]
+        if not chunks:
+            return np.empty((0, 2**self.num_qubits))
+
+        if n_jobs > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                results = list(executor.map(simulate, chunks))
+        else:
+            results = [simulate(chunk) for chunk in chunks]
+
+        logger.info(f"✅ Extracted quantum features for {len(data)} samples")
+        return np.concatenate(results, axis=0)
+
     def _extract_with_qiskit(
         self, data: np.ndarray, use_entanglement: bool
     ) -> np.ndarray:
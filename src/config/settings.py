@@ -284,6 +284,16 @@ class Settings(BaseSettings):
     )
     OPENAI_API_KEY: SecretStr | None = Field(default=None, alias="OPENAI_API_KEY")
     ANTHROPIC_API_KEY: SecretStr | None = Field(default=None, alias="ANTHROPIC_API_KEY")
+    AI_PROVIDER_HEDGING: bool = Field(
+        default=False,
+        alias="AI_PROVIDER_HEDGING",
+        description="Race a slow provider against the next one in failover order.",
+    )
+    EMBEDDING_CACHE_REDIS: bool = Field(
+        default=False,
+        alias="EMBEDDING_CACHE_REDIS",
+        description="Share cached embeddings across workers through Redis.",
+    )
 
     # AI settings
     ENABLE_AI: bool = True
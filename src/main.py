@@ -34,6 +34,14 @@ from src.version import get_version  # noqa: E402
 
 BLEUJS_VERSION = get_version()
 
+
+async def _flush_usage_accounting() -> None:
+    """Write buffered API call rows and usage counts on application shutdown"""
+    from src.services.usage_accounting import close_usage_accountant
+
+    await close_usage_accountant()
+
+
 app = FastAPI(
     title="Bleu.js API",
     description=(
@@ -41,6 +49,7 @@ app = FastAPI(
         "with advanced AI capabilities"
     ),
     version=BLEUJS_VERSION,
+    on_shutdown=[_flush_usage_accounting],
 )
 
 # Get settings based on environment
@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 from src.config import get_settings
 from src.database import get_db
 from src.models.user import User
+from src.services.auth_cache import AuthStatus, authenticate_jwt
 from src.services.user_service import UserService
 
 # Constants
@@ -39,27 +40,20 @@ class AuthMiddleware:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        try:
-            payload = jwt.decode(
-                credentials.credentials,
-                self.settings.SECRET_KEY,
-                algorithms=[self.settings.ALGORITHM],
-            )
-            user_id: str = payload.get("sub")
-            if user_id is None:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail=CREDENTIALS_ERROR_MESSAGE,
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-        except jwt.InvalidTokenError:
+        entry, user = authenticate_jwt(
+            credentials.credentials,
+            self.settings.SECRET_KEY,
+            [self.settings.ALGORITHM],
+            self.user_service.get_user,
+            session=self.user_service.db,
+        )
+        if entry.status is AuthStatus.INVALID:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=CREDENTIALS_ERROR_MESSAGE,
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        user = self.user_service.get_user(user_id)
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -105,20 +99,13 @@ def get_current_user(
         detail=CREDENTIALS_ERROR_MESSAGE,
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM],
-        )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except jwt.InvalidTokenError:
-        raise credentials_exception
-
-    user_service = UserService(db)
-    user = user_service.get_user(user_id)
+    _, user = authenticate_jwt(
+        token,
+        settings.SECRET_KEY,
+        [settings.ALGORITHM],
+        UserService(db).get_user,
+        session=db,
+    )
     if user is None:
         raise credentials_exception
     return user
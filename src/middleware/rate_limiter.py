@@ -4,12 +4,17 @@ import logging
 from typing import Any
 
 from fastapi import FastAPI, HTTPException, Request, status
-from fastapi.middleware.base import BaseHTTPMiddleware
 from fastapi.responses import JSONResponse
 from prometheus_client import Counter
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import Message, Receive, Scope, Send
 
 from src.config import get_settings
-from src.services.rate_limiting_service import RateLimitingService
+from src.services.rate_limiting import (
+    LocalRateLimiter,
+    RateLimitAlgorithm,
+    RateLimitingService,
+)
 
 # Metrics
 RATE_LIMIT_EXCEEDED = Counter(
@@ -22,18 +27,65 @@ RATE_LIMIT_EXCEEDED = Counter(
 class RateLimiterMiddleware(BaseHTTPMiddleware):
     """Middleware for rate limiting requests."""
 
-    def __init__(self, app: FastAPI, rate_limiter: RateLimitingService) -> None:
+    def __init__(
+        self,
+        app: FastAPI,
+        rate_limiter: RateLimitingService,
+        max_requests: int | None = None,
+        window_seconds: int | None = None,
+        algorithm: RateLimitAlgorithm | str | None = None,
+        mode: str = "redis",
+        local_options: dict[str, Any] | None = None,
+    ) -> None:
         """Initialize the rate limiter middleware.
 
         Args:
             app: FastAPI application
             rate_limiter: Rate limiting service
+            max_requests: Requests allowed per window (default: settings)
+            window_seconds: Window size in seconds (default: settings)
+            algorithm: Algorithm override (default: the service's algorithm)
+            mode: "redis" to decide every request in Redis, or "local" to admit
+                from process-local buckets flushed to Redis in batches
+            local_options: Keyword arguments for ``LocalRateLimiter``
         """
         super().__init__(app)
+        if mode == "local":
+            rate_limiter = LocalRateLimiter(rate_limiter, **(local_options or {}))
+        elif mode != "redis":
+            raise ValueError(f"Unknown rate limiting mode: {mode}")
         self.rate_limiter = rate_limiter
         self.settings = get_settings()
+        self.max_requests = max_requests or self.settings.RATE_LIMIT_MAX_REQUESTS
+        self.window_seconds = window_seconds or self.settings.RATE_LIMIT_WINDOW
+        self.algorithm = algorithm
         self.logger = logging.getLogger(__name__)
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle requests, flushing local counts when the app shuts down."""
+        if scope["type"] != "lifespan" or not isinstance(
+            self.rate_limiter, LocalRateLimiter
+        ):
+            await super().__call__(scope, receive, send)
+            return
+
+        async def receive_with_shutdown() -> Message:
+            message = await receive()
+            if message["type"] == "lifespan.shutdown":
+                # Before the app's own shutdown handlers close Redis
+                await self.close()
+            return message
+
+        await self.app(scope, receive_with_shutdown, send)
+
+    async def close(self) -> None:
+        """Flush counts admitted locally and stop the background flusher."""
+        if isinstance(self.rate_limiter, LocalRateLimiter):
+            try:
+                await self.rate_limiter.close()
+            except Exception as e:
+                self.logger.error(f"Failed to flush local rate limits: {str(e)}")
+
     async def dispatch(self, request: Request, call_next: Any) -> Any:
         """Process request and apply rate limiting.
 
@@ -45,63 +97,22 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
             Any: Response from next middleware or route handler
 
         Raises:
-            HTTPException: If rate limit is exceeded
+            HTTPException: If the rate limit cannot be evaluated
         """
-        try:
-            # Get client IP
-            client_ip = request.client.host if request.client else "unknown"
-
-            # Get rate limit key
-            key = f"{client_ip}:{request.url.path}"
-
-            # Check rate limit
-            is_allowed = not await self.rate_limiter.check_rate_limit(key=key)
-            rate_limit_info = await self.rate_limiter.get_rate_limit_status(key=key)
-
-            if not is_allowed:
-                # Update metrics
-                RATE_LIMIT_EXCEEDED.labels(path=request.url.path).inc()
-
-                # Log warning
-                self.logger.warning(
-                    f"Rate limit exceeded for {client_ip}",
-                    extra={
-                        "path": request.url.path,
-                        "method": request.method,
-                        "limit": rate_limit_info["limit"],
-                        "remaining": rate_limit_info["remaining"],
-                        "reset": rate_limit_info["reset"],
-                    },
-                )
-
-                # Return error response
-                return JSONResponse(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    content={
-                        "error": "Too many requests",
-                        "message": "Rate limit exceeded",
-                        "retry_after": rate_limit_info["reset"],
-                    },
-                    headers={
-                        "Retry-After": str(rate_limit_info["reset"]),
-                        "X-RateLimit-Limit": str(rate_limit_info["limit"]),
-                        "X-RateLimit-Remaining": str(rate_limit_info["remaining"]),
-                        "X-RateLimit-Reset": str(rate_limit_info["reset"]),
-                    },
-                )
-
-            # Get response from next middleware or route handler
-            response = await call_next(request)
-
-            # Add rate limit headers to response
-            response.headers["X-RateLimit-Limit"] = str(rate_limit_info["limit"])
-            response.headers["X-RateLimit-Remaining"] = str(
-                rate_limit_info["remaining"]
-            )
-            response.headers["X-RateLimit-Reset"] = str(rate_limit_info["reset"])
+        # Get client IP
+        client_ip = request.client.host if request.client else "unknown"
 
-            return response
+        # Get rate limit key
+        key = f"{client_ip}:{request.url.path}"
 
+        try:
+            # One atomic round trip (or none in local mode) decides the limit
+            result = await self.rate_limiter.acquire(
+                key,
+                self.max_requests,
+                self.window_seconds,
+                algorithm=self.algorithm,
+            )
         except Exception as e:
             self.logger.error(
                 f"Failed to process rate limit: {str(e)}",
@@ -116,3 +127,38 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to process rate limit",
             )
+
+        if not result.allowed:
+            # Update metrics
+            RATE_LIMIT_EXCEEDED.labels(path=request.url.path).inc()
+
+            # Log warning
+            self.logger.warning(
+                f"Rate limit exceeded for {client_ip}",
+                extra={
+                    "path": request.url.path,
+                    "method": request.method,
+                    "limit": result.limit,
+                    "remaining": result.remaining,
+                    "reset": result.reset,
+                },
+            )
+
+            # Return error response
+            return JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={
+                    "error": "Too many requests",
+                    "message": "Rate limit exceeded",
+                    "retry_after": result.retry_after,
+                },
+                headers=result.headers,
+            )
+
+        # Get response from next middleware or route handler
+        response = await call_next(request)
+
+        # Add rate limit headers to response
+        response.headers.update(result.headers)
+
+        return response
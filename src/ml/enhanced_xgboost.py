@@ -11,6 +11,7 @@ import json
 import logging
 import os
 import warnings
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Optional
@@ -89,9 +90,13 @@ class QuantumFeatureConfig:
     optimization_level: int = 3
     version: str = "1.1.4"
     random_state: Optional[int] = None  # set for reproducible quantum transformation
+    chunk_size: int = 65536  # rows transformed per vectorized block
 
     def __post_init__(self):
         """Validate configuration after initialization."""
+        if self.chunk_size <= 0:
+            raise ValidationError("chunk_size must be a positive integer")
+
         if self.n_qubits > 16 and self.shots > 5000:
             logger.warning(
                 "High qubit count with high shots may cause performance issues"
@@ -210,8 +215,16 @@ class QuantumFeatureProcessor(BaseProcessor):
             logger.error(f"Failed to initialize quantum circuit: {str(e)}")
             raise QuantumOperationError(f"Circuit initialization failed: {str(e)}")
 
-    def process_features(self, features: np.ndarray) -> np.ndarray:
-        """Process features using quantum enhancement with comprehensive error handling."""
+    def process_features(
+        self, features: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Process features using quantum enhancement with comprehensive error handling.
+
+        Args:
+            features: 2D feature array (may be a ``np.memmap``)
+            out: Optional preallocated output of shape (n_samples, n_qubits);
+                may be ``features`` itself for an in-place transformation
+        """
         try:
             if features is None or features.size == 0:
                 raise ValidationError("Features cannot be None or empty")
@@ -234,7 +247,7 @@ class QuantumFeatureProcessor(BaseProcessor):
                 features = self._resize_features(features)
 
             # Apply quantum transformation
-            enhanced_features = self._apply_quantum_transformation(features)
+            enhanced_features = self._apply_quantum_transformation(features, out=out)
 
             logger.info(
                 f"Successfully processed {features.shape[0]} samples with quantum enhancement"
@@ -245,6 +258,24 @@ class QuantumFeatureProcessor(BaseProcessor):
             logger.error(f"Feature processing failed: {str(e)}")
             raise QuantumOperationError(f"Feature processing failed: {str(e)}")
 
+    def iter_process_features(
+        self, chunks: Iterable[np.ndarray]
+    ) -> Iterator[np.ndarray]:
+        """Transform a stream of row chunks that need not fit in memory together.
+
+        One random stream is shared across chunks, so with ``random_state`` set
+        the concatenated output equals ``process_features`` on the full matrix.
+        """
+        rng = self._transformation_rng()
+        for chunk in chunks:
+            if not self.quantum_available:
+                yield chunk
+                continue
+            if chunk.shape[1] != self.config.n_qubits:
+                chunk = self._resize_features(chunk)
+            out = np.empty(chunk.shape, dtype=self._output_dtype(chunk))
+            yield self._transform_block(chunk, rng, out)
+
     def _resize_features(self, features: np.ndarray) -> np.ndarray:
         """Resize features to match qubit count."""
         try:
@@ -260,22 +291,53 @@ class QuantumFeatureProcessor(BaseProcessor):
             logger.error(f"Feature resizing failed: {str(e)}")
             raise QuantumOperationError(f"Feature resizing failed: {str(e)}")
 
-    def _apply_quantum_transformation(self, features: np.ndarray) -> np.ndarray:
-        """Apply quantum transformation to features. Deterministic when config.random_state is set."""
+    def _transformation_rng(self) -> np.random.Generator:
+        seed = getattr(self.config, "random_state", None)
+        return np.random.default_rng(seed)
+
+    @staticmethod
+    def _output_dtype(features: np.ndarray) -> np.dtype:
+        """float32 inputs stay float32; everything else is computed in float64."""
+        return features.dtype if features.dtype == np.float32 else np.dtype(np.float64)
+
+    @staticmethod
+    def _transform_block(
+        block: np.ndarray, rng: np.random.Generator, out: np.ndarray
+    ) -> np.ndarray:
+        """Scale ``block`` by N(1, 0.1) factors drawn in one call, writing ``out``."""
+        noise = rng.standard_normal(size=block.shape, dtype=out.dtype)
+        noise *= 0.1
+        noise += 1.0
+        np.multiply(block, noise, out=out)
+        return out
+
+    def _apply_quantum_transformation(
+        self, features: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Apply quantum transformation to features. Deterministic when config.random_state is set.
+
+        Noise is drawn per ``config.chunk_size`` row block from a single stream,
+        so results do not depend on the chunk size and peak scratch memory is
+        one block.
+        """
         try:
-            seed = getattr(self.config, "random_state", None)
-            rng = np.random.default_rng(seed) if seed is not None else None
-            # Simulate quantum measurement (deterministic if random_state set)
-            enhanced_features = np.zeros_like(features)
-            for i in range(features.shape[0]):
-                for j in range(features.shape[1]):
-                    quantum_factor = (
-                        float(rng.normal(1.0, 0.1))
-                        if rng is not None
-                        else float(np.random.normal(1.0, 0.1))
-                    )
-                    enhanced_features[i, j] = features[i, j] * quantum_factor
-            return enhanced_features
+            dtype = self._output_dtype(features)
+            if out is None:
+                out = np.empty(features.shape, dtype=dtype)
+            elif out.shape != features.shape or out.dtype not in (
+                np.float32,
+                np.float64,
+            ):
+                raise ValidationError(
+                    f"out must be a float32/float64 array of shape {features.shape}"
+                )
+
+            rng = self._transformation_rng()
+            chunk_size = self.config.chunk_size
+            for start in range(0, features.shape[0], chunk_size):
+                stop = start + chunk_size
+                self._transform_block(features[start:stop], rng, out[start:stop])
+            return out
         except Exception as e:
             logger.error(f"Quantum transformation failed: {str(e)}")
             raise QuantumOperationError(f"Quantum transformation failed: {str(e)}")
@@ -758,10 +820,69 @@ class EnhancedXGBoost:
             f"feature_{i}": float(imp) for i, imp in enumerate(self.feature_importance)
         }
 
+    def _build_cv_folds(
+        self, features: np.ndarray, labels: np.ndarray, n_splits: int
+    ) -> list[tuple[Any, Any, np.ndarray]]:
+        """Quantize each CV fold once so every trial reuses the same matrices.
+
+        Training folds are ``QuantileDMatrix`` objects (pre-binned for the
+        ``hist`` tree method); validation folds are plain ``DMatrix`` objects
+        used only for prediction.
+        """
+        kf = KFold(n_splits=n_splits, shuffle=True, random_state=42)
+        folds = []
+        for train_idx, val_idx in kf.split(features):
+            dtrain = xgb.QuantileDMatrix(features[train_idx], labels[train_idx])
+            dval = xgb.DMatrix(features[val_idx])
+            folds.append((dtrain, dval, labels[val_idx]))
+        return folds
+
     def optimize_hyperparameters(
-        self, features: np.ndarray, y: np.ndarray, n_trials: int = 100
+        self,
+        features: np.ndarray,
+        y: np.ndarray,
+        n_trials: int = 100,
+        n_jobs: int = 1,
+        n_splits: int = 5,
+        prune: bool = True,
+        timeout: float | None = None,
     ) -> dict:
-        """Optimize hyperparameters using quantum-enhanced search"""
+        """Optimize hyperparameters using quantum-enhanced search
+
+        Features are quantum-processed and split into prebuilt fold matrices
+        once per study. Each trial reports its running mean fold accuracy so
+        Optuna's median pruner can stop unpromising trials early.
+
+        Args:
+            features: Training features
+            y: Class labels
+            n_trials: Number of Optuna trials
+            n_jobs: Trials evaluated concurrently (threads sharing the folds)
+            n_splits: Number of cross-validation folds
+            prune: Stop trials whose intermediate fold score is below median
+            timeout: Optional wall-clock limit for the study in seconds
+        """
+        if optuna is None:
+            raise RuntimeError(
+                "optuna is required for hyperparameter tuning. Install with: pip install optuna"
+            )
+
+        # Use quantum-enhanced feature processing (once for the whole study)
+        features_processed = self.quantum_processor.process_features(features)
+        classes, labels = np.unique(y, return_inverse=True)
+        folds = self._build_cv_folds(features_processed, labels, n_splits)
+
+        base_params: dict[str, Any] = {
+            "tree_method": "hist",
+            "device": self.performance_optimizer.get_xgboost_device(),
+            # Split cores between concurrent trials instead of oversubscribing
+            "nthread": max(1, (psutil.cpu_count() or 1) // max(1, n_jobs)),
+            "verbosity": 0,
+        }
+        if len(classes) > 2:
+            base_params.update(objective="multi:softprob", num_class=len(classes))
+        else:
+            base_params["objective"] = "binary:logistic"
 
         def objective(trial):
             param = {
@@ -775,34 +896,33 @@ class EnhancedXGBoost:
                 "colsample_bytree": trial.suggest_float("colsample_bytree", 0.6, 0.9),
                 "gamma": trial.suggest_float("gamma", 1e-8, 1.0, log=True),
             }
+            num_boost_round = param.pop("n_estimators")
+            booster_params = {**base_params, **param}
 
-            # Use quantum-enhanced feature processing
-            features_processed = self.quantum_processor.process_features(features)
-
-            # Perform cross-validation
-            kf = KFold(n_splits=5, shuffle=True, random_state=42)
+            # Perform cross-validation on the prebuilt folds
             scores = []
-
-            for train_idx, val_idx in kf.split(features_processed):
-                features_train, features_val = (
-                    features_processed[train_idx],
-                    features_processed[val_idx],
-                )
-                y_train, y_val = y[train_idx], y[val_idx]
-
-                model = xgb.XGBClassifier(**param)
-                model.fit(features_train, y_train)
-                score = model.score(features_val, y_val)
-                scores.append(score)
+            for step, (dtrain, dval, y_val) in enumerate(folds):
+                booster = xgb.train(booster_params, dtrain, num_boost_round)
+                proba = booster.predict(dval)
+                if proba.ndim > 1:
+                    predicted = proba.argmax(axis=1)
+                else:
+                    predicted = (proba > 0.5).astype(labels.dtype)
+                scores.append(float(np.mean(predicted == y_val)))
+
+                trial.report(float(np.mean(scores)), step)
+                if prune and trial.should_prune():
+                    raise optuna.TrialPruned()
 
             return np.mean(scores)
 
-        if optuna is None:
-            raise RuntimeError(
-                "optuna is required for hyperparameter tuning. Install with: pip install optuna"
-            )
-        study = optuna.create_study(direction="maximize")
-        study.optimize(objective, n_trials=n_trials)
+        pruner = (
+            optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=1)
+            if prune
+            else optuna.pruners.NopPruner()
+        )
+        study = optuna.create_study(direction="maximize", pruner=pruner)
+        study.optimize(objective, n_trials=n_trials, n_jobs=n_jobs, timeout=timeout)
 
         return study.best_params
 
@@ -0,0 +1,121 @@
+"""
+Content-Addressed Blob Store
+Stores encrypted blobs under the SHA-256 digest of their plaintext, hashing
+and encrypting in one streaming pass while the blob is written.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO, Any
+
+from src.bleu_ai.security.stream_cipher import (
+    STREAM_CHUNK_SIZE,
+    ChunkedStreamReader,
+    ChunkedStreamWriter,
+)
+
+# Blobs use the chunked AES-GCM stream format of bleu_ai's EncryptionManager
+BLOB_CHUNK_SIZE = STREAM_CHUNK_SIZE
+# Decrypted blobs larger than this spill to a temporary file while verified
+_SPOOL_SIZE = 64 << 20
+
+
+class _HashingWriter(ChunkedStreamWriter):
+    """Stream writer that also hashes the plaintext passing through it."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.hash = hashlib.sha256()
+
+    def write(self, data: Any) -> int:
+        self.hash.update(data)
+        return super().write(data)
+
+
+class BlobStore:
+    """
+    Encrypted, content-addressed blob storage.
+
+    Blobs live at ``<root>/<digest[:2]>/<digest[2:]>``. Writing a blob whose
+    digest is already stored keeps the existing copy.
+    """
+
+    def __init__(self, root: str | Path, key: bytes, chunk_size: int = BLOB_CHUNK_SIZE):
+        """Initialize blob store.
+
+        Args:
+            root: Directory holding the blobs
+            key: 32-byte AES-256-GCM key
+            chunk_size: Plaintext bytes per encrypted chunk
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+        self._key = key
+
+    def path(self, digest: str) -> Path:
+        """Location of the blob with the given digest."""
+        return self.root / digest[:2] / digest[2:]
+
+    def exists(self, digest: str) -> bool:
+        return self.path(digest).exists()
+
+    def put(self, write: Callable[[IO[bytes]], None]) -> str:
+        """Store the bytes written by ``write`` to a file object.
+
+        The content is hashed and encrypted as it is written, in a single
+        pass, then moved into place under its digest.
+
+        Returns:
+            str: SHA-256 hex digest of the plaintext
+        """
+        fd, temp_name = tempfile.mkstemp(dir=self.root, suffix=".partial")
+        try:
+            with os.fdopen(fd, "wb") as sink:
+                writer = _HashingWriter(self._key, sink, self.chunk_size)
+                buffered = io.BufferedWriter(writer, buffer_size=self.chunk_size)
+                write(buffered)
+                buffered.flush()
+                writer.finish()
+                digest = writer.hash.hexdigest()
+
+            target = self.path(digest)
+            if target.exists():
+                # Identical content is already stored
+                os.remove(temp_name)
+            else:
+                target.parent.mkdir(exist_ok=True)
+                os.replace(temp_name, target)
+            return digest
+        except BaseException:
+            if os.path.exists(temp_name):
+                os.remove(temp_name)
+            raise
+
+    def open(self, digest: str) -> IO[bytes]:
+        """Decrypt a blob and verify its digest before returning it.
+
+        Returns:
+            IO[bytes]: Readable file object positioned at the start of the
+            verified plaintext (spooled to disk for large blobs)
+        """
+        plaintext = tempfile.SpooledTemporaryFile(max_size=_SPOOL_SIZE)
+        try:
+            digest_check = hashlib.sha256()
+            with self.path(digest).open("rb") as f:
+                reader = ChunkedStreamReader(self._key, f)
+                for index in range(reader.n_chunks):
+                    chunk = reader.read_chunk(index)
+                    digest_check.update(chunk)
+                    plaintext.write(chunk)
+            if digest_check.hexdigest() != digest:
+                raise ValueError("Model integrity check failed")
+            plaintext.seek(0)
+            return plaintext
+        except BaseException:
+            plaintext.close()
+            raise
@@ -2,26 +2,54 @@
 Quantum-Aware Model Versioning System
 Implements advanced model versioning with quantum state tracking
 and integrity verification.
+
+Models are kept in an encrypted, content-addressed blob store; version
+metadata lives in a SQLite index, so listing and filtering versions is a
+single indexed query.
 """
 
 import base64
-import hashlib
 import json
 import logging
 import os
+import sqlite3
+import threading
 from dataclasses import asdict, dataclass
 from datetime import datetime
+from importlib import metadata as importlib_metadata
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-import git
 import numpy as np
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+from .blob_store import BlobStore
+
+try:
+    import git
+except ImportError:  # pragma: no cover - optional dependency
+    git = None
 
 logger = logging.getLogger(__name__)
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    version_id TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    model_type TEXT NOT NULL,
+    model_hash TEXT NOT NULL,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_versions_type_time ON versions (model_type, timestamp);
+CREATE INDEX IF NOT EXISTS ix_versions_time ON versions (timestamp);
+CREATE TABLE IF NOT EXISTS metrics (
+    version_id TEXT NOT NULL REFERENCES versions (version_id),
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (version_id, name)
+);
+CREATE INDEX IF NOT EXISTS ix_metrics_name_value ON metrics (name, value);
+"""
+
 
 @dataclass
 class QuantumState:
@@ -96,59 +124,85 @@ class QuantumModelVersioning:
     """
     Advanced model versioning system with quantum state tracking
     and security features.
+
+    Layout under ``storage_path``: ``index.sqlite`` (version metadata and
+    metrics), ``blobs/`` (encrypted models addressed by the SHA-256 of their
+    serialized bytes, so identical models are stored once) and
+    ``store.key`` (generated on first use unless a key is passed in).
     """
 
-    def __init__(self, storage_path: str | Path):
+    def __init__(
+        self, storage_path: str | Path, encryption_key: Optional[bytes] = None
+    ):
+        """Initialize model versioning.
+
+        Args:
+            storage_path: Directory of the store
+            encryption_key: URL-safe base64 encoded 32-byte key (default: the
+                store's own key file)
+        """
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
-        self.encryption_key = self._generate_encryption_key()
-        self.fernet = Fernet(self.encryption_key)
-        self.repo = self._get_git_repo()
-
-    def _generate_encryption_key(self) -> bytes:
-        """Generate encryption key for model security"""
-        salt = os.urandom(16)  # Generate cryptographically secure random salt
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
+        self.encryption_key = encryption_key or self._load_or_create_key()
+        self.blobs = BlobStore(
+            self.storage_path / "blobs", base64.urlsafe_b64decode(self.encryption_key)
         )
-        key = kdf.derive(b"quantum_secure_seed")
-        return base64.urlsafe_b64encode(key)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            self.storage_path / "index.sqlite", check_same_thread=False
+        )
+        with self._lock, self._db:
+            self._db.executescript(_SCHEMA)
+        self.repo = self._get_git_repo()
 
-    def _get_git_repo(self) -> git.Repo:
+    def _load_or_create_key(self) -> bytes:
+        """Read the store's key, creating it (owner-only) on first use"""
+        key_path = self.storage_path / "store.key"
+        try:
+            return key_path.read_bytes().strip()
+        except FileNotFoundError:
+            pass
+        key = base64.urlsafe_b64encode(os.urandom(32))
+        try:
+            fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            # Created concurrently by another process
+            return key_path.read_bytes().strip()
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        return key
+
+    def _get_git_repo(self) -> Optional["git.Repo"]:
         """Get Git repository information"""
+        if git is None:
+            return None
         try:
             return git.Repo(search_parent_directories=True)
         except git.InvalidGitRepositoryError:
             logger.warning("Not in a git repository")
             return None
 
-    def _compute_model_hash(self, model: Any) -> str:
-        """Compute cryptographic hash of model parameters"""
-        model_bytes = self._serialize_model(model)
-        return hashlib.sha256(model_bytes).hexdigest()
-
-    def _serialize_model(self, model: Any) -> bytes:
-        """Serialize model for storage"""
+    def _store_model(self, model: Any) -> str:
+        """Serialize a model into the blob store, returning its hash"""
         try:
             import dill
 
-            return dill.dumps(model)
+            # Serialized once, streaming through the hash and encryption
+            return self.blobs.put(lambda f: dill.dump(model, f))
         except Exception as e:
             logger.error(f"Model serialization failed: {str(e)}")
             raise
 
-    def _deserialize_model(self, model_bytes: bytes) -> Any:
-        """Deserialize model from storage"""
-        try:
-            import dill
+    def _load_model(self, model_hash: str) -> Any:
+        """Load a model from the blob store after verifying its hash"""
+        with self.blobs.open(model_hash) as f:
+            try:
+                import dill
 
-            return dill.loads(model_bytes)  # nosec B301 - Trusted model deserialization
-        except Exception as e:
-            logger.error(f"Model deserialization failed: {str(e)}")
-            raise
+                return dill.load(f)  # nosec B301 - Trusted model deserialization
+            except Exception as e:
+                logger.error(f"Model deserialization failed: {str(e)}")
+                raise
 
     def create_version(
         self,
@@ -163,13 +217,13 @@ class QuantumModelVersioning:
         """Create new model version with quantum state tracking"""
         # Generate version ID
         timestamp = datetime.now()
-        version_id = f"{model_type}_{timestamp.strftime('%Y%m%d_%H%M%S')}"
+        version_id = f"{model_type}_{timestamp.strftime('%Y%m%d_%H%M%S_%f')}"
 
         # Get git commit
         git_commit = self.repo.head.commit.hexsha if self.repo else "no_git_repo"
 
-        # Compute model hash
-        model_hash = self._compute_model_hash(model)
+        # Store model (deduplicated by content hash)
+        model_hash = self._store_model(model)
 
         # Get dependencies
         dependencies = self._get_dependencies()
@@ -190,86 +244,118 @@ class QuantumModelVersioning:
         )
 
         # Save version
-        self._save_version(version, model)
+        self._save_version(version)
 
         return version
 
     def _get_dependencies(self) -> Dict[str, str]:
         """Get current Python dependencies"""
-        import pkg_resources
-
-        return {pkg.key: pkg.version for pkg in pkg_resources.working_set}
-
-    def _save_version(self, version: ModelVersion, model: Any):
-        """Save model version and associated data"""
-        version_path = self.storage_path / version.version_id
-        version_path.mkdir(parents=True, exist_ok=True)
-
-        # Save version metadata
-        metadata_path = version_path / "metadata.json"
-        with metadata_path.open("w") as f:
-            json.dump(version.to_dict(), f, indent=2)
+        return {
+            dist.metadata["Name"].lower(): dist.version
+            for dist in importlib_metadata.distributions()
+            if dist.metadata["Name"]
+        }
 
-        # Save encrypted model
-        model_bytes = self._serialize_model(model)
-        encrypted_model = self.fernet.encrypt(model_bytes)
-        model_path = version_path / "model.encrypted"
-        with model_path.open("wb") as f:
-            f.write(encrypted_model)
+    def _save_version(self, version: ModelVersion):
+        """Index version metadata and metrics"""
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO versions "
+                "(version_id, timestamp, model_type, model_hash, metadata) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    version.version_id,
+                    version.timestamp.isoformat(),
+                    version.model_type,
+                    version.model_hash,
+                    json.dumps(version.to_dict()),
+                ),
+            )
+            self._db.executemany(
+                "INSERT INTO metrics (version_id, name, value) VALUES (?, ?, ?)",
+                [
+                    (version.version_id, name, float(value))
+                    for name, value in version.metrics.items()
+                ],
+            )
+
+    def get_version(self, version_id: str) -> ModelVersion:
+        """Get version metadata without loading the model"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT metadata FROM versions WHERE version_id = ?", (version_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown model version: {version_id}")
+        return ModelVersion.from_dict(json.loads(row[0]))
 
     def load_version(self, version_id: str) -> Tuple[ModelVersion, Any]:
         """Load model version and associated model"""
-        version_path = self.storage_path / version_id
-
-        # Load version metadata
-        metadata_path = version_path / "metadata.json"
-        with metadata_path.open("r") as f:
-            version = ModelVersion.from_dict(json.load(f))
-
-        # Load and decrypt model
-        model_path = version_path / "model.encrypted"
-        with model_path.open("rb") as f:
-            encrypted_model = f.read()
-        model_bytes = self.fernet.decrypt(encrypted_model)
-        model = self._deserialize_model(model_bytes)
-
-        # Verify model integrity
-        current_hash = self._compute_model_hash(model)
-        if current_hash != version.model_hash:
-            raise ValueError("Model integrity check failed")
-
-        return version, model
+        version = self.get_version(version_id)
+        # The blob store verifies the stored hash before deserializing
+        return version, self._load_model(version.model_hash)
 
     def list_versions(
         self,
         model_type: Optional[str] = None,
         min_metric: Optional[Dict[str, float]] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = True,
+        limit: Optional[int] = None,
     ) -> List[ModelVersion]:
-        """List available model versions with filtering"""
-        versions = []
-
-        for version_path in self.storage_path.glob("**/metadata.json"):
-            with version_path.open("r") as f:
-                version = ModelVersion.from_dict(json.load(f))
-
-            # Apply filters
-            if model_type and version.model_type != model_type:
-                continue
-
-            if min_metric:
-                if not all(
-                    version.metrics.get(k, 0) >= v for k, v in min_metric.items()
-                ):
-                    continue
-
-            versions.append(version)
+        """List available model versions with filtering
+
+        Args:
+            model_type: Only versions of this model type
+            min_metric: Minimum value per metric (missing metrics count as 0)
+            sort_by: Metric to sort by (default: timestamp)
+            descending: Sort order
+            limit: Maximum number of versions returned
+        """
+        joins, join_params = [], []
+        conditions, where_params = [], []
+        if model_type is not None:
+            conditions.append("v.model_type = ?")
+            where_params.append(model_type)
+        for i, (name, value) in enumerate((min_metric or {}).items()):
+            joins.append(
+                f"LEFT JOIN metrics m{i} "
+                f"ON m{i}.version_id = v.version_id AND m{i}.name = ?"
+            )
+            join_params.append(name)
+            conditions.append(f"COALESCE(m{i}.value, 0) >= ?")
+            where_params.append(value)
+        if sort_by is not None:
+            joins.append(
+                "LEFT JOIN metrics s ON s.version_id = v.version_id AND s.name = ?"
+            )
+            join_params.append(sort_by)
+        params = join_params + where_params
+
+        order = "DESC" if descending else "ASC"
+        query = " ".join(
+            ["SELECT v.metadata FROM versions v", *joins]
+            + (["WHERE " + " AND ".join(conditions)] if conditions else [])
+            + [
+                (
+                    f"ORDER BY s.value IS NULL, s.value {order}, v.timestamp {order}"
+                    if sort_by is not None
+                    else f"ORDER BY v.timestamp {order}"
+                )
+            ]
+            + (["LIMIT ?"] if limit is not None else [])
+        )
+        if limit is not None:
+            params.append(limit)
 
-        return sorted(versions, key=lambda v: v.timestamp, reverse=True)
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [ModelVersion.from_dict(json.loads(row[0])) for row in rows]
 
     def compare_versions(self, version_id1: str, version_id2: str) -> Dict[str, Any]:
         """Compare two model versions"""
-        v1 = self.load_version(version_id1)[0]
-        v2 = self.load_version(version_id2)[0]
+        v1 = self.get_version(version_id1)
+        v2 = self.get_version(version_id2)
 
         return {
             "metrics_diff": {
@@ -294,3 +380,8 @@ class QuantumModelVersioning:
                 for k in set(v1.feature_importance) | set(v2.feature_importance)
             },
         }
+
+    def close(self):
+        """Close the metadata index."""
+        with self._lock:
+            self._db.close()
@@ -1,7 +1,7 @@
 """Models package."""
 
 # Import all models to ensure they are registered with SQLAlchemy (order can matter for relationships)
-from .api_call import APICall, APIUsage
+from .api_call import APICall, APICallRollup, APIUsage
 from .customer import Customer
 from .declarative_base import Base
 from .payment import Payment
@@ -19,6 +19,7 @@ __all__ = [
     "Customer",
     "APICall",
     "APIUsage",
+    "APICallRollup",
     "Payment",
     "RateLimit",
 ]
@@ -3,7 +3,15 @@
 from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 
 from .declarative_base import Base
@@ -13,7 +21,10 @@ class APICall(Base):
     """API call model."""
 
     __tablename__ = "api_calls"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_api_calls_user_created", "user_id", "created_at"),
+        {"extend_existing": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(String, ForeignKey("users.id"))
@@ -43,6 +54,34 @@ class APIUsage(Base):
     user = relationship("src.models.user.User", back_populates="api_usage")
 
 
+class APICallRollup(Base):
+    """Per-user, per-hour, per-endpoint aggregates of API calls.
+
+    Maintained incrementally when buffered calls are flushed, so analytics
+    read one row per endpoint-hour instead of every call.
+    """
+
+    __tablename__ = "api_call_rollups"
+    __table_args__ = (
+        UniqueConstraint("user_id", "hour", "endpoint", name="uq_api_call_rollup"),
+        {"extend_existing": True},
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    hour = Column(DateTime, nullable=False, index=True)  # UTC, truncated to hour
+    endpoint = Column(String, nullable=False)
+    calls = Column(Integer, default=0, nullable=False)
+    errors = Column(Integer, default=0, nullable=False)
+    total_response_time = Column(Integer, default=0, nullable=False)  # ms
+    # Response time histogram (ms)
+    rt_lt_100 = Column(Integer, default=0, nullable=False)
+    rt_100_200 = Column(Integer, default=0, nullable=False)
+    rt_200_300 = Column(Integer, default=0, nullable=False)
+    rt_300_400 = Column(Integer, default=0, nullable=False)
+    rt_ge_400 = Column(Integer, default=0, nullable=False)
+
+
 # Pydantic models for API
 class APICallBase(BaseModel):
     endpoint: str
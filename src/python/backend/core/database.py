@@ -13,10 +13,13 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     create_engine,
+    inspect,
+    text,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import DeclarativeMeta, relationship, sessionmaker
@@ -93,12 +96,19 @@ class Job(Base):
     """Job model."""
 
     __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_status_priority", "status", "priority", "id"),)
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     job_type = Column(String(50), nullable=False)
     status = Column(String(20), default="pending")
+    priority = Column(Integer, nullable=False, default=0)
+    parameters = Column(JSON)
     progress = Column(Float, default=0.0)
+    attempts = Column(Integer, nullable=False, default=0)
+    # Worker holding the job while running, and when it last renewed its lease
+    locked_by = Column(String(64), nullable=True)
+    locked_at = Column(DateTime, nullable=True)
     result = Column(JSON)
     error = Column(Text)
     started_at = Column(DateTime, nullable=True)
@@ -175,6 +185,42 @@ class Dataset(Base):
 
 
 # Database setup
+# Job queue columns added after ``jobs`` was first created. create_all does not
+# alter existing tables, so upgrade_jobs_table adds them to older databases.
+JOB_QUEUE_COLUMNS = ("priority", "parameters", "attempts", "locked_by", "locked_at")
+
+
+def upgrade_jobs_table(bind) -> list[str]:
+    """Add missing job queue columns and indexes to an existing ``jobs`` table.
+
+    Args:
+        bind: Engine connected to the database
+
+    Returns:
+        list[str]: Names of the columns that were added
+    """
+    inspector = inspect(bind)
+    if not inspector.has_table(Job.__tablename__):
+        return []
+    existing = {column["name"] for column in inspector.get_columns("jobs")}
+    added = []
+    with bind.begin() as connection:
+        for name in JOB_QUEUE_COLUMNS:
+            if name in existing:
+                continue
+            column = Job.__table__.c[name]
+            ddl = f"{name} {column.type.compile(dialect=connection.dialect)}"
+            if column.default is not None:
+                ddl += f" DEFAULT {column.default.arg}"
+            if not column.nullable:
+                ddl += " NOT NULL"
+            connection.execute(text(f"ALTER TABLE jobs ADD COLUMN {ddl}"))
+            added.append(name)
+        for index in Job.__table__.indexes:
+            index.create(connection, checkfirst=True)
+    return added
+
+
 SQLALCHEMY_DATABASE_URL = "sqlite:///./bleujs.db"
 
 engine = create_engine(
@@ -204,8 +250,9 @@ class DatabaseManager:
         return self.SessionLocal()
 
     def create_tables(self):
-        """Create all database tables."""
+        """Create all database tables, upgrading an older ``jobs`` table."""
         Base.metadata.create_all(bind=self.engine)
+        upgrade_jobs_table(self.engine)
 
     def drop_tables(self):
         """Drop all database tables."""
@@ -1,77 +1,240 @@
 """
 Job queue manager for the backend.
+
+Jobs live in the ``jobs`` table and workers claim them from it, so pending
+jobs survive restarts and deploys and can be shared by several processes.
+Claims use ``SELECT ... FOR UPDATE SKIP LOCKED`` where the database supports
+it, plus a conditional ``UPDATE`` on the job status, which keeps claiming
+safe on SQLite. All database access runs in a thread, off the event loop.
 """
 
 import asyncio
+import contextlib
 import logging
+import os
+import socket
+import uuid
 from collections.abc import Callable
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 
-from ..config.settings import settings
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
 from .database import Job, db_manager
 
 
 class JobQueueManager:
-    """Job queue manager for handling background tasks."""
-
-    def __init__(self):
-        self.config = settings.get_config()
+    """Job queue manager for handling background tasks.
+
+    A dispatcher claims the highest-priority pending jobs, up to the number
+    of idle workers, and runs each as a task. Running jobs hold a lease that
+    is renewed on every flush; jobs of a worker that died are returned to the
+    queue once their lease expires. Status updates are buffered and written
+    in one transaction per flush.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] | None = None,
+        poll_interval: float = 1.0,
+        flush_interval: float = 1.0,
+        lease_timeout: float = 300.0,
+        config: Any | None = None,
+    ):
+        """Initialize job queue manager.
+
+        Args:
+            session_factory: Creates database sessions (default: the
+                backend's database manager)
+            poll_interval: Seconds between claims while idle
+            flush_interval: Seconds between buffered status writes
+            lease_timeout: Seconds after which a running job whose worker
+                stopped renewing its lease is requeued
+            config: Backend config providing ``num_workers`` and
+                ``retry_attempts`` (default: loaded from settings on first use)
+        """
+        self._config = config
         self.logger = logging.getLogger(__name__)
-        self._queue = asyncio.Queue()
-        self._workers = []
+        self._session_factory = session_factory or db_manager.get_session
+        self.poll_interval = poll_interval
+        self.flush_interval = flush_interval
+        self.lease_timeout = lease_timeout
+        self.worker_id = (
+            f"{socket.gethostname()[:40]}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self._active: dict[int, asyncio.Task] = {}
+        self._updates: list[tuple[int, dict[str, Any]]] = []
+        self._wakeup = asyncio.Event()
+        self._dispatcher: asyncio.Task | None = None
+        self._flusher: asyncio.Task | None = None
         self._is_running = False
 
+    @property
+    def config(self) -> Any:
+        if self._config is None:
+            from ..config.settings import settings
+
+            self._config = settings.get_config()
+        return self._config
+
     async def initialize(self):
         """Initialize job queue manager."""
         try:
             self._is_running = True
-            # Start worker tasks
-            for _ in range(self.config.num_workers):
-                worker = asyncio.create_task(self._worker_loop())
-                self._workers.append(worker)
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+            self._flusher = asyncio.create_task(self._flush_loop())
             self.logger.info("Job queue manager initialized successfully")
         except Exception as e:
             self.logger.error(f"Failed to initialize job queue manager: {e}")
             raise
 
-    async def shutdown(self):
-        """Shutdown job queue manager."""
+    async def shutdown(self, timeout: float | None = None):
+        """Shutdown job queue manager.
+
+        Stops claiming jobs and waits for running ones to finish. Jobs still
+        running after ``timeout`` seconds are cancelled and returned to the
+        queue.
+        """
         self._is_running = False
-        # Wait for all workers to complete
-        if self._workers:
-            await asyncio.gather(*self._workers)
+        self._wakeup.set()
+        if self._dispatcher is not None:
+            await self._dispatcher
+            self._dispatcher = None
+
+        if self._active:
+            _, pending = await asyncio.wait(
+                list(self._active.values()), timeout=timeout
+            )
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if self._flusher is not None:
+            self._flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flusher
+            self._flusher = None
+        await self._flush()
         self.logger.info("Job queue manager shut down")
 
-    async def _worker_loop(self):
-        """Worker loop for processing jobs."""
+    async def _dispatch_loop(self):
+        """Claim pending jobs whenever a worker slot is free."""
         while self._is_running:
-            try:
-                job_data = await self._queue.get()
-                await self._process_job(job_data)
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                self.logger.error(f"Worker error: {e}")
-            finally:
-                self._queue.task_done()
+            # Cleared before claiming, so an enqueue during the claim is not missed
+            self._wakeup.clear()
+            capacity = self.config.num_workers - len(self._active)
+            if capacity > 0:
+                try:
+                    jobs = await asyncio.to_thread(self._claim_jobs, capacity)
+                except Exception as e:
+                    self.logger.error(f"Failed to claim jobs: {e}")
+                    jobs = []
+                for job_data in jobs:
+                    self._start_job(job_data)
+
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+
+    def _start_job(self, job_data: dict[str, Any]):
+        """Run a claimed job as a task, freeing its slot when it finishes."""
+        job_id = job_data["job_id"]
+
+        def _done(_task: asyncio.Task):
+            self._active.pop(job_id, None)
+            self._wakeup.set()
+
+        task = asyncio.create_task(self._process_job(job_data))
+        self._active[job_id] = task
+        task.add_done_callback(_done)
+
+    def _claim_jobs(self, limit: int) -> list[dict[str, Any]]:
+        """Mark up to ``limit`` pending jobs as running by this worker."""
+        now = datetime.utcnow()
+        with self._session_factory() as session:
+            self._requeue_expired(session, now)
+            ids = session.scalars(
+                select(Job.id)
+                .where(Job.status == "pending")
+                .order_by(Job.priority.desc(), Job.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ).all()
+            ids = [job_id for job_id in ids if job_id not in self._active]
+            if not ids:
+                session.commit()
+                return []
+
+            # Conditional on the status, so without row locks (SQLite) a job
+            # claimed concurrently by another worker is skipped
+            session.execute(
+                update(Job)
+                .where(Job.id.in_(ids), Job.status == "pending")
+                .values(
+                    status="running",
+                    started_at=now,
+                    attempts=Job.attempts + 1,
+                    locked_by=self.worker_id,
+                    locked_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            rows = session.execute(
+                select(Job.id, Job.job_type, Job.parameters, Job.user_id)
+                .where(
+                    Job.id.in_(ids),
+                    Job.status == "running",
+                    Job.locked_by == self.worker_id,
+                )
+                .order_by(Job.priority.desc(), Job.id)
+            ).all()
+            session.commit()
+
+        return [
+            {
+                "job_id": job_id,
+                "job_type": job_type,
+                "parameters": parameters,
+                "user_id": user_id,
+            }
+            for job_id, job_type, parameters, user_id in rows
+        ]
+
+    def _requeue_expired(self, session: Session, now: datetime):
+        """Return running jobs whose lease expired to the queue.
+
+        Jobs that already used all retry attempts are failed instead.
+        """
+        cutoff = now - timedelta(seconds=self.lease_timeout)
+        expired = (Job.status == "running") & or_(
+            Job.locked_at.is_(None), Job.locked_at < cutoff
+        )
+        session.execute(
+            update(Job)
+            .where(expired, Job.attempts >= self.config.retry_attempts)
+            .values(
+                status="failed",
+                error="Worker lease expired",
+                completed_at=now,
+                locked_by=None,
+                locked_at=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        session.execute(
+            update(Job)
+            .where(expired)
+            .values(status="pending", started_at=None, locked_by=None, locked_at=None)
+            .execution_options(synchronize_session=False)
+        )
 
     async def _process_job(self, job_data: dict[str, Any]):
         """Process a single job."""
         job_id = job_data["job_id"]
         job_type = job_data["job_type"]
         parameters = job_data["parameters"]
-        job_data["user_id"]
 
         try:
-            # Update job status to running
-            with db_manager.get_session() as session:
-                job = session.query(Job).filter(Job.id == job_id).first()
-                if job:
-                    job.status = "running"
-                    job.started_at = datetime.utcnow()
-                    session.commit()
-
             # Get job handler
             handler = self._get_job_handler(job_type)
             if not handler:
@@ -79,26 +242,82 @@ class JobQueueManager:
 
             # Execute job
             result = await handler(parameters)
-
-            # Update job status to completed
-            with db_manager.get_session() as session:
-                job = session.query(Job).filter(Job.id == job_id).first()
-                if job:
-                    job.status = "completed"
-                    job.result = result
-                    job.completed_at = datetime.utcnow()
-                    session.commit()
-
+        except asyncio.CancelledError:
+            # Interrupted by shutdown: return the job to the queue without
+            # counting the attempt against its retries
+            self._updates.append(
+                (
+                    job_id,
+                    {
+                        "status": "pending",
+                        "attempts": Job.attempts - 1,
+                        "started_at": None,
+                        "locked_by": None,
+                        "locked_at": None,
+                    },
+                )
+            )
+            raise
         except Exception as e:
             self.logger.error(f"Job processing error: {e}")
-            # Update job status to failed
-            with db_manager.get_session() as session:
-                job = session.query(Job).filter(Job.id == job_id).first()
-                if job:
-                    job.status = "failed"
-                    job.error = str(e)
-                    job.completed_at = datetime.utcnow()
-                    session.commit()
+            self._finish_job(job_id, "failed", error=str(e))
+        else:
+            self._finish_job(job_id, "completed", result=result, progress=1.0)
+
+    def _finish_job(self, job_id: int, status: str, **values: Any):
+        """Buffer the final status of a job for the next flush."""
+        self._updates.append(
+            (
+                job_id,
+                {
+                    "status": status,
+                    "completed_at": datetime.utcnow(),
+                    "locked_by": None,
+                    "locked_at": None,
+                    **values,
+                },
+            )
+        )
+
+    async def _flush_loop(self):
+        """Write buffered updates every ``flush_interval`` seconds."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self._flush()
+
+    async def _flush(self):
+        """Write buffered status updates and renew leases of running jobs."""
+        updates, self._updates = self._updates, []
+        running = list(self._active)
+        if not updates and not running:
+            return
+        try:
+            await asyncio.to_thread(self._write_updates, updates, running)
+        except Exception as e:
+            self.logger.error(f"Failed to write job updates: {e}")
+            # Keep the updates for the next attempt
+            self._updates[:0] = updates
+
+    def _write_updates(
+        self, updates: list[tuple[int, dict[str, Any]]], running: list[int]
+    ):
+        """Apply updates in one transaction, skipping jobs no longer ours."""
+        with self._session_factory() as session:
+            for job_id, values in updates:
+                session.execute(
+                    update(Job)
+                    .where(Job.id == job_id, Job.locked_by == self.worker_id)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+            if running:
+                session.execute(
+                    update(Job)
+                    .where(Job.id.in_(running), Job.locked_by == self.worker_id)
+                    .values(locked_at=datetime.utcnow())
+                    .execution_options(synchronize_session=False)
+                )
+            session.commit()
 
     def _get_job_handler(self, job_type: str) -> Callable | None:
         """Get handler function for job type."""
@@ -117,73 +336,85 @@ class JobQueueManager:
         return handlers.get(job_type)
 
     async def enqueue_job(
-        self, job_type: str, parameters: dict[str, Any], user_id: int
+        self,
+        job_type: str,
+        parameters: dict[str, Any],
+        user_id: int,
+        priority: int = 0,
     ) -> int:
-        """Enqueue a new job."""
+        """Enqueue a new job (higher ``priority`` runs first)."""
         try:
-            with db_manager.get_session() as session:
-                job = Job(
-                    job_type=job_type,
-                    status="pending",
-                    parameters=parameters,
-                    user_id=user_id,
-                )
-                session.add(job)
-                session.commit()
-                session.refresh(job)
-
-            await self._queue.put(
-                {
-                    "job_id": job.id,
-                    "job_type": job_type,
-                    "parameters": parameters,
-                    "user_id": user_id,
-                }
+            job_id = await asyncio.to_thread(
+                self._insert_job, job_type, parameters, user_id, priority
             )
-
-            return job.id
+            self._wakeup.set()
+            return job_id
 
         except Exception as e:
             self.logger.error(f"Failed to enqueue job: {e}")
             raise
 
+    def _insert_job(
+        self, job_type: str, parameters: dict[str, Any], user_id: int, priority: int
+    ) -> int:
+        with self._session_factory() as session:
+            job = Job(
+                job_type=job_type,
+                status="pending",
+                priority=priority,
+                parameters=parameters,
+                user_id=user_id,
+            )
+            session.add(job)
+            session.commit()
+            return job.id
+
     async def get_job_status(self, job_id: int) -> dict[str, Any] | None:
         """Get status of a job."""
         try:
-            with db_manager.get_session() as session:
-                job = session.query(Job).filter(Job.id == job_id).first()
-                if job:
-                    return {
-                        "id": job.id,
-                        "type": job.job_type,
-                        "status": job.status,
-                        "parameters": job.parameters,
-                        "result": job.result,
-                        "error": job.error,
-                        "created_at": job.created_at,
-                        "started_at": job.started_at,
-                        "completed_at": job.completed_at,
-                    }
-            return None
+            return await asyncio.to_thread(self._load_job_status, job_id)
         except Exception as e:
             self.logger.error(f"Failed to get job status: {e}")
             return None
 
+    def _load_job_status(self, job_id: int) -> dict[str, Any] | None:
+        with self._session_factory() as session:
+            job = session.get(Job, job_id)
+            if job is None:
+                return None
+            return {
+                "id": job.id,
+                "type": job.job_type,
+                "status": job.status,
+                "priority": job.priority,
+                "attempts": job.attempts,
+                "parameters": job.parameters,
+                "result": job.result,
+                "error": job.error,
+                "created_at": job.created_at,
+                "started_at": job.started_at,
+                "completed_at": job.completed_at,
+            }
+
     async def cancel_job(self, job_id: int) -> bool:
         """Cancel a pending job."""
         try:
-            with db_manager.get_session() as session:
-                job = session.query(Job).filter(Job.id == job_id).first()
-                if job and job.status == "pending":
-                    job.status = "cancelled"
-                    job.completed_at = datetime.utcnow()
-                    session.commit()
-                    return True
-            return False
+            return await asyncio.to_thread(self._cancel_pending, job_id)
         except Exception as e:
             self.logger.error(f"Failed to cancel job: {e}")
             return False
 
+    def _cancel_pending(self, job_id: int) -> bool:
+        with self._session_factory() as session:
+            result = session.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == "pending")
+                .values(status="cancelled", completed_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+            return result.rowcount == 1
+
     # Job handlers
     async def _handle_train_model(self, parameters: dict[str, Any]) -> dict[str, Any]:
         """Handle model training job."""
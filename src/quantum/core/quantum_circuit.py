@@ -1,5 +1,6 @@
 """Quantum circuit module."""
 
+from collections import OrderedDict
 from typing import Any, Dict, Optional, Tuple
 
 import numpy as np
@@ -123,18 +124,42 @@ class QuantumCircuit:
         return f"QuantumCircuit({self.num_qubits} qubits, {len(self.gates)} gates)"
 
 
+# Single-qubit gate matrices understood by the simulator
+_GATE_MATRICES: Dict[str, np.ndarray] = {
+    "h": np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2),
+    "x": np.array([[0, 1], [1, 0]], dtype=complex),
+    "y": np.array([[0, -1j], [1j, 0]], dtype=complex),
+    "z": np.array([[1, 0], [0, -1]], dtype=complex),
+}
+
+
 class QuantumState:
-    """Quantum state representation."""
+    """Quantum state representation.
+
+    The statevector uses little-endian qubit order (qubit ``q`` is bit ``q``
+    of the basis index) and is updated in place through reshaped views, so a
+    gate costs ``O(2^n)`` without building a ``2^n x 2^n`` operator.
+    """
 
-    def __init__(self, num_qubits: int):
+    def __init__(self, num_qubits: int, rng: Optional[np.random.Generator] = None):
         """Initialize quantum state.
 
         Args:
             num_qubits: Number of qubits
+            rng: Random generator used for measurements
         """
         self.num_qubits = num_qubits
         self.state = np.zeros(2**num_qubits, dtype=complex)
         self.state[0] = 1.0  # Initialize to |0...0⟩
+        self.rng = rng or np.random.default_rng()
+
+    def _split(self, qubit: int) -> np.ndarray:
+        """View the state as ``(high, 2, low)`` with ``qubit`` on the middle axis."""
+        if not 0 <= qubit < self.num_qubits:
+            raise ValueError(
+                f"Qubit {qubit} out of range for {self.num_qubits}-qubit state"
+            )
+        return self.state.reshape(-1, 2, 1 << qubit)
 
     def apply_gate(self, gate: Tuple[str, ...]) -> None:
         """Apply a gate to the state.
@@ -143,15 +168,28 @@ class QuantumState:
             gate: Gate specification
         """
         gate_type = gate[0]
-        if gate_type == "h":
-            # Apply Hadamard gate (simplified)
-            pass
-        elif gate_type == "x":
-            # Apply X gate (simplified)
-            pass
+        if gate_type in _GATE_MATRICES:
+            matrix = _GATE_MATRICES[gate_type]
+            view = self._split(gate[1])
+            zero = view[:, 0, :].copy()
+            one = view[:, 1, :]
+            view[:, 0, :] = matrix[0, 0] * zero + matrix[0, 1] * one
+            view[:, 1, :] = matrix[1, 0] * zero + matrix[1, 1] * one
         elif gate_type == "cx":
-            # Apply CNOT gate (simplified)
-            pass
+            control, target = gate[1], gate[2]
+            if control == target:
+                raise ValueError("CNOT control and target must differ")
+            # Swap the target's |0>/|1> halves inside the control=1 block
+            high, low = max(control, target), min(control, target)
+            view = self.state.reshape(-1, 2, 1 << (high - low - 1), 2, 1 << low)
+            if control > target:
+                block = view[:, 1, :, :, :]
+                block[...] = block[:, :, ::-1, :].copy()
+            else:
+                block = view[:, :, :, 1, :]
+                block[...] = block[:, ::-1, :, :].copy()
+        else:
+            raise ValueError(f"Unsupported gate: {gate_type}")
 
     def measure(self, qubit: int) -> int:
         """Measure a qubit.
@@ -162,8 +200,13 @@ class QuantumState:
         Returns:
             int: Measurement result (0 or 1)
         """
-        # Simplified measurement
-        return np.random.randint(0, 2)
+        view = self._split(qubit)
+        p_one = float(np.sum(np.abs(view[:, 1, :]) ** 2))
+        result = int(self.rng.random() < p_one)
+        # Collapse onto the observed outcome and renormalize
+        view[:, 1 - result, :] = 0.0
+        self.state /= np.sqrt(p_one if result else 1.0 - p_one)
+        return result
 
     def get_probabilities(self) -> np.ndarray:
         """Get measurement probabilities.
@@ -175,19 +218,70 @@ class QuantumState:
 
 
 class QuantumSimulator:
-    """Simple quantum circuit simulator."""
-
-    def __init__(self, backend: str = "default"):
+    """Dependency-free NumPy statevector simulator.
+
+    Final-state probabilities are cached per circuit structure (qubit count
+    and gate sequence), so re-running a circuit only re-samples the shots.
+    """
+
+    def __init__(
+        self,
+        backend: str = "default",
+        seed: Optional[int] = None,
+        cache_size: int = 128,
+    ):
         """Initialize simulator.
 
         Args:
             backend: Backend name
+            seed: Random seed for shot sampling
+            cache_size: Number of circuits whose probabilities are cached
         """
         self.backend = backend
+        self.rng = np.random.default_rng(seed)
+        self.cache_size = cache_size
+        self._cache: OrderedDict[Tuple[Any, ...], np.ndarray] = OrderedDict()
+
+    def probabilities(self, circuit: QuantumCircuit) -> np.ndarray:
+        """Simulate a circuit and return its final basis-state probabilities.
+
+        Args:
+            circuit: Quantum circuit to simulate
+
+        Returns:
+            np.ndarray: Probability of each basis state (read-only, since it
+            is shared with the cache; copy it before modifying)
+        """
+        key = (circuit.num_qubits, tuple(circuit.gates))
+        probs = self._cache.get(key)
+        if probs is not None:
+            self._cache.move_to_end(key)
+            return probs
+
+        state = QuantumState(circuit.num_qubits, rng=self.rng)
+        for gate in circuit.gates:
+            state.apply_gate(gate)
+        probs = state.get_probabilities()
+        probs /= probs.sum()
+        probs.flags.writeable = False
+
+        if self.cache_size > 0:
+            self._cache[key] = probs
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return probs
+
+    def clear_cache(self) -> None:
+        """Drop all cached circuit probabilities."""
+        self._cache.clear()
 
     def run(self, circuit: QuantumCircuit, shots: int = 1000) -> Dict[str, int]:
         """Run quantum circuit.
 
+        All shots are drawn with a single multinomial sample. When the
+        circuit declares measurements, bitstrings hold the classical bits
+        (highest bit first); otherwise every qubit is reported.
+
         Args:
             circuit: Quantum circuit to run
             shots: Number of shots
@@ -195,12 +289,23 @@ class QuantumSimulator:
         Returns:
             Dict[str, int]: Measurement results
         """
-        # Simplified simulation
-        results = {}
-        for _ in range(shots):
-            # Simulate measurement
-            result = "0" * circuit.num_qubits
-            results[result] = results.get(result, 0) + 1
+        probs = self.probabilities(circuit)
+        counts = self.rng.multinomial(shots, probs)
+        observed = np.flatnonzero(counts)
+
+        if circuit.measurements:
+            width = max(clbit for _, clbit in circuit.measurements) + 1
+            outcomes = np.zeros(len(observed), dtype=np.int64)
+            for qubit, clbit in circuit.measurements:
+                outcomes |= ((observed >> qubit) & 1) << clbit
+        else:
+            width = circuit.num_qubits
+            outcomes = observed
+
+        results: Dict[str, int] = {}
+        for outcome, count in zip(outcomes, counts[observed]):
+            key = format(int(outcome), f"0{width}b")
+            results[key] = results.get(key, 0) + int(count)
         return results
 
     def execute(self, circuit: QuantumCircuit, shots: int = 1000) -> Dict[str, Any]:
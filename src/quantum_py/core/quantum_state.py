@@ -10,8 +10,28 @@ from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 from numpy.typing import NDArray
-from qiskit import QuantumCircuit
-from qiskit.quantum_info import Statevector
+
+from .statevector import (
+    apply_gate,
+    collapse,
+    entanglement_entropy,
+    marginalize,
+    normalized_probabilities,
+    probabilities,
+    reduced_density_matrix,
+    sample_counts,
+    sample_indices,
+    validate_targets,
+)
+
+# Qiskit is only used to record an optional circuit alongside the native state
+try:
+    from qiskit import QuantumCircuit
+
+    QISKIT_AVAILABLE = True
+except ImportError:
+    QuantumCircuit = None
+    QISKIT_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -32,16 +52,24 @@ class Complex:
 
 
 class QuantumState:
-    """Enhanced quantum state implementation using NumPy for better performance."""
+    """Enhanced quantum state implementation using NumPy for better performance.
 
-    _CIRCUIT_NOT_INITIALIZED_ERROR = "Circuit not initialized"
+    Gates are applied directly to ``amplitudes`` with tensor contractions, so
+    reading the state, probabilities or fidelity never re-simulates the
+    circuit. When Qiskit is installed the applied operations are also
+    recorded on ``circuit`` for export and inspection.
+    """
 
-    def __init__(self, n_qubits: int, seed: Optional[int] = None) -> None:
+    def __init__(
+        self, n_qubits: int, seed: Optional[int] = None, record_circuit: bool = True
+    ) -> None:
         """Initialize a quantum state with the specified number of qubits.
 
         Args:
             n_qubits: Number of qubits in the system (must be positive and <= 32)
             seed: Random seed for reproducibility
+            record_circuit: Record applied gates on a Qiskit circuit (ignored
+                when Qiskit is not installed)
         """
         if not isinstance(n_qubits, int) or n_qubits <= 0 or n_qubits > 32:
             raise ValueError(
@@ -49,11 +77,11 @@ class QuantumState:
             )
 
         self.n_qubits = n_qubits
-        self.amplitudes: NDArray[np.complex128] = np.zeros(
-            2**n_qubits, dtype=np.complex128
-        )
+        self._probabilities: Optional[NDArray[np.float64]] = None
+        self.amplitudes = np.zeros(2**n_qubits, dtype=np.complex128)
         self.amplitudes[0] = 1.0  # Initialize to |0...0⟩ state
         self._entanglement_map: Dict[int, List[int]] = {}
+        self.record_circuit = record_circuit and QISKIT_AVAILABLE
         self.circuit: Optional[QuantumCircuit] = None
         self._initialize_state()
 
@@ -69,8 +97,19 @@ class QuantumState:
         """Get the quantum state vector."""
         return self.amplitudes
 
+    @property
+    def amplitudes(self) -> NDArray[np.complex128]:
+        """Statevector amplitudes, evolved in place by ``apply_gate``."""
+        return self._amplitudes
+
+    @amplitudes.setter
+    def amplitudes(self, value: NDArray[np.complex128]) -> None:
+        self._amplitudes = value
+        self._probabilities = None
+
     def _initialize_state(self) -> None:
-        self.circuit = QuantumCircuit(self.n_qubits)
+        if self.record_circuit:
+            self.circuit = QuantumCircuit(self.n_qubits)
         self._update_entanglement_map()
 
     def _update_entanglement_map(self) -> None:
@@ -78,85 +117,81 @@ class QuantumState:
             self._entanglement_map[i] = []
 
     def get_state_vector(self) -> NDArray[np.complex128]:
-        if self.circuit is None:
-            raise RuntimeError(self._CIRCUIT_NOT_INITIALIZED_ERROR)
-        return Statevector.from_instruction(self.circuit).data
+        return self._amplitudes.copy()
 
     def get_probabilities(self) -> NDArray[np.float64]:
-        state_vector = self.get_state_vector()
-        return np.abs(state_vector) ** 2
+        # Cached until the next gate application or state assignment
+        if self._probabilities is None:
+            self._probabilities = probabilities(self._amplitudes)
+        return self._probabilities.copy()
 
     def get_fidelity(self, target_state: "QuantumState") -> float:
-        state1 = self.get_state_vector()
-        state2 = target_state.get_state_vector()
-        return float(np.abs(np.vdot(state1, state2)) ** 2)
+        return float(np.abs(np.vdot(self._amplitudes, target_state.amplitudes)) ** 2)
 
-    def measure(self, qubits: List[int]) -> int:
-        if self.circuit is None:
-            raise RuntimeError(self._CIRCUIT_NOT_INITIALIZED_ERROR)
-        probs = self.get_probabilities()
-        outcome = self.rng.choice(2**self.n_qubits, p=probs)
-        result = 0
-        for i, qubit in enumerate(qubits):
-            result |= ((outcome >> qubit) & 1) << i
-        return result
+    def measure(self, qubits: List[int], collapse_state: bool = False) -> int:
+        """Sample one outcome of ``qubits`` (bit ``i`` holds ``qubits[i]``).
+
+        Args:
+            qubits: Qubits to measure
+            collapse_state: Project the state onto the sampled outcome
+        """
+        validate_targets(qubits, self.n_qubits)
+        outcome = int(marginalize(self.sample(1), qubits)[0] if qubits else 0)
+        if collapse_state:
+            self._collapse_state(qubits, outcome)
+        return outcome
+
+    def sample(self, shots: int) -> NDArray[np.int64]:
+        """Sample ``shots`` full-register basis-state indices without collapse."""
+        probs = normalized_probabilities(self._amplitudes)
+        return sample_indices(probs, shots, self.rng)
+
+    def sample_counts(
+        self, shots: int, qubits: Optional[List[int]] = None
+    ) -> Dict[str, int]:
+        """Histogram of ``shots`` measurements drawn in a single vectorized pass.
+
+        Args:
+            shots: Number of measurement shots
+            qubits: Qubits to report (all qubits by default); bitstrings list
+                ``qubits[-1]`` first, matching Qiskit's count keys
+
+        Returns:
+            Mapping of observed bitstrings to counts
+        """
+        if qubits is None:
+            qubits = list(range(self.n_qubits))
+        validate_targets(qubits, self.n_qubits)
+        probs = normalized_probabilities(self._amplitudes)
+        indices, counts = sample_counts(probs, shots, self.rng)
+        outcomes, inverse = np.unique(marginalize(indices, qubits), return_inverse=True)
+        totals = np.bincount(inverse, weights=counts).astype(np.int64)
+        width = len(qubits)
+        return {
+            format(int(outcome), f"0{width}b"): int(total)
+            for outcome, total in zip(outcomes, totals)
+        }
 
     def get_density_matrix(self) -> NDArray[np.complex128]:
         state = self.get_state_vector()
         return np.outer(state, np.conj(state))
 
     def get_reduced_density_matrix(self, qubits: List[int]) -> NDArray[np.complex128]:
-        rho = self.get_density_matrix()
-        n_qubits = len(qubits)
-        dim = 2**n_qubits
-        reduced_rho = np.zeros((dim, dim), dtype=np.complex128)
-
-        # Perform partial trace
-        for i in range(dim):
-            for j in range(dim):
-                reduced_rho[i, j] = self._partial_trace_element(rho, qubits, i, j)
-
-        return reduced_rho
-
-    def _partial_trace_element(
-        self, rho: NDArray[np.complex128], qubits: List[int], i: int, j: int
-    ) -> complex:
-        trace = 0.0
-        n_total = self.n_qubits
-        for k in range(2 ** (n_total - len(qubits))):
-            idx1 = self._combine_indices(i, k, qubits)
-            idx2 = self._combine_indices(j, k, qubits)
-            trace += rho[idx1, idx2]
-        return complex(trace)
-
-    def _combine_indices(
-        self, kept_idx: int, traced_idx: int, kept_qubits: List[int]
-    ) -> int:
-        result = 0
-        traced_bit_pos = 0
-        kept_bit_pos = 0
-
-        for i in range(self.n_qubits):
-            if i in kept_qubits:
-                bit = (kept_idx >> kept_bit_pos) & 1
-                kept_bit_pos += 1
-            else:
-                bit = (traced_idx >> traced_bit_pos) & 1
-                traced_bit_pos += 1
-            result |= bit << i
+        """Reduced density matrix of ``qubits`` (ascending qubit order).
 
-        return result
+        Computed from the statevector by reshaping and contracting the traced
+        axes, so the full ``2^n x 2^n`` density matrix is never formed.
+        """
+        validate_targets(qubits, self.n_qubits)
+        return reduced_density_matrix(self._amplitudes, qubits, self.n_qubits)
 
     def get_entanglement_entropy(self, qubits: List[int]) -> float:
-        rho = self.get_reduced_density_matrix(qubits)
-        eigenvalues = np.linalg.eigvalsh(rho)
-        # Remove near-zero eigenvalues to avoid log(0)
-        eigenvalues = eigenvalues[eigenvalues > 1e-10]
-        return float(-np.sum(eigenvalues * np.log2(eigenvalues)))
+        validate_targets(qubits, self.n_qubits)
+        return entanglement_entropy(self._amplitudes, qubits, self.n_qubits)
 
     def get_purity(self) -> float:
-        rho = self.get_density_matrix()
-        return float(np.trace(rho @ rho).real)
+        # Tr(rho^2) of a pure state |psi><psi| is <psi|psi>^2
+        return float(np.vdot(self._amplitudes, self._amplitudes).real ** 2)
 
     def get_concurrence(self, qubit1: int, qubit2: int) -> float:
         if self.n_qubits < 2:
@@ -164,10 +199,11 @@ class QuantumState:
 
         rho = self.get_reduced_density_matrix([qubit1, qubit2])
         sigma_y = np.array([[0, -1j], [1j, 0]], dtype=np.complex128)
-        rho_tilde = (sigma_y @ np.conj(rho) @ sigma_y).reshape(2, 2)
+        spin_flip = np.kron(sigma_y, sigma_y)
+        rho_tilde = spin_flip @ np.conj(rho) @ spin_flip
         R = rho @ rho_tilde
-        eigenvalues = np.sqrt(np.linalg.eigvals(R))
-        eigenvalues = np.sort(np.abs(eigenvalues))[::-1]
+        eigenvalues = np.sqrt(np.abs(np.linalg.eigvals(R)))
+        eigenvalues = np.sort(eigenvalues)[::-1]
         return float(
             max(0.0, eigenvalues[0] - eigenvalues[1] - eigenvalues[2] - eigenvalues[3])
         )
@@ -181,40 +217,33 @@ class QuantumState:
             gate_matrix: Unitary matrix representing the quantum gate
             target_qubits: List of target qubit indices
         """
-        if self.circuit is None:
-            raise RuntimeError(self._CIRCUIT_NOT_INITIALIZED_ERROR)
-
         # Validate gate matrix dimensions
         n_qubits = len(target_qubits)
         expected_size = 2**n_qubits
         if gate_matrix.shape != (expected_size, expected_size):
             raise ValueError(f"Invalid gate matrix dimensions for {n_qubits} qubits")
+        validate_targets(target_qubits, self.n_qubits)
 
-        # Apply gate to circuit
-        self.circuit.unitary(gate_matrix, target_qubits)
+        self.amplitudes = apply_gate(
+            self._amplitudes,
+            np.asarray(gate_matrix, dtype=np.complex128),
+            target_qubits,
+            self.n_qubits,
+        )
+        if self.circuit is not None:
+            self.circuit.unitary(gate_matrix, target_qubits)
         self._update_entanglement(target_qubits)
 
-    def measure_all(self):
+    def measure_all(self) -> Dict[int, int]:
         """Measure all qubits in the computational basis."""
-        results = {}
-
-        # Calculate measurement probabilities
-        probabilities = np.abs(self.amplitudes) ** 2
-
-        # Perform measurements
-        for i in range(self.n_qubits):
-            outcome = 1 if self.rng.random() < probabilities[i] else 0
-            results[i] = outcome
-            self._collapse_state(i, outcome)
-
-        return results
+        qubits = list(range(self.n_qubits))
+        outcome = self.measure(qubits, collapse_state=True)
+        return {qubit: (outcome >> qubit) & 1 for qubit in qubits}
 
-    def _collapse_state(self, qubit_idx, outcome):
+    def _collapse_state(self, qubits: List[int], outcome: int) -> None:
         """Collapse the state after measurement."""
         # Project and normalize the state
-        projection = self._get_projection_operator(qubit_idx, outcome)
-        self.amplitudes = projection @ self.amplitudes
-        self.amplitudes /= np.linalg.norm(self.amplitudes)
+        self.amplitudes = collapse(self._amplitudes, qubits, outcome)
 
     def _validate_gate(self, gate_matrix: np.ndarray, num_target_qubits: int) -> bool:
         """Validate that a gate matrix is unitary and has correct dimensions."""
@@ -271,9 +300,10 @@ class QuantumState:
                 self._apply_phase_error(i, phase)
 
     def _apply_phase_error(self, qubit: int, angle: float) -> None:
-        if self.circuit is None:
-            raise RuntimeError(self._CIRCUIT_NOT_INITIALIZED_ERROR)
-        self.circuit.rz(angle, qubit)
+        rz = np.diag([np.exp(-0.5j * angle), np.exp(0.5j * angle)])
+        self.amplitudes = apply_gate(self._amplitudes, rz, [qubit], self.n_qubits)
+        if self.circuit is not None:
+            self.circuit.rz(angle, qubit)
 
     def get_entanglement_map(self) -> Dict[Tuple[int, int], float]:
         """Get current entanglement map with normalized values."""
@@ -285,50 +315,19 @@ class QuantumState:
                 entanglement_map[(i, j)] = norm
         return entanglement_map
 
-    def _get_projection_operator(
-        self, qubit_idx: int, outcome: int
-    ) -> NDArray[np.complex128]:
-        """Create projection operator for measurement on specified qubit."""
-        dim = 2**self.n_qubits
-        projector = np.zeros((dim, dim), dtype=np.complex128)
-        mask = 1 << qubit_idx
-        for i in range(dim):
-            if (i & mask) >> qubit_idx == outcome:
-                projector[i, i] = 1.0
-        return projector
-
     def _update_entanglement(self, target_qubits: List[int]) -> None:
         """Update entanglement map after gate application."""
-        # Update entanglement between target qubits
+        # Multi-qubit gates may entangle every pair of their targets; the
+        # amplitudes themselves are already evolved by apply_gate.
         for i in target_qubits:
-            for j in range(self.n_qubits):
-                if j not in target_qubits:
-                    # Calculate new entanglement
-                    new_entanglement = self._calculate_entanglement(i, j)
-                    self.amplitudes[i] *= new_entanglement
-                    self.amplitudes[j] *= np.conj(new_entanglement)
+            for j in target_qubits:
+                if j != i and j not in self._entanglement_map[i]:
+                    self._entanglement_map[i].append(j)
 
     def _calculate_entanglement(self, qubit1: int, qubit2: int) -> complex:
         """Calculate entanglement between two qubits."""
-        # Get reduced density matrix for the two qubits
-        rho = self.get_reduced_density_matrix(
-            [i for i in range(self.n_qubits) if i not in [qubit1, qubit2]]
-        )
-
-        # Calculate concurrence as measure of entanglement
-        rho_tilde = (
-            np.kron(np.array([[0, 1], [-1, 0]]), np.array([[0, 1], [-1, 0]]))
-            @ rho.conj()
-            @ np.kron(np.array([[0, 1], [-1, 0]]), np.array([[0, 1], [-1, 0]]))
-        )
-
-        eigenvalues = np.linalg.eigvals(rho @ rho_tilde)
-        eigenvalues = np.sqrt(np.maximum(eigenvalues, 0))
-
-        # Calculate concurrence
-        concurrence = max(
-            0, eigenvalues[0] - eigenvalues[1] - eigenvalues[2] - eigenvalues[3]
-        )
+        # Concurrence of the two-qubit reduced state as measure of entanglement
+        concurrence = self.get_concurrence(qubit1, qubit2)
 
         return concurrence * np.exp(
             1j * np.angle(self.amplitudes[qubit1] * self.amplitudes[qubit2])
@@ -0,0 +1,189 @@
+"""
+Statevector Kernels Module
+Copyright (c) 2024, Bleu.js
+
+Dependency-free NumPy kernels that evolve a dense statevector in place.
+
+Qubit ordering follows Qiskit's little-endian convention: qubit ``q`` is bit
+``q`` of the basis-state index, so when the statevector is viewed as an
+``n``-dimensional ``(2, 2, ..., 2)`` tensor in C order, qubit ``q`` lives on
+axis ``n - 1 - q``. Multi-qubit gate matrices use the same convention as
+``QuantumCircuit.unitary(matrix, targets)``: ``targets[0]`` is the least
+significant bit of the gate's row/column index.
+"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+def qubit_axis(qubit: int, n_qubits: int) -> int:
+    """Return the tensor axis holding ``qubit`` in a reshaped statevector."""
+    return n_qubits - 1 - qubit
+
+
+def validate_targets(targets: Sequence[int], n_qubits: int) -> None:
+    """Raise ``ValueError`` for out-of-range or repeated target qubits."""
+    if len(set(targets)) != len(targets):
+        raise ValueError(f"Target qubits must be distinct, got {list(targets)}")
+    for qubit in targets:
+        if not 0 <= qubit < n_qubits:
+            raise ValueError(
+                f"Qubit index {qubit} out of range for {n_qubits}-qubit state"
+            )
+
+
+def apply_single_qubit_gate(
+    state: NDArray[np.complex128], matrix: NDArray[np.complex128], qubit: int
+) -> NDArray[np.complex128]:
+    """Apply a 2x2 gate to ``qubit`` of ``state`` in place.
+
+    The statevector is viewed as ``(high, 2, low)`` so that the two amplitude
+    slices paired by the gate are strided views; only one slice is copied.
+
+    Returns:
+        The same array object, updated in place.
+    """
+    low = 1 << qubit
+    view = state.reshape(-1, 2, low)
+    zero = view[:, 0, :].copy()
+    one = view[:, 1, :]
+    view[:, 0, :] = matrix[0, 0] * zero + matrix[0, 1] * one
+    view[:, 1, :] = matrix[1, 0] * zero + matrix[1, 1] * one
+    return state
+
+
+def apply_gate(
+    state: NDArray[np.complex128],
+    matrix: NDArray[np.complex128],
+    targets: Sequence[int],
+    n_qubits: int,
+) -> NDArray[np.complex128]:
+    """Apply a ``2^k x 2^k`` gate to ``targets`` of an ``n_qubits`` statevector.
+
+    Single-qubit gates are applied in place; wider gates are contracted
+    against the target axes of the reshaped state with ``np.tensordot``,
+    which never materializes the ``2^n x 2^n`` Kronecker expansion.
+
+    Returns:
+        The updated statevector (the input array for single-qubit gates).
+    """
+    k = len(targets)
+    if k == 1:
+        return apply_single_qubit_gate(state, matrix, targets[0])
+
+    # Gate tensor axes: outputs (t_{k-1}, ..., t_0) then inputs in that order.
+    gate = matrix.reshape((2,) * (2 * k))
+    axes = [qubit_axis(q, n_qubits) for q in reversed(targets)]
+    psi = state.reshape((2,) * n_qubits)
+    out = np.tensordot(gate, psi, axes=(list(range(k, 2 * k)), axes))
+    out = np.moveaxis(out, list(range(k)), axes)
+    return np.ascontiguousarray(out).reshape(-1)
+
+
+def probabilities(state: NDArray[np.complex128]) -> NDArray[np.float64]:
+    """Return the computational-basis probabilities of ``state``."""
+    return state.real**2 + state.imag**2
+
+
+def bipartition(
+    state: NDArray[np.complex128], keep: Sequence[int], n_qubits: int
+) -> NDArray[np.complex128]:
+    """Reshape ``state`` into a ``(2^k, 2^(n-k))`` kept-by-traced matrix.
+
+    Row indices enumerate the kept qubits in ascending qubit order (the
+    smallest kept qubit is the least significant bit), matching the layout of
+    ``qiskit.quantum_info.partial_trace``.
+    """
+    kept = sorted(keep)
+    kept_axes = [qubit_axis(q, n_qubits) for q in reversed(kept)]
+    traced_axes = [
+        qubit_axis(q, n_qubits) for q in reversed(range(n_qubits)) if q not in kept
+    ]
+    psi = state.reshape((2,) * n_qubits).transpose(kept_axes + traced_axes)
+    return psi.reshape(1 << len(kept), -1)
+
+
+def reduced_density_matrix(
+    state: NDArray[np.complex128], keep: Sequence[int], n_qubits: int
+) -> NDArray[np.complex128]:
+    """Trace out every qubit not in ``keep`` without forming ``|psi><psi|``.
+
+    Memory is ``O(2^n + 4^k)`` rather than ``O(4^n)``.
+    """
+    matrix = bipartition(state, keep, n_qubits)
+    return matrix @ matrix.conj().T
+
+
+def entanglement_entropy(
+    state: NDArray[np.complex128], keep: Sequence[int], n_qubits: int
+) -> float:
+    """Von Neumann entropy (base 2) of the subsystem ``keep`` of a pure state.
+
+    Both halves of a pure-state bipartition share the same non-zero spectrum,
+    so the smaller of the two reduced density matrices is diagonalized.
+    """
+    matrix = bipartition(state, keep, n_qubits)
+    if matrix.shape[0] <= matrix.shape[1]:
+        gram = matrix @ matrix.conj().T
+    else:
+        gram = matrix.conj().T @ matrix
+    eigenvalues = np.linalg.eigvalsh(gram)
+    # Remove near-zero eigenvalues to avoid log(0)
+    eigenvalues = eigenvalues[eigenvalues > 1e-10]
+    return float(-np.sum(eigenvalues * np.log2(eigenvalues)))
+
+
+def normalized_probabilities(state: NDArray[np.complex128]) -> NDArray[np.float64]:
+    """Return probabilities renormalized to sum to exactly one for sampling."""
+    probs = probabilities(state)
+    return probs / probs.sum()
+
+
+def sample_indices(
+    probs: NDArray[np.float64], shots: int, rng: np.random.Generator
+) -> NDArray[np.int64]:
+    """Draw ``shots`` basis-state indices in one inverse-CDF pass."""
+    cdf = np.cumsum(probs)
+    cdf /= cdf[-1]
+    draws = np.searchsorted(cdf, rng.random(shots), side="right")
+    return np.minimum(draws, len(probs) - 1)
+
+
+def sample_counts(
+    probs: NDArray[np.float64], shots: int, rng: np.random.Generator
+) -> Tuple[NDArray[np.int64], NDArray[np.int64]]:
+    """Draw a ``shots``-sample histogram with a single multinomial call.
+
+    Returns:
+        ``(indices, counts)`` for the basis states observed at least once.
+    """
+    counts = rng.multinomial(shots, probs)
+    observed = np.flatnonzero(counts)
+    return observed, counts[observed]
+
+
+def marginalize(indices: NDArray[np.int64], qubits: Sequence[int]) -> NDArray[np.int64]:
+    """Project full-register indices onto ``qubits`` (``qubits[i]`` -> bit i)."""
+    bits = (indices[:, None] >> np.asarray(qubits, dtype=np.int64)) & 1
+    return (bits << np.arange(len(qubits), dtype=np.int64)).sum(axis=1)
+
+
+def collapse(
+    state: NDArray[np.complex128], qubits: Sequence[int], outcome: int
+) -> NDArray[np.complex128]:
+    """Project ``state`` onto ``outcome`` of ``qubits`` and renormalize in place.
+
+    Bit ``i`` of ``outcome`` is the measured value of ``qubits[i]``. Each
+    qubit's rejected half is zeroed through a strided view, so no projector
+    matrix or index array is allocated.
+    """
+    for i, qubit in enumerate(qubits):
+        bit = (outcome >> i) & 1
+        state.reshape(-1, 2, 1 << qubit)[:, 1 - bit, :] = 0.0
+    norm = np.linalg.norm(state)
+    if norm == 0.0:
+        raise ValueError(f"Outcome {outcome} has zero probability on {list(qubits)}")
+    state /= norm
+    return state
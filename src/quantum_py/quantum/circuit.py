@@ -7,6 +7,13 @@ from typing import Any, Dict, List, Optional
 import numpy as np
 from numpy.typing import NDArray
 
+from .circuit_optimizer import (
+    CircuitOptimizer,
+    OptimizationReport,
+    ops_from_qiskit,
+    ops_to_qiskit,
+)
+
 # Try to import qiskit dependencies, with fallbacks
 try:
     from qiskit import ClassicalRegister
@@ -143,6 +150,7 @@ class QuantumCircuit:
         }
 
         self.rng = np.random.default_rng(seed=42)  # Fixed seed for reproducibility
+        self.last_optimization: Optional[OptimizationReport] = None
 
         # Build the circuit
         self.build_circuit()
@@ -529,76 +537,27 @@ class QuantumCircuit:
     def get_state(self) -> NDArray[np.complex128]:
         return Statevector.from_instruction(self.circuit).data
 
-    def optimize(self) -> None:
-        # Perform circuit optimization
-        self._remove_redundant_gates()
-        self._merge_adjacent_gates()
-        self._update_metrics()
-
-    def _remove_redundant_gates(self) -> None:
-        # Identify and remove redundant gates
-        current_layer: List[Any] = []
-        for instruction in self.circuit.data:
-            gate = instruction[0]
-            qubits = instruction[1]
-            if self._are_gates_cancellable(current_layer, gate, qubits):
-                current_layer.pop()
-            else:
-                current_layer.append(gate)
-
-    def _merge_adjacent_gates(self) -> None:
-        # Merge adjacent gates when possible
-        current_layer: List[Any] = []
-        next_layer: List[Any] = []
+    def optimize(self, fuse_two_qubit: bool = True) -> OptimizationReport:
+        """Cancel, merge and fuse gates in place before simulation.
 
-        for instruction in self.circuit.data:
-            gate = instruction[0]
-            qubits = instruction[1]
-
-            if self._can_merge_gates(current_layer, gate):
-                self._merge_gates(current_layer, gate, qubits)
-            else:
-                next_layer = [(gate, qubits)]
-                current_layer = next_layer
+        Args:
+            fuse_two_qubit: Also fuse blocks confined to a qubit pair into a
+                single 4x4 unitary
 
-    def _are_gates_cancellable(
-        self,
-        layer: List[Any],
-        gate: Any,
-        qubits: List[int],
-    ) -> bool:
-        """Check if gates cancel each other based on quantum circuit properties."""
-        if not layer:  # Empty layer
-            return False
-
-        last_gate = layer[-1]
-        # Check for self-cancelling gate pairs (e.g., two consecutive X gates)
-        if (
-            last_gate.name == gate.name
-            and last_gate.name in ["x", "y", "z", "h"]
-            and qubits == last_gate.qubits
-        ):
-            return True
-        return False
-
-    def _can_merge_gates(self, layer: List[Any], gate: Any) -> bool:
-        """Check if gates can be merged based on quantum circuit optimization rules."""
-        if not layer:  # Empty layer
-            return False
-
-        last_gate = layer[-1][0]  # Get gate from (gate, qubits) tuple
-        # Check for mergeable rotation gates
-        if (
-            last_gate.name.startswith("r")
-            and gate.name.startswith("r")
-            and last_gate.name == gate.name
-        ):
-            return True
-        return False
+        Returns:
+            Report of the gates and depth removed
+        """
+        if self.circuit is None:
+            raise RuntimeError(CIRCUIT_NOT_INITIALIZED_ERROR)
 
-    def _merge_gates(self, layer: List[Any], gate: Any, qubits: List[int]) -> None:
-        # Merge compatible gates
-        pass  # Placeholder implementation
+        optimizer = CircuitOptimizer(fuse_two_qubit=fuse_two_qubit)
+        ops, report = optimizer.run(ops_from_qiskit(self.circuit))
+        if QISKIT_AVAILABLE:
+            self.circuit = ops_to_qiskit(ops, self.circuit)
+        self.last_optimization = report
+        self.metrics["optimization_score"] = float(report.gates_removed)
+        self._update_metrics()
+        return report
 
     def get_metrics(self) -> Dict[str, float]:
         return self.metrics.copy()
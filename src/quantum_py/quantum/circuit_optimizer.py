@@ -0,0 +1,417 @@
+"""Gate-level optimization passes for quantum circuits.
+
+Circuits are lowered to a flat list of :class:`GateOp` objects (qubit indices
+plus, for unitary gates, their matrix). Passes walk each gate back through
+its dependency-DAG predecessors, skipping gates on disjoint qubits and gates
+it commutes with, so cancellations and merges are found even when the two
+gates are not adjacent in program order.
+
+Matrices follow Qiskit's little-endian convention: ``qubits[0]`` is the least
+significant bit of the gate's row/column index. Optimized ops can therefore
+be re-emitted as a Qiskit circuit or applied directly with
+``QuantumState.apply_gate(op.matrix, list(op.qubits))``.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..core.statevector import apply_gate
+
+logger = logging.getLogger(__name__)
+
+_ATOL = 1e-9
+
+_SQRT_HALF = 1 / np.sqrt(2)
+
+# Fixed gates, keyed by Qiskit instruction name
+_FIXED_GATES: Dict[str, NDArray[np.complex128]] = {
+    "id": np.eye(2, dtype=complex),
+    "h": np.array([[1, 1], [1, -1]], dtype=complex) * _SQRT_HALF,
+    "x": np.array([[0, 1], [1, 0]], dtype=complex),
+    "y": np.array([[0, -1j], [1j, 0]], dtype=complex),
+    "z": np.diag([1, -1]).astype(complex),
+    "s": np.diag([1, 1j]),
+    "sdg": np.diag([1, -1j]),
+    "t": np.diag([1, np.exp(1j * np.pi / 4)]),
+    "tdg": np.diag([1, np.exp(-1j * np.pi / 4)]),
+    "sx": np.array([[1 + 1j, 1 - 1j], [1 - 1j, 1 + 1j]]) / 2,
+    "sxdg": np.array([[1 - 1j, 1 + 1j], [1 + 1j, 1 - 1j]]) / 2,
+    # Two-qubit gates: qubits[0] (the control) is the low bit
+    "cx": np.array(
+        [[1, 0, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0], [0, 1, 0, 0]], dtype=complex
+    ),
+    "cy": np.array(
+        [[1, 0, 0, 0], [0, 0, 0, -1j], [0, 0, 1, 0], [0, 1j, 0, 0]], dtype=complex
+    ),
+    "cz": np.diag([1, 1, 1, -1]).astype(complex),
+    "swap": np.array(
+        [[1, 0, 0, 0], [0, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 1]], dtype=complex
+    ),
+}
+
+
+def _rx(theta: float) -> NDArray[np.complex128]:
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -1j * s], [-1j * s, c]])
+
+
+def _ry(theta: float) -> NDArray[np.complex128]:
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -s], [s, c]], dtype=complex)
+
+
+def _rz(theta: float) -> NDArray[np.complex128]:
+    return np.diag([np.exp(-0.5j * theta), np.exp(0.5j * theta)])
+
+
+def _phase(theta: float) -> NDArray[np.complex128]:
+    return np.diag([1, np.exp(1j * theta)])
+
+
+# Single-parameter rotations whose angles add when applied back to back
+_ROTATION_GATES: Dict[str, Callable[[float], NDArray[np.complex128]]] = {
+    "rx": _rx,
+    "ry": _ry,
+    "rz": _rz,
+    "p": _phase,
+}
+
+
+def gate_matrix(name: str, params: Sequence[float] = ()) -> Optional[np.ndarray]:
+    """Return the unitary for a named gate, or ``None`` if it is not known."""
+    if name in _FIXED_GATES:
+        return _FIXED_GATES[name]
+    if name in _ROTATION_GATES and len(params) == 1:
+        return _ROTATION_GATES[name](float(params[0]))
+    return None
+
+
+@dataclass
+class GateOp:
+    """A single circuit operation.
+
+    Ops without a matrix (measurements, barriers, resets, symbolic gates) are
+    opaque: passes never move, merge or fuse across them.
+    """
+
+    name: str
+    qubits: Tuple[int, ...]
+    params: Tuple[float, ...] = ()
+    matrix: Optional[NDArray[np.complex128]] = None
+    source: Any = None  # Original instruction, re-emitted when left untouched
+
+    @property
+    def is_unitary(self) -> bool:
+        return self.matrix is not None
+
+    @classmethod
+    def from_name(
+        cls, name: str, qubits: Sequence[int], params: Sequence[float] = ()
+    ) -> "GateOp":
+        """Build an op for a standard gate, resolving its matrix."""
+        return cls(name, tuple(qubits), tuple(params), gate_matrix(name, params))
+
+
+@dataclass
+class OptimizationReport:
+    """Summary of what an optimization run removed."""
+
+    gates_before: int
+    gates_after: int
+    depth_before: int
+    depth_after: int
+    removed_by_pass: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def gates_removed(self) -> int:
+        return self.gates_before - self.gates_after
+
+    @property
+    def depth_removed(self) -> int:
+        return self.depth_before - self.depth_after
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "gates_before": self.gates_before,
+            "gates_after": self.gates_after,
+            "gates_removed": self.gates_removed,
+            "depth_before": self.depth_before,
+            "depth_after": self.depth_after,
+            "depth_removed": self.depth_removed,
+            "removed_by_pass": dict(self.removed_by_pass),
+        }
+
+
+def circuit_depth(ops: Sequence[GateOp]) -> int:
+    """Number of layers when every op waits for all of its qubits."""
+    levels: Dict[int, int] = {}
+    depth = 0
+    for op in ops:
+        level = 1 + max((levels.get(q, 0) for q in op.qubits), default=0)
+        for qubit in op.qubits:
+            levels[qubit] = level
+        depth = max(depth, level)
+    return depth
+
+
+def embed(
+    matrix: NDArray[np.complex128], qubits: Sequence[int], space: Sequence[int]
+) -> NDArray[np.complex128]:
+    """Lift ``matrix`` acting on ``qubits`` to the operator on ``space``."""
+    positions = [list(space).index(q) for q in qubits]
+    n = len(space)
+    columns = np.eye(2**n, dtype=complex)
+    return np.stack(
+        [apply_gate(col.copy(), matrix, positions, n) for col in columns], axis=1
+    )
+
+
+def _is_identity(matrix: NDArray[np.complex128]) -> bool:
+    """True if ``matrix`` is the identity up to a global phase."""
+    phase = matrix[0, 0]
+    if abs(abs(phase) - 1) > _ATOL:
+        return False
+    return np.allclose(matrix, phase * np.eye(len(matrix)), atol=_ATOL)
+
+
+def _commute(first: GateOp, second: GateOp) -> bool:
+    """Check whether two unitary ops commute on their combined qubits."""
+    if not (first.is_unitary and second.is_unitary):
+        return False
+    space = sorted(set(first.qubits) | set(second.qubits))
+    if len(space) > 3:
+        return False
+    a = embed(first.matrix, first.qubits, space)
+    b = embed(second.matrix, second.qubits, space)
+    return np.allclose(a @ b, b @ a, atol=_ATOL)
+
+
+def _walk_back(
+    out: List[Optional[GateOp]],
+    op: GateOp,
+    try_combine: Callable[[GateOp, GateOp], Optional[List[GateOp]]],
+) -> bool:
+    """Search ``op``'s DAG predecessors for a gate it can combine with.
+
+    ``try_combine(prev, op)`` returns the replacement ops for ``prev`` (empty
+    list to delete both) or ``None`` if the pair cannot be combined. Returns
+    True if ``op`` was absorbed.
+    """
+    qubits = set(op.qubits)
+    for j in range(len(out) - 1, -1, -1):
+        prev = out[j]
+        if prev is None or qubits.isdisjoint(prev.qubits):
+            continue
+        if prev.qubits == op.qubits:
+            replacement = try_combine(prev, op)
+            if replacement is not None:
+                out[j] = replacement[0] if replacement else None
+                return True
+        if not _commute(prev, op):
+            return False
+    return False
+
+
+def cancel_inverses(ops: Sequence[GateOp]) -> List[GateOp]:
+    """Remove pairs of mutually inverse gates that meet in the DAG."""
+
+    def combine(prev: GateOp, op: GateOp) -> Optional[List[GateOp]]:
+        if prev.is_unitary and op.is_unitary:
+            if np.allclose(op.matrix @ prev.matrix, np.eye(len(op.matrix))):
+                return []
+        return None
+
+    out: List[Optional[GateOp]] = []
+    for op in ops:
+        if not (op.is_unitary and _walk_back(out, op, combine)):
+            out.append(op)
+    return [op for op in out if op is not None]
+
+
+def merge_rotations(ops: Sequence[GateOp]) -> List[GateOp]:
+    """Add the angles of same-axis rotations and drop those that vanish."""
+
+    def combine(prev: GateOp, op: GateOp) -> Optional[List[GateOp]]:
+        if prev.name != op.name or op.name not in _ROTATION_GATES:
+            return None
+        # Symbolic rotations are opaque (no matrix, no bound angle)
+        if not (prev.is_unitary and len(prev.params) == 1):
+            return None
+        merged = GateOp.from_name(op.name, op.qubits, (prev.params[0] + op.params[0],))
+        return [] if _is_identity(merged.matrix) else [merged]
+
+    out: List[Optional[GateOp]] = []
+    for op in ops:
+        if op.name in _ROTATION_GATES and op.is_unitary:
+            if _is_identity(op.matrix):
+                continue
+            if _walk_back(out, op, combine):
+                continue
+        out.append(op)
+    return [op for op in out if op is not None]
+
+
+def fuse_single_qubit_runs(ops: Sequence[GateOp]) -> List[GateOp]:
+    """Replace each run of single-qubit gates on a wire with one 2x2 unitary."""
+    out: List[GateOp] = []
+    pending: Dict[int, List[GateOp]] = {}
+
+    def flush(qubit: int) -> None:
+        run = pending.pop(qubit, [])
+        if len(run) == 1:
+            out.append(run[0])
+        elif run:
+            matrix = run[0].matrix
+            for op in run[1:]:
+                matrix = op.matrix @ matrix
+            if not _is_identity(matrix):
+                out.append(GateOp("unitary", (qubit,), matrix=matrix))
+
+    for op in ops:
+        if op.is_unitary and len(op.qubits) == 1:
+            pending.setdefault(op.qubits[0], []).append(op)
+            continue
+        for qubit in op.qubits:
+            flush(qubit)
+        out.append(op)
+    for qubit in list(pending):
+        flush(qubit)
+    return out
+
+
+def fuse_two_qubit_blocks(ops: Sequence[GateOp]) -> List[GateOp]:
+    """Collapse maximal blocks of gates confined to one qubit pair into 4x4s."""
+    out: List[GateOp] = []
+    blocks: Dict[Tuple[int, int], List[GateOp]] = {}
+    owner: Dict[int, Tuple[int, int]] = {}
+
+    def close(pair: Tuple[int, int]) -> None:
+        block = blocks.pop(pair)
+        for qubit in pair:
+            owner.pop(qubit, None)
+        if len(block) == 1:
+            out.append(block[0])
+            return
+        matrix = np.eye(4, dtype=complex)
+        for op in block:
+            matrix = embed(op.matrix, op.qubits, pair) @ matrix
+        out.append(GateOp("unitary", pair, matrix=matrix))
+
+    for op in ops:
+        if op.is_unitary and len(op.qubits) == 1 and op.qubits[0] in owner:
+            blocks[owner[op.qubits[0]]].append(op)
+            continue
+        if op.is_unitary and len(op.qubits) == 2:
+            pair = tuple(sorted(op.qubits))
+            if pair in blocks:
+                blocks[pair].append(op)
+                continue
+            for qubit in pair:
+                if qubit in owner:
+                    close(owner[qubit])
+            blocks[pair] = [op]
+            owner.update({qubit: pair for qubit in pair})
+            continue
+        for qubit in op.qubits:
+            if qubit in owner:
+                close(owner[qubit])
+        out.append(op)
+    for pair in list(blocks):
+        close(pair)
+    return out
+
+
+class CircuitOptimizer:
+    """Pipeline of gate cancellation, rotation merging and gate fusion.
+
+    Cancellation and rotation merging repeat until neither removes anything
+    (each can expose new opportunities for the other); fusion runs once at
+    the end because fused unitaries no longer match named inverse pairs.
+    """
+
+    def __init__(
+        self,
+        fuse_single_qubit: bool = True,
+        fuse_two_qubit: bool = True,
+        max_iterations: int = 10,
+    ) -> None:
+        self.fuse_single_qubit = fuse_single_qubit
+        self.fuse_two_qubit = fuse_two_qubit
+        self.max_iterations = max_iterations
+
+    def run(self, ops: Sequence[GateOp]) -> Tuple[List[GateOp], OptimizationReport]:
+        """Optimize ``ops`` and report the gates and depth removed."""
+        removed: Dict[str, int] = {
+            "cancel_inverses": 0,
+            "merge_rotations": 0,
+            "fuse_single_qubit_runs": 0,
+            "fuse_two_qubit_blocks": 0,
+        }
+        current = list(ops)
+        for _ in range(self.max_iterations):
+            size = len(current)
+            for name, optimization_pass in (
+                ("cancel_inverses", cancel_inverses),
+                ("merge_rotations", merge_rotations),
+            ):
+                before = len(current)
+                current = optimization_pass(current)
+                removed[name] += before - len(current)
+            if len(current) == size:
+                break
+
+        fusion_passes = []
+        if self.fuse_single_qubit:
+            fusion_passes.append(("fuse_single_qubit_runs", fuse_single_qubit_runs))
+        if self.fuse_two_qubit:
+            fusion_passes.append(("fuse_two_qubit_blocks", fuse_two_qubit_blocks))
+        for name, optimization_pass in fusion_passes:
+            before = len(current)
+            current = optimization_pass(current)
+            removed[name] += before - len(current)
+
+        report = OptimizationReport(
+            gates_before=len(ops),
+            gates_after=len(current),
+            depth_before=circuit_depth(ops),
+            depth_after=circuit_depth(current),
+            removed_by_pass=removed,
+        )
+        logger.debug("Circuit optimization: %s", report.to_dict())
+        return current, report
+
+
+def ops_from_qiskit(circuit: Any) -> List[GateOp]:
+    """Lower a Qiskit circuit to ``GateOp`` objects."""
+    ops: List[GateOp] = []
+    for instruction in circuit.data:
+        operation = instruction.operation
+        qubits = tuple(circuit.find_bit(q).index for q in instruction.qubits)
+        if operation.name == "unitary":
+            params, matrix = (), np.asarray(operation.to_matrix(), dtype=complex)
+        else:
+            try:
+                params = tuple(float(p) for p in operation.params)
+            except (TypeError, ValueError):
+                params, matrix = (), None  # Unbound parameters stay opaque
+            else:
+                matrix = gate_matrix(operation.name, params)
+        ops.append(GateOp(operation.name, qubits, params, matrix, instruction))
+    return ops
+
+
+def ops_to_qiskit(ops: Sequence[GateOp], template: Any) -> Any:
+    """Rebuild a Qiskit circuit with the registers of ``template``."""
+    circuit = template.copy_empty_like()
+    for op in ops:
+        if op.source is not None:
+            circuit.append(op.source)
+        elif op.name in _ROTATION_GATES:
+            getattr(circuit, op.name)(op.params[0], op.qubits[0])
+        else:
+            circuit.unitary(op.matrix, list(op.qubits))
+    return circuit
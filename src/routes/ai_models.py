@@ -3,11 +3,13 @@ AI Models API Routes for Bleu.js
 Implements chat, generation, embeddings, and model listing endpoints
 """
 
+import json
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
@@ -18,7 +20,17 @@ from src.services.auth_service import get_current_user_dep
 # Configure logging
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1", tags=["ai_models"])
+
+async def _close_provider_sessions() -> None:
+    """Release pooled provider connections on application shutdown"""
+    from src.services.ai_provider_service import close_provider_sessions
+
+    await close_provider_sessions()
+
+
+router = APIRouter(
+    prefix="/api/v1", tags=["ai_models"], on_shutdown=[_close_provider_sessions]
+)
 
 
 # ============================================================================
@@ -89,6 +101,13 @@ class EmbeddingRequest(BaseModel):
 
     inputs: List[str] = Field(..., description="List of texts to embed")
     model: str = Field(default="bleu-embed-1", description="Embedding model to use")
+    encoding_format: Literal["float", "base64", "npy"] = Field(
+        default="float",
+        description=(
+            "float: JSON arrays; base64: little-endian float32 bytes per vector; "
+            "npy: the whole float32 matrix as an application/x-npy body"
+        ),
+    )
 
 
 class EmbeddingResponse(BaseModel):
@@ -97,7 +116,9 @@ class EmbeddingResponse(BaseModel):
     id: str = Field(..., description="Response ID")
     object: str = Field(default="list", description="Response object type")
     model: str = Field(..., description="Model used")
-    embeddings: List[List[float]] = Field(..., description="List of embedding vectors")
+    embeddings: Union[List[List[float]], List[str]] = Field(
+        ..., description="Embedding vectors (base64 strings if requested)"
+    )
     usage: Dict[str, int] = Field(..., description="Token usage statistics")
 
 
@@ -140,10 +161,12 @@ async def process_with_provider_failover(
     model: str,
     temperature: float,
     max_tokens: int,
+    hedge: Optional[bool] = None,
 ) -> tuple[str, str]:
     """
     Process chat with provider failover: BleuJS → OpenAI → Anthropic → in-process.
-    Returns (content, provider_used).
+    With ``hedge`` (default: the AI_PROVIDER_HEDGING setting) a slow provider is
+    raced against the next one. Returns (content, provider_used).
     """
     from src.services.ai_provider_service import get_chat_completion
 
@@ -152,10 +175,56 @@ async def process_with_provider_failover(
         model=model,
         temperature=temperature,
         max_tokens=max_tokens,
+        hedge=hedge,
     )
     return (content, provider_used)
 
 
+async def stream_chat_events(
+    messages: List[Dict[str, str]],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+) -> AsyncIterator[str]:
+    """
+    Server-sent events for a streamed chat completion.
+
+    Emits OpenAI-style ``chat.completion.chunk`` events as provider deltas
+    arrive, a final chunk with ``finish_reason``, then ``data: [DONE]``.
+    """
+    from src.services.ai_provider_service import stream_chat_completion
+
+    response_id = generate_response_id()
+    created = get_current_timestamp()
+
+    def chunk(delta: Dict[str, str], finish_reason: Optional[str] = None) -> str:
+        event = {
+            "id": response_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(event)}\n\n"
+
+    provider_used = None
+    try:
+        async for delta, provider_used in stream_chat_completion(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        ):
+            yield chunk({"content": delta})
+        yield chunk({}, finish_reason="stop")
+        logger.info("Chat stream provider_used=%s", provider_used)
+    except Exception as e:
+        logger.error(f"Chat stream error: {e}")
+        error = {"message": "Failed to stream chat completion", "type": "server_error"}
+        yield f"data: {json.dumps({'error': error})}\n\n"
+    yield "data: [DONE]\n\n"
+
+
 def calculate_token_usage(prompt: str, response: str) -> Dict[str, int]:
     """Calculate token usage (simplified)"""
     prompt_tokens = len(prompt.split())
@@ -182,7 +251,8 @@ async def chat_completion(
     Create a chat completion
 
     This endpoint processes chat messages and returns AI-generated responses
-    using Bleu.js's quantum-enhanced models.
+    using Bleu.js's quantum-enhanced models. With ``stream: true`` the response
+    is a ``text/event-stream`` of completion chunks.
     """
     try:
         logger.info(f"Chat completion request from user {current_user.id}")
@@ -200,6 +270,18 @@ async def chat_completion(
             {"role": msg.role, "content": msg.content} for msg in request.messages
         ]
 
+        if request.stream:
+            return StreamingResponse(
+                stream_chat_events(
+                    messages=messages_for_api,
+                    model=request.model,
+                    temperature=request.temperature,
+                    max_tokens=request.max_tokens,
+                ),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
         # Generate response with provider failover (BleuJS → OpenAI → Anthropic → in-process)
         response_content, provider_used = await process_with_provider_failover(
             messages=messages_for_api,
@@ -286,43 +368,52 @@ async def create_embeddings(
 
     This endpoint creates quantum-enhanced vector embeddings for text inputs,
     useful for similarity search, clustering, and semantic analysis.
+    Vectors are float32; ``encoding_format`` selects JSON floats, base64, or
+    a binary ``.npy`` body.
     """
     try:
         logger.info(
             f"Embedding request from user {current_user.id} for {len(request.inputs)} texts"
         )
 
-        embeddings = []
-        total_tokens = 0
-
-        for text in request.inputs:
-            # Generate quantum-enhanced embedding
-            # This is a simplified version - integrate with your actual embedding model
-            embedding_dim = 384  # Standard embedding dimension
-
-            # Create deterministic embedding based on text (simplified)
-            import hashlib
-
-            import numpy as np
-
-            # Use hash for deterministic pseudo-embeddings
-            hash_obj = hashlib.sha256(text.encode())
-            seed = int(hash_obj.hexdigest(), 16) % (2**31)
-            np.random.seed(seed)
-            embedding = np.random.randn(embedding_dim).tolist()
-
-            # Normalize embedding
-            norm = sum(x**2 for x in embedding) ** 0.5
-            embedding = [x / norm for x in embedding]
+        from src.services.embedding_service import (
+            encode_base64,
+            encode_npy,
+            get_embedding_service,
+        )
 
-            embeddings.append(embedding)
-            total_tokens += len(text.split())
+        # One batched computation for all cache misses
+        service = await get_embedding_service()
+        matrix = await service.embed(request.inputs, request.model)
+
+        total_tokens = sum(len(text.split()) for text in request.inputs)
+        usage = {"prompt_tokens": total_tokens, "total_tokens": total_tokens}
+        response_id = generate_response_id()
+
+        if request.encoding_format == "npy":
+            return Response(
+                content=encode_npy(matrix),
+                media_type="application/x-npy",
+                headers={
+                    "X-Response-Id": response_id,
+                    "X-Usage-Total-Tokens": str(total_tokens),
+                },
+            )
 
-        return EmbeddingResponse(
-            id=generate_response_id(),
-            model=request.model,
-            embeddings=embeddings,
-            usage={"prompt_tokens": total_tokens, "total_tokens": total_tokens},
+        embeddings = (
+            encode_base64(matrix)
+            if request.encoding_format == "base64"
+            else matrix.tolist()
+        )
+        # Already-typed payload: skip per-float response model validation
+        return JSONResponse(
+            content={
+                "id": response_id,
+                "object": "list",
+                "model": request.model,
+                "embeddings": embeddings,
+                "usage": usage,
+            }
         )
 
     except Exception as e:
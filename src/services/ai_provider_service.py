@@ -3,10 +3,17 @@ AI provider service with failover: BleuJS → OpenAI → Anthropic → in-proces
 
 When a provider fails (5xx, timeout, exception), the next real provider is tried
 before falling back to in-process. This keeps real AI usage high and error rate low.
+
+Each provider gets one pooled keep-alive HTTP session for the app lifetime and a
+circuit breaker, so a provider that is down is skipped instead of being waited on.
 """
 
+import asyncio
+import json
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import aiohttp
 
@@ -17,14 +24,285 @@ logger = logging.getLogger(__name__)
 # Provider order for failover
 PROVIDER_ORDER = ("bleujs", "openai", "anthropic", "in_process")
 
+PROVIDER_LABELS = {
+    "bleujs": "BleuJS backend",
+    "openai": "OpenAI",
+    "anthropic": "Anthropic",
+}
 
-async def _try_bleujs_backend(
+# Shared session settings: pooled keep-alive connections with cached DNS
+POOL_LIMIT = 100
+KEEPALIVE_TIMEOUT = 30
+DNS_CACHE_TTL = 300
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=60, sock_connect=5)
+
+# Hedging: delay used until a provider has latency history, and the budget that
+# caps hedged calls to a fraction of primary traffic (with a small burst)
+HEDGE_DEFAULT_DELAY = 2.0
+HEDGE_QUANTILE = 0.95
+HEDGE_BUDGET_RATIO = 0.1
+HEDGE_BUDGET_BURST = 10.0
+
+
+class ProviderCircuitBreaker:
+    """Circuit breaker for one provider, driven by error-rate and latency EWMAs.
+
+    The circuit opens after ``failure_threshold`` consecutive failures, or when
+    the smoothed error rate exceeds ``error_rate_threshold`` once
+    ``min_samples`` calls have been seen. Calls slower than ``slow_call_seconds``
+    count as errors. After ``recovery_timeout`` a single probe is let through
+    (HALF_OPEN); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        error_rate_threshold: float = 0.5,
+        recovery_timeout: float = 30.0,
+        slow_call_seconds: float = 20.0,
+        alpha: float = 0.2,
+        min_samples: int = 5,
+        latency_window: int = 200,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.recovery_timeout = recovery_timeout
+        self.slow_call_seconds = slow_call_seconds
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.latency_window = latency_window
+        self.reset()
+
+    def reset(self) -> None:
+        """Close the circuit and forget all statistics."""
+        self.state = "CLOSED"  # CLOSED, OPEN, HALF_OPEN
+        self.consecutive_failures = 0
+        self.samples = 0
+        self.error_rate = 0.0
+        self.latency = None
+        self.recent_latencies: deque[float] = deque(maxlen=self.latency_window)
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        """Return whether a call may be made now."""
+        if self.state == "CLOSED":
+            return True
+        if self.state == "OPEN":
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                return False
+            self.state = "HALF_OPEN"
+            logger.info("Circuit breaker for %s attempting HALF_OPEN", self.name)
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self, latency: float, sample_latency: bool = True) -> None:
+        """Record a completed call and its latency in seconds.
+
+        ``sample_latency=False`` keeps the call out of the latency quantiles
+        (e.g. time to first token of a stream).
+        """
+        if latency > self.slow_call_seconds:
+            self._record(latency, error=True)
+            return
+        self.consecutive_failures = 0
+        if sample_latency:
+            self.recent_latencies.append(latency)
+        self._record(latency, error=False)
+        if self.state == "HALF_OPEN":
+            self.state = "CLOSED"
+            self._probe_in_flight = False
+            logger.info("Circuit breaker for %s reset to CLOSED", self.name)
+
+    def record_failure(self, latency: float) -> None:
+        """Record a failed call and its latency in seconds."""
+        self._record(latency, error=True)
+
+    def release(self) -> None:
+        """Give back a HALF_OPEN probe slot whose call was abandoned."""
+        self._probe_in_flight = False
+
+    def latency_quantile(self, q: float) -> Optional[float]:
+        """Latency quantile over recent successful calls, or None without data."""
+        if not self.recent_latencies:
+            return None
+        ordered = sorted(self.recent_latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current health statistics."""
+        return {
+            "state": self.state,
+            "error_rate": round(self.error_rate, 4),
+            "latency_ewma": None if self.latency is None else round(self.latency, 4),
+            "consecutive_failures": self.consecutive_failures,
+            "samples": self.samples,
+        }
+
+    def _record(self, latency: float, error: bool) -> None:
+        """Update the EWMAs and open the circuit if the provider is unhealthy."""
+        self.samples += 1
+        self.error_rate += self.alpha * (float(error) - self.error_rate)
+        self.latency = (
+            latency
+            if self.latency is None
+            else self.latency + self.alpha * (latency - self.latency)
+        )
+        if not error:
+            return
+
+        self.consecutive_failures += 1
+        unhealthy = self.consecutive_failures >= self.failure_threshold or (
+            self.samples >= self.min_samples
+            and self.error_rate > self.error_rate_threshold
+        )
+        if self.state == "HALF_OPEN" or unhealthy:
+            if self.state != "OPEN":
+                logger.warning(
+                    "Circuit breaker for %s opened (error rate %.2f)",
+                    self.name,
+                    self.error_rate,
+                )
+            self.state = "OPEN"
+            self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+class HedgeBudget:
+    """Token budget that caps hedged calls to a fraction of requests.
+
+    Every hedged-mode request deposits ``ratio`` tokens (up to ``burst``) and
+    every hedge spends one, so hedges stay below ``ratio`` of traffic on average.
+    """
+
+    def __init__(
+        self, ratio: float = HEDGE_BUDGET_RATIO, burst: float = HEDGE_BUDGET_BURST
+    ):
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = burst
+
+    def on_request(self) -> None:
+        """Deposit the per-request allowance."""
+        self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take one hedge token if available."""
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+_hedge_budget = HedgeBudget()
+
+_breakers: Dict[str, ProviderCircuitBreaker] = {
+    name: ProviderCircuitBreaker(name) for name in PROVIDER_LABELS
+}
+
+# provider -> (event loop, session); sessions cannot be shared across loops
+_sessions: Dict[str, tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = {}
+
+
+def get_provider_health() -> Dict[str, Dict[str, Any]]:
+    """Circuit breaker statistics for every external provider."""
+    return {name: breaker.snapshot() for name, breaker in _breakers.items()}
+
+
+def _get_session(provider: str) -> aiohttp.ClientSession:
+    """Return the pooled session for a provider, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    entry = _sessions.get(provider)
+    if entry is not None and entry[0] is loop and not entry[1].closed:
+        return entry[1]
+
+    connector = aiohttp.TCPConnector(
+        limit=POOL_LIMIT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    session = aiohttp.ClientSession(connector=connector, timeout=REQUEST_TIMEOUT)
+    _sessions[provider] = (loop, session)
+    return session
+
+
+async def close_provider_sessions() -> None:
+    """Close all pooled provider sessions (call on application shutdown)."""
+    entries = list(_sessions.values())
+    _sessions.clear()
+    for _, session in entries:
+        if not session.closed:
+            await session.close()
+
+
+async def _post_json(
+    provider: str,
+    url: str,
+    payload: Dict[str, Any],
+    headers: Dict[str, str],
+) -> Optional[Dict[str, Any]]:
+    """POST to a provider through its pooled session and circuit breaker.
+
+    Returns the decoded JSON body, or None if the circuit is open or the call
+    failed.
+    """
+    label = PROVIDER_LABELS[provider]
+    breaker = _breakers[provider]
+    if not breaker.allow_request():
+        logger.info("Skipping %s: circuit %s", label, breaker.state)
+        return None
+
+    start = time.monotonic()
+    try:
+        async with _get_session(provider).post(
+            url, json=payload, headers=headers
+        ) as resp:
+            if resp.status != 200:
+                logger.warning("%s returned %s for %s", label, resp.status, url)
+                breaker.record_failure(time.monotonic() - start)
+                return None
+            data = await resp.json()
+    except asyncio.CancelledError:
+        breaker.release()
+        raise
+    except Exception as e:
+        logger.warning("%s request failed: %s", label, e)
+        breaker.record_failure(time.monotonic() - start)
+        return None
+
+    breaker.record_success(time.monotonic() - start)
+    return data if isinstance(data, dict) else None
+
+
+# A provider request: (url, JSON payload, headers), or None when not configured
+ProviderRequest = tuple[str, Dict[str, Any], Dict[str, str]]
+
+
+def _secret(key: Any) -> Optional[str]:
+    """Resolve an API key setting, treating placeholders as unset."""
+    if not key:
+        return None
+    try:
+        api_key = key.get_secret_value() if hasattr(key, "get_secret_value") else key
+    except Exception:
+        return None
+    if not api_key or api_key.startswith("your_"):
+        return None
+    return api_key
+
+
+def _bleujs_request(
     messages: List[Dict[str, str]],
     model: str,
     temperature: float,
     max_tokens: int,
-) -> Optional[str]:
-    """Try BleuJS backend (e.g. Railway predict API or product /api/v1/chat). Returns content or None."""
+    stream: bool = False,
+) -> Optional[ProviderRequest]:
+    """Build a BleuJS backend (e.g. Railway predict API or product /api/v1/chat) request."""
     settings = get_settings()
     url = (getattr(settings, "BLEUJS_BACKEND_URL", None) or "").strip()
     if not url:
@@ -40,52 +318,21 @@ async def _try_bleujs_backend(
         "model": model,
         "temperature": temperature,
         "max_tokens": max_tokens,
-        "stream": False,
+        "stream": stream,
     }
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                chat_url,
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=60),
-                headers={"Content-Type": "application/json"},
-            ) as resp:
-                if resp.status != 200:
-                    logger.warning(
-                        "BleuJS backend returned %s for %s", resp.status, chat_url
-                    )
-                    return None
-                data = await resp.json()
-                # OpenAI-style or flat content
-                if isinstance(data.get("content"), str):
-                    return data["content"]
-                choices = data.get("choices") or []
-                if choices and isinstance(choices[0], dict):
-                    msg = choices[0].get("message") or choices[0]
-                    if isinstance(msg.get("content"), str):
-                        return msg["content"]
-                return None
-    except Exception as e:
-        logger.warning("BleuJS backend request failed: %s", e)
-        return None
+    return chat_url, payload, {"Content-Type": "application/json"}
 
 
-async def _try_openai(
+def _openai_request(
     messages: List[Dict[str, str]],
     model: str,
     temperature: float,
     max_tokens: int,
-) -> Optional[str]:
-    """Try OpenAI API. Returns content or None."""
-    settings = get_settings()
-    key = getattr(settings, "OPENAI_API_KEY", None)
-    if not key:
-        return None
-    try:
-        api_key = key.get_secret_value() if hasattr(key, "get_secret_value") else key
-    except Exception:
-        return None
-    if not api_key or api_key.startswith("your_"):
+    stream: bool = False,
+) -> Optional[ProviderRequest]:
+    """Build an OpenAI chat completions request."""
+    api_key = _secret(getattr(get_settings(), "OPENAI_API_KEY", None))
+    if not api_key:
         return None
     # Map our model name to OpenAI if needed
     openai_model = (
@@ -100,48 +347,25 @@ async def _try_openai(
         "temperature": temperature,
         "max_tokens": max_tokens,
     }
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.openai.com/v1/chat/completions",
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=60),
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-            ) as resp:
-                if resp.status != 200:
-                    logger.warning("OpenAI returned %s", resp.status)
-                    return None
-                data = await resp.json()
-                choices = data.get("choices") or []
-                if choices and isinstance(choices[0], dict):
-                    msg = choices[0].get("message") or {}
-                    if isinstance(msg.get("content"), str):
-                        return msg["content"]
-                return None
-    except Exception as e:
-        logger.warning("OpenAI request failed: %s", e)
-        return None
+    if stream:
+        payload["stream"] = True
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+    }
+    return "https://api.openai.com/v1/chat/completions", payload, headers
 
 
-async def _try_anthropic(
+def _anthropic_request(
     messages: List[Dict[str, str]],
     model: str,
     temperature: float,
     max_tokens: int,
-) -> Optional[str]:
-    """Try Anthropic API. Returns content or None."""
-    settings = get_settings()
-    key = getattr(settings, "ANTHROPIC_API_KEY", None)
-    if not key:
-        return None
-    try:
-        api_key = key.get_secret_value() if hasattr(key, "get_secret_value") else key
-    except Exception:
-        return None
-    if not api_key or api_key.startswith("your_"):
+    stream: bool = False,
+) -> Optional[ProviderRequest]:
+    """Build an Anthropic messages request."""
+    api_key = _secret(getattr(get_settings(), "ANTHROPIC_API_KEY", None))
+    if not api_key:
         return None
     # Build prompt from messages (Anthropic uses user-assistant turn format)
     last_user = next(
@@ -156,32 +380,169 @@ async def _try_anthropic(
     }
     if temperature is not None:
         payload["temperature"] = temperature
+    if stream:
+        payload["stream"] = True
+    headers = {
+        "x-api-key": api_key,
+        "anthropic-version": "2023-06-01",
+        "Content-Type": "application/json",
+    }
+    return "https://api.anthropic.com/v1/messages", payload, headers
+
+
+async def _try_bleujs_backend(
+    messages: List[Dict[str, str]],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+) -> Optional[str]:
+    """Try BleuJS backend. Returns content or None."""
+    request = _bleujs_request(messages, model, temperature, max_tokens)
+    if request is None:
+        return None
+    data = await _post_json("bleujs", *request)
+    if data is None:
+        return None
+    # OpenAI-style or flat content
+    if isinstance(data.get("content"), str):
+        return data["content"]
+    choices = data.get("choices") or []
+    if choices and isinstance(choices[0], dict):
+        msg = choices[0].get("message") or choices[0]
+        if isinstance(msg.get("content"), str):
+            return msg["content"]
+    return None
+
+
+async def _try_openai(
+    messages: List[Dict[str, str]],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+) -> Optional[str]:
+    """Try OpenAI API. Returns content or None."""
+    request = _openai_request(messages, model, temperature, max_tokens)
+    if request is None:
+        return None
+    data = await _post_json("openai", *request)
+    if data is None:
+        return None
+    choices = data.get("choices") or []
+    if choices and isinstance(choices[0], dict):
+        msg = choices[0].get("message") or {}
+        if isinstance(msg.get("content"), str):
+            return msg["content"]
+    return None
+
+
+async def _try_anthropic(
+    messages: List[Dict[str, str]],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+) -> Optional[str]:
+    """Try Anthropic API. Returns content or None."""
+    request = _anthropic_request(messages, model, temperature, max_tokens)
+    if request is None:
+        return None
+    data = await _post_json("anthropic", *request)
+    if data is None:
+        return None
+    for block in data.get("content") or []:
+        if block.get("type") == "text" and isinstance(block.get("text"), str):
+            return block["text"]
+    return None
+
+
+_PROVIDERS = {
+    "bleujs": _try_bleujs_backend,
+    "openai": _try_openai,
+    "anthropic": _try_anthropic,
+}
+
+
+def _openai_style_delta(event: Dict[str, Any]) -> Optional[str]:
+    """Text delta from an OpenAI-style (or flat BleuJS) stream chunk."""
+    for key in ("content", "delta"):
+        if isinstance(event.get(key), str):
+            return event[key]
+    choices = event.get("choices") or []
+    if choices and isinstance(choices[0], dict):
+        delta = choices[0].get("delta") or {}
+        if isinstance(delta.get("content"), str):
+            return delta["content"]
+    return None
+
+
+def _anthropic_delta(event: Dict[str, Any]) -> Optional[str]:
+    """Text delta from an Anthropic messages stream event."""
+    if event.get("type") == "content_block_delta":
+        text = (event.get("delta") or {}).get("text")
+        if isinstance(text, str):
+            return text
+    return None
+
+
+_STREAM_PROVIDERS = {
+    "bleujs": (_bleujs_request, _openai_style_delta),
+    "openai": (_openai_request, _openai_style_delta),
+    "anthropic": (_anthropic_request, _anthropic_delta),
+}
+
+
+async def _stream_events(
+    provider: str,
+    url: str,
+    payload: Dict[str, Any],
+    headers: Dict[str, str],
+) -> AsyncIterator[Dict[str, Any]]:
+    """POST a streaming request and yield decoded server-sent events.
+
+    Yields nothing if the circuit is open or the request fails before the
+    first event; the breaker records time to first event as latency.
+    """
+    label = PROVIDER_LABELS[provider]
+    breaker = _breakers[provider]
+    if not breaker.allow_request():
+        logger.info("Skipping %s: circuit %s", label, breaker.state)
+        return
+
+    start = time.monotonic()
+    recorded = False
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.anthropic.com/v1/messages",
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=60),
-                headers={
-                    "x-api-key": api_key,
-                    "anthropic-version": "2023-06-01",
-                    "Content-Type": "application/json",
-                },
-            ) as resp:
-                if resp.status != 200:
-                    logger.warning("Anthropic returned %s", resp.status)
-                    return None
-                data = await resp.json()
-                content = data.get("content") or []
-                for block in content:
-                    if block.get("type") == "text" and isinstance(
-                        block.get("text"), str
-                    ):
-                        return block["text"]
-                return None
+        async with _get_session(provider).post(
+            url, json=payload, headers={**headers, "Accept": "text/event-stream"}
+        ) as resp:
+            if resp.status != 200:
+                logger.warning("%s returned %s for %s", label, resp.status, url)
+                return
+            async for raw_line in resp.content:
+                line = raw_line.decode("utf-8").strip()
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:") :].strip()
+                if data == "[DONE]":
+                    break
+                event = json.loads(data)
+                if not recorded:
+                    recorded = True
+                    breaker.record_success(
+                        time.monotonic() - start, sample_latency=False
+                    )
+                if isinstance(event, dict):
+                    yield event
+    except (asyncio.CancelledError, GeneratorExit):
+        if not recorded:
+            # Abandoned before the provider answered: not the provider's fault
+            recorded = True
+            breaker.release()
+        raise
     except Exception as e:
-        logger.warning("Anthropic request failed: %s", e)
-        return None
+        logger.warning("%s stream failed: %s", label, e)
+    finally:
+        # Error statuses, failures and streams that ended without any event
+        if not recorded:
+            breaker.record_failure(time.monotonic() - start)
 
 
 def _in_process_fallback(prompt: str, model: str) -> str:
@@ -192,52 +553,156 @@ def _in_process_fallback(prompt: str, model: str) -> str:
     )
 
 
+def _last_user_message(messages: List[Dict[str, str]]) -> str:
+    """Content of the last user message (or of the last message)."""
+    for m in reversed(messages or []):
+        if m.get("role") == "user":
+            return m.get("content") or ""
+    if messages:
+        return messages[-1].get("content") or ""
+    return ""
+
+
+def _hedge_delay(provider: str) -> float:
+    """Seconds to wait on a provider before hedging: its recent p95 latency."""
+    delay = _breakers[provider].latency_quantile(HEDGE_QUANTILE)
+    return HEDGE_DEFAULT_DELAY if delay is None else delay
+
+
+async def _hedged_completion(
+    args: tuple[Any, ...], hedge_delay: Optional[float]
+) -> Optional[tuple[str, str]]:
+    """Race providers in failover order, starting the next one when slow.
+
+    The next provider is started when the newest call has run for the hedge
+    delay (and the hedge budget allows it) or immediately when a call fails.
+    The first usable answer wins; calls still in flight are cancelled.
+    """
+    queue = list(PROVIDER_ORDER[:-1])
+    pending: Dict[asyncio.Task, str] = {}
+    next_hedge_at = 0.0
+
+    def launch() -> None:
+        nonlocal next_hedge_at
+        provider = queue.pop(0)
+        pending[asyncio.ensure_future(_PROVIDERS[provider](*args))] = provider
+        delay = _hedge_delay(provider) if hedge_delay is None else hedge_delay
+        next_hedge_at = time.monotonic() + delay
+
+    launch()
+    try:
+        while pending:
+            timeout = max(0.0, next_hedge_at - time.monotonic()) if queue else None
+            done, _ = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                if _hedge_budget.try_spend():
+                    logger.info("Hedging chat completion to %s", queue[0])
+                    launch()
+                else:
+                    next_hedge_at = float("inf")
+                continue
+
+            for task in done:
+                provider = pending.pop(task)
+                content = None if task.exception() else task.result()
+                if content is not None:
+                    return (content, provider)
+                # A failed call is replaced by the next provider right away
+                if queue:
+                    launch()
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
 async def get_chat_completion(
     messages: List[Dict[str, str]],
     model: str = "bleu-quantum-1",
     temperature: float = 0.7,
     max_tokens: int = 1000,
+    hedge: Optional[bool] = None,
+    hedge_delay: Optional[float] = None,
 ) -> tuple[str, str]:
     """
     Get chat completion with provider failover.
 
     Tries in order: BleuJS backend → OpenAI → Anthropic → in-process fallback.
+    Providers whose circuit breaker is open are skipped.
+
+    With hedging (``hedge=True``, or the ``AI_PROVIDER_HEDGING`` setting), the
+    next provider is also started if the current one has not answered after
+    ``hedge_delay`` seconds (default: that provider's recent p95 latency), and
+    the first answer wins. Hedges are capped by a budget of
+    ``HEDGE_BUDGET_RATIO`` of requests.
 
     Returns:
         (content, provider_used) where provider_used is one of
         "bleujs", "openai", "anthropic", "in_process".
     """
-    last_user = ""
-    for m in reversed(messages or []):
-        if m.get("role") == "user":
-            last_user = m.get("content") or ""
-            break
-    if not last_user and messages:
-        last_user = messages[-1].get("content") or ""
-
-    # 1. Try BleuJS backend
-    content = await _try_bleujs_backend(messages, model, temperature, max_tokens)
-    if content is not None:
-        logger.info("AI response from provider: bleujs")
-        return (content, "bleujs")
-
-    # 2. Try OpenAI
-    content = await _try_openai(messages, model, temperature, max_tokens)
-    if content is not None:
-        logger.info("AI response from provider: openai")
-        return (content, "openai")
-
-    # 3. Try Anthropic
-    content = await _try_anthropic(messages, model, temperature, max_tokens)
-    if content is not None:
-        logger.info("AI response from provider: anthropic")
-        return (content, "anthropic")
-
-    # 4. In-process fallback
+    last_user = _last_user_message(messages)
+
+    if hedge is None:
+        hedge = bool(getattr(get_settings(), "AI_PROVIDER_HEDGING", False))
+    if hedge:
+        _hedge_budget.on_request()
+        result = await _hedged_completion(
+            (messages, model, temperature, max_tokens), hedge_delay
+        )
+        if result is not None:
+            logger.info("AI response from provider: %s (hedged)", result[1])
+            return result
+        logger.info("AI response from provider: in_process (fallback)")
+        return (_in_process_fallback(last_user, model), "in_process")
+
+    # Try real providers in order; open circuits are skipped without a request
+    for provider in PROVIDER_ORDER[:-1]:
+        content = await _PROVIDERS[provider](messages, model, temperature, max_tokens)
+        if content is not None:
+            logger.info("AI response from provider: %s", provider)
+            return (content, provider)
+
+    # In-process fallback
     logger.info("AI response from provider: in_process (fallback)")
     return (_in_process_fallback(last_user, model), "in_process")
 
 
+async def stream_chat_completion(
+    messages: List[Dict[str, str]],
+    model: str = "bleu-quantum-1",
+    temperature: float = 0.7,
+    max_tokens: int = 1000,
+) -> AsyncIterator[tuple[str, str]]:
+    """
+    Stream chat completion text deltas with provider failover.
+
+    Yields (delta, provider_used) as each provider's server-sent events arrive.
+    A provider that fails before its first delta is failed over to the next;
+    once text has been sent, the stream stays with that provider. If every
+    provider fails, the in-process fallback is yielded as a single delta.
+    """
+    for provider in PROVIDER_ORDER[:-1]:
+        build_request, extract_delta = _STREAM_PROVIDERS[provider]
+        request = build_request(messages, model, temperature, max_tokens, stream=True)
+        if request is None:
+            continue
+        started = False
+        async for event in _stream_events(provider, *request):
+            delta = extract_delta(event)
+            if delta:
+                started = True
+                yield (delta, provider)
+        if started:
+            logger.info("AI stream from provider: %s", provider)
+            return
+
+    logger.info("AI stream from provider: in_process (fallback)")
+    yield (_in_process_fallback(_last_user_message(messages), model), "in_process")
+
+
 async def get_generation_completion(
     prompt: str,
     model: str = "bleu-quantum-1",
@@ -4,16 +4,18 @@ from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import aiohttp
-import jwt
 from fastapi import Depends, HTTPException
 from prometheus_client import Counter, Gauge, Histogram
 from sqlalchemy.orm import Session
 
 from src.config import get_settings
+from src.services.auth_cache import AuthStatus, authenticate_jwt
+from src.services.usage_accounting import UsageAccountant, get_usage_accountant
+from src.services.usage_analytics import UsageAnalytics, utc_naive
 from src.utils.base_classes import BaseService
 
 from ..database import get_db
-from ..models.api_call import APICall, APIUsage
+from ..models.api_call import APIUsage
 from ..models.user import User
 
 # Lazy import for optional ML dependencies - only needed for advanced analytics
@@ -35,9 +37,19 @@ api_usage_gauge = Gauge("api_usage", "Current API usage", ["user_id", "plan"])
 class APIService(BaseService):
     """Service for handling API operations."""
 
-    def __init__(self, db: Session = Depends(get_db)):
-        """Initialize API service."""
+    def __init__(
+        self,
+        db: Session = Depends(get_db),
+        usage: UsageAccountant | None = None,
+    ):
+        """Initialize API service.
+
+        Args:
+            db: Database session
+            usage: Usage accountant (default: the process-wide one)
+        """
         super().__init__(db)
+        self.usage = usage if usage is not None else get_usage_accountant()
         self.settings = get_settings()
         self.start_time = time.time()
         # Lazy initialization - only create when needed for advanced analytics
@@ -88,42 +100,28 @@ class APIService(BaseService):
 
     async def validate_api_key(self, api_key: str) -> User:
         """Validate API key and return user."""
-        try:
-            payload = jwt.decode(
-                api_key,
-                self.settings.SECRET_KEY,
-                algorithms=["HS256"],
-            )
-            user_id = payload.get("sub")
-            if not user_id:
-                raise HTTPException(status_code=401, detail="Invalid API key")
-
-            user = self.db.query(User).filter(User.id == user_id).first()
-            if not user:
-                raise HTTPException(status_code=401, detail="User not found")
-
-            if not user.is_active:
-                raise HTTPException(status_code=401, detail="User account is inactive")
-
-            return user
-        except jwt.InvalidTokenError:
+        entry, user = authenticate_jwt(
+            api_key,
+            self.settings.SECRET_KEY,
+            ["HS256"],
+            lambda user_id: self.db.query(User).filter(User.id == user_id).first(),
+            session=self.db,
+        )
+        if entry.status is AuthStatus.INVALID:
             raise HTTPException(status_code=401, detail="Invalid API key")
+        if not user:
+            raise HTTPException(status_code=401, detail="User not found")
+        if not user.is_active:
+            raise HTTPException(status_code=401, detail="User account is inactive")
+        return user
 
     async def check_rate_limit(self, user: User) -> bool:
         """Check if user has exceeded rate limit"""
         # Fix: Check if user has a subscription before accessing it
         self._ensure_user_has_subscription(user)
 
-        current_time = datetime.now(timezone.utc)
-        recent_calls = (
-            self.db.query(APICall)
-            .filter(
-                APICall.user_id == user.id,
-                APICall.timestamp >= current_time - timedelta(minutes=1),
-            )
-            .count()
-        )
-
+        # Counter read; no scan over api_calls
+        recent_calls = await self.usage.calls_in_window(user.id, 60)
         return recent_calls < user.subscription.rate_limit
 
     async def check_usage_limit(self, user: User) -> bool:
@@ -131,28 +129,40 @@ class APIService(BaseService):
         # Fix: Check if user has a subscription before accessing it
         self._ensure_user_has_subscription(user)
 
-        current_period_start = user.subscription.current_period_start
-        current_period_end = user.subscription.current_period_end
+        return self._period_usage(user) < user.subscription.api_calls_limit
 
-        monthly_usage = (
-            self.db.query(APIUsage)
-            .filter(
-                APIUsage.user_id == user.id,
-                APIUsage.timestamp >= current_period_start,
-                APIUsage.timestamp <= current_period_end,
-            )
-            .first()
-        )
+    def _period_usage(self, user: User) -> int:
+        """Calls counted for a user in the subscription's current period."""
+        self._set_usage_period(user)
+        return self.usage.period_usage(user.id, lambda: self._load_usage_count(user))
 
-        if not monthly_usage:
-            return True
+    def _set_usage_period(self, user: User) -> None:
+        """Tell the usage accountant which billing period is current."""
+        subscription = user.subscription
+        self.usage.set_period(
+            user.id,
+            subscription.current_period_start,
+            subscription.current_period_end,
+        )
 
-        return monthly_usage.calls_count < user.subscription.api_calls_limit
+    def _load_usage_count(self, user: User) -> int:
+        """Persisted call count for the current period (read once per period)."""
+        query = self.db.query(APIUsage.calls_count).filter(APIUsage.user_id == user.id)
+        period_start = user.subscription.current_period_start
+        if period_start is not None:
+            # A row last reset before this period holds the previous count
+            query = query.filter(APIUsage.last_reset >= utc_naive(period_start))
+        calls_count = query.order_by(APIUsage.id.desc()).limit(1).scalar()
+        return calls_count or 0
 
     async def track_api_call(
         self, user: User, endpoint: str, response_time: float, status: int
     ):
-        """Track API call metrics"""
+        """Track API call metrics.
+
+        Counters are updated in memory; the ``APICall`` row and the
+        ``APIUsage`` increment are written by the accountant's batched flush.
+        """
         # Fix: Check if user has a subscription before accessing it
         self._ensure_user_has_subscription(user)
 
@@ -162,89 +172,26 @@ class APIService(BaseService):
         if status >= 400:
             api_errors_total.labels(endpoint=endpoint, error_type=str(status)).inc()
 
-        # Update database
-        api_call = APICall(
-            user_id=user.id,
-            endpoint=endpoint,
-            response_time=response_time,
-            status=status,
-            timestamp=datetime.now(timezone.utc),
-        )
-        self.db.add(api_call)
-
-        # Update monthly usage
-        monthly_usage = (
-            self.db.query(APIUsage)
-            .filter(
-                APIUsage.user_id == user.id,
-                APIUsage.timestamp >= user.subscription.current_period_start,
-                APIUsage.timestamp <= user.subscription.current_period_end,
-            )
-            .first()
-        )
-
-        if not monthly_usage:
-            monthly_usage = APIUsage(
-                user_id=user.id, calls_count=0, timestamp=datetime.now(timezone.utc)
-            )
-            self.db.add(monthly_usage)
-
-        monthly_usage.calls_count += 1
-        self.db.commit()
+        self._set_usage_period(user)
+        await self.usage.record_call(user.id, endpoint, response_time, status)
 
         # Update Prometheus gauge
         api_usage_gauge.labels(
             user_id=str(user.id), plan=user.subscription.plan_type
-        ).set(monthly_usage.calls_count)
+        ).set(self._period_usage(user))
 
     async def get_usage_analytics(self, user: User) -> dict:
         """Get detailed usage analytics for user"""
         # Fix: Check if user has a subscription before accessing it
         self._ensure_user_has_subscription(user)
 
-        current_period_start = user.subscription.current_period_start
-        current_period_end = user.subscription.current_period_end
-
-        # Get daily usage
-        daily_usage = (
-            self.db.query(APICall)
-            .filter(
-                APICall.user_id == user.id,
-                APICall.timestamp >= current_period_start,
-                APICall.timestamp <= current_period_end,
-            )
-            .all()
+        # Aggregated in SQL from hourly rollups plus the partial edge hours
+        return UsageAnalytics(self.db).summary(
+            user.id,
+            user.subscription.current_period_start,
+            user.subscription.current_period_end,
         )
 
-        # Calculate response time distribution
-        response_times = [call.response_time for call in daily_usage]
-        response_time_distribution = {
-            "<100ms": len([t for t in response_times if t < 0.1]),
-            "100-200ms": len([t for t in response_times if 0.1 <= t < 0.2]),
-            "200-300ms": len([t for t in response_times if 0.2 <= t < 0.3]),
-            "300-400ms": len([t for t in response_times if 0.3 <= t < 0.4]),
-            ">400ms": len([t for t in response_times if t >= 0.4]),
-        }
-
-        # Get endpoint usage
-        endpoint_usage: dict[str, int] = {}
-        for call in daily_usage:
-            endpoint_usage[call.endpoint] = endpoint_usage.get(call.endpoint, 0) + 1
-
-        # Get error rates
-        error_calls = [call for call in daily_usage if call.status >= 400]
-        error_rate = len(error_calls) / len(daily_usage) if daily_usage else 0
-
-        return {
-            "total_calls": len(daily_usage),
-            "response_time_distribution": response_time_distribution,
-            "endpoint_usage": endpoint_usage,
-            "error_rate": error_rate,
-            "average_response_time": (
-                sum(response_times) / len(response_times) if response_times else 0
-            ),
-        }
-
     async def get_advanced_analytics(self, user: User) -> dict:
         """Get advanced analytics for enterprise users"""
         # Fix: Check if user has a subscription before accessing it
@@ -372,32 +319,25 @@ class APIService(BaseService):
 
     async def optimize_api_performance(self) -> dict:
         """Optimize API performance based on usage patterns"""
-        # Get recent API calls
-        recent_calls = (
-            self.db.query(APICall)
-            .filter(
-                APICall.timestamp >= datetime.now(timezone.utc) - timedelta(hours=24)
-            )
-            .all()
-        )
+        # Per-endpoint sums over the last 24 hours, aggregated in SQL
+        now = datetime.now(timezone.utc)
+        stats = UsageAnalytics(self.db).endpoint_stats(now - timedelta(hours=24), now)
 
-        # Analyze response times
-        response_times = [call.response_time for call in recent_calls]
-        avg_response_time = (
-            sum(response_times) / len(response_times) if response_times else 0
-        )
+        # Analyze response times (stored in milliseconds)
+        total_calls = sum(sums["calls"] for sums in stats.values())
+        total_time = sum(sums["total_response_time"] for sums in stats.values())
+        avg_response_time = total_time / 1000 / total_calls if total_calls else 0
 
         # Identify slow endpoints
-        endpoint_times: dict[str, list[float]] = {}
-        for call in recent_calls:
-            if call.endpoint not in endpoint_times:
-                endpoint_times[call.endpoint] = []
-            endpoint_times[call.endpoint].append(call.response_time)
-
+        endpoint_times = {
+            endpoint: sums["total_response_time"] / 1000 / sums["calls"]
+            for endpoint, sums in stats.items()
+            if sums["calls"]
+        }
         slow_endpoints = {
-            endpoint: sum(times) / len(times)
-            for endpoint, times in endpoint_times.items()
-            if sum(times) / len(times) > avg_response_time * 1.5
+            endpoint: avg_time
+            for endpoint, avg_time in endpoint_times.items()
+            if avg_time > avg_response_time * 1.5
         }
 
         # Generate optimization recommendations
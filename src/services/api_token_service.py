@@ -14,6 +14,13 @@ from src.models.subscription import (
 )
 from src.models.user import User
 from src.schemas.user import UserResponse
+from src.services.auth_cache import (
+    AuthEntry,
+    AuthStatus,
+    api_token_key,
+    auth_cache,
+    subscription_tier,
+)
 from src.utils.base_classes import BaseService
 
 # Token storage: only hash is stored (big-tech practice). Raw token shown once at creation.
@@ -106,6 +113,7 @@ class APITokenService(BaseService):
 
         token.is_active = "inactive"
         self.db.commit()
+        auth_cache.invalidate(api_token_key(token.token_hash))
         self.db.refresh(token)
 
         return APITokenResponse.model_validate(token.to_safe_dict())
@@ -124,29 +132,48 @@ class APITokenService(BaseService):
                 detail="Token not found",
             )
 
+        old_key = api_token_key(token.token_hash)
         raw_token = f"{TOKEN_PREFIX}{secrets.token_urlsafe(32)}"
         token.token_hash = _hash_token(raw_token)
         token.token_prefix = _token_display_prefix(raw_token)
         self.db.commit()
+        auth_cache.invalidate(old_key)
         self.db.refresh(token)
 
         # Rotate returns safe view; new raw token could be returned once (here we don't for simplicity)
         return APITokenResponse.model_validate(token.to_safe_dict())
 
     async def validate_token(self, plain_token: str) -> bool:
-        """Validate an API token. Compares hash of input to stored hash (constant-time)."""
+        """Validate an API token. Compares hash of input to stored hash (constant-time).
+
+        Results are kept in the auth cache by token hash; unknown tokens are
+        cached briefly so repeated guesses do not reach the database.
+        """
+        return self.resolve_token(plain_token).is_active
+
+    def resolve_token(self, plain_token: str) -> AuthEntry:
+        """Resolve an API token to its user id, active flag and subscription tier."""
         token_hash = _hash_token(plain_token)
+        key = api_token_key(token_hash)
+        entry = auth_cache.get(key)
+        if entry is not None:
+            return entry
+
         db_token = (
             self.db.query(APIToken).filter(APIToken.token_hash == token_hash).first()
         )
-
         if not db_token:
-            return False
-
-        if db_token.is_active != "active":
-            return False
-
-        return True
+            entry = AuthEntry(AuthStatus.INVALID)
+        elif db_token.is_active != "active":
+            entry = AuthEntry(AuthStatus.INACTIVE, user_id=db_token.user_id)
+        else:
+            entry = AuthEntry(
+                AuthStatus.ACTIVE,
+                user_id=db_token.user_id,
+                tier=subscription_tier(db_token.user),
+            )
+        auth_cache.set(key, entry)
+        return entry
 
     def execute(self, *args, **kwargs) -> Any:
         """Execute API token service operation.
@@ -0,0 +1,237 @@
+"""Authentication cache module.
+
+Caches the outcome of API-token and JWT validation by token hash, so repeated
+requests with the same credentials skip signature checks and token lookups.
+Invalid tokens are cached for a short time (negative cache) to blunt
+brute-force traffic. The cache is process-local: revocation and deactivation
+invalidate entries in this process, and other workers pick them up within
+the TTL.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+import jwt
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+AUTH_CACHE_TTL = 60.0
+AUTH_NEGATIVE_TTL = 5.0
+AUTH_CACHE_MAX_ENTRIES = 10_000
+
+
+class AuthStatus(str, Enum):
+    """Outcome of validating a token."""
+
+    ACTIVE = "active"
+    INACTIVE = "inactive"
+    NOT_FOUND = "not_found"
+    INVALID = "invalid"
+
+
+@dataclass(frozen=True)
+class AuthEntry:
+    """Cached validation result for one token."""
+
+    status: AuthStatus
+    user_id: str | None = None
+    tier: str | None = None
+    # Detached column-only copy of the user (see ``authenticate_jwt``)
+    user: Any = field(default=None, compare=False, repr=False)
+
+    @property
+    def is_active(self) -> bool:
+        return self.status is AuthStatus.ACTIVE
+
+    @property
+    def is_negative(self) -> bool:
+        """True when the token does not resolve to a user at all."""
+        return self.status in (AuthStatus.INVALID, AuthStatus.NOT_FOUND)
+
+
+def api_token_key(token_hash: str) -> str:
+    """Cache key for an API token, from its stored SHA-256 hash."""
+    return f"api_token:{token_hash}"
+
+
+def jwt_key(token: str, secret_key: str, algorithms: list[str]) -> str:
+    """Cache key for a JWT as verified with a given key and algorithms.
+
+    The verification parameters are part of the key, so a token accepted by
+    one verifier is never accepted from cache by a verifier with another key.
+    The token itself is never stored.
+    """
+    material = "\0".join((secret_key, ",".join(algorithms), token))
+    return f"jwt:{hashlib.sha256(material.encode('utf-8')).hexdigest()}"
+
+
+def subscription_tier(user: Any) -> str | None:
+    """Plan type of a user's current subscription, if any."""
+    subscription = getattr(user, "subscription", None)
+    return getattr(subscription, "plan_type", None) if subscription else None
+
+
+def detached_snapshot(instance: Any) -> Any:
+    """Copy an ORM instance's loaded columns into a new, detached instance.
+
+    The copy shares no state with the original, so it can be cached and
+    attached to other sessions with ``Session.merge(..., load=False)``.
+    """
+    state = inspect(instance)
+    snapshot = state.mapper.class_manager.new_instance()
+    for attr in state.mapper.column_attrs:
+        if attr.key in state.dict:
+            set_committed_value(snapshot, attr.key, state.dict[attr.key])
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+class AuthCache:
+    """Bounded, thread-safe TTL cache of token validation results."""
+
+    def __init__(
+        self,
+        max_entries: int = AUTH_CACHE_MAX_ENTRIES,
+        ttl: float = AUTH_CACHE_TTL,
+        negative_ttl: float = AUTH_NEGATIVE_TTL,
+    ) -> None:
+        """Initialize auth cache.
+
+        Args:
+            max_entries: Maximum number of cached tokens (LRU eviction)
+            ttl: Lifetime of results for tokens that resolve to a user
+            negative_ttl: Lifetime of results for invalid tokens
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: OrderedDict[str, tuple[float, AuthEntry]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> AuthEntry | None:
+        """Get a cached result, or None if missing or expired."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: AuthEntry, expires_at: float | None = None) -> None:
+        """Cache a result.
+
+        Args:
+            key: Cache key (see ``api_token_key`` and ``jwt_key``)
+            entry: Validation result
+            expires_at: Optional Unix time after which the token itself is
+                invalid (e.g. a JWT ``exp``); the entry never outlives it
+        """
+        ttl = self.negative_ttl if entry.is_negative else self.ttl
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        """Drop a cached result (e.g. after the token is revoked)."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop all cached results for a user (e.g. after deactivation)."""
+        with self._lock:
+            for key in [
+                k for k, (_, e) in self._entries.items() if e.user_id == user_id
+            ]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+auth_cache = AuthCache()
+
+
+def authenticate_jwt(
+    token: str,
+    secret_key: str,
+    algorithms: list[str],
+    load_user: Callable[[str], Any],
+    session: Session | None = None,
+) -> tuple[AuthEntry, Any]:
+    """Resolve a JWT to a user, using the auth cache.
+
+    Invalid tokens and unknown users are answered from the negative cache
+    without decoding or a database lookup. With a ``session``, known tokens
+    are answered without a query too: the cache keeps a detached snapshot of
+    the user, which is attached to the session without loading. Otherwise
+    the signature check is skipped and the user is loaded by id.
+
+    Args:
+        token: Encoded JWT
+        secret_key: Signing key
+        algorithms: Accepted signing algorithms
+        load_user: Returns the user for an id, or None
+        session: Session to attach cached users to (must be the session
+            ``load_user`` queries)
+
+    Returns:
+        tuple[AuthEntry, Any]: The validation result and the user (None unless
+        the token resolves to an existing user)
+    """
+    key = jwt_key(token, secret_key, algorithms)
+    entry = auth_cache.get(key)
+    if entry is not None:
+        if entry.is_negative:
+            return entry, None
+        if session is not None and entry.user is not None:
+            return entry, session.merge(entry.user, load=False)
+        user = load_user(entry.user_id)
+        if user is not None and bool(user.is_active) == entry.is_active:
+            return entry, user
+        # User changed since the result was cached: validate from scratch
+        auth_cache.invalidate(key)
+
+    try:
+        payload = jwt.decode(token, secret_key, algorithms=algorithms)
+    except jwt.InvalidTokenError:
+        payload = {}
+    user_id = payload.get("sub")
+    if user_id is None:
+        entry = AuthEntry(AuthStatus.INVALID)
+        auth_cache.set(key, entry)
+        return entry, None
+
+    user = load_user(user_id)
+    if user is None:
+        entry = AuthEntry(AuthStatus.NOT_FOUND, user_id=user_id)
+    else:
+        entry = AuthEntry(
+            AuthStatus.ACTIVE if user.is_active else AuthStatus.INACTIVE,
+            user_id=user_id,
+            tier=subscription_tier(user),
+            user=detached_snapshot(user) if session is not None else None,
+        )
+    auth_cache.set(key, entry, expires_at=payload.get("exp"))
+    return entry, user
@@ -0,0 +1,271 @@
+"""Embedding service module.
+
+Embeddings for a whole request are computed as one float32 matrix. Results are
+cached per (model, text hash) in an in-process LRU and, optionally, in Redis.
+"""
+
+import base64
+import hashlib
+import io
+import logging
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+from redis.asyncio import Redis
+
+EMBEDDING_DIM = 384
+# Bump when the embedding function changes so cached vectors are not reused
+EMBEDDING_VERSION = 2
+
+# SplitMix64 constants
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+logger = logging.getLogger(__name__)
+
+
+def text_key(model: str, text: str) -> str:
+    """Cache key for a text embedded by a model.
+
+    Args:
+        model: Embedding model name
+        text: Input text
+
+    Returns:
+        str: Versioned key of the model and the text's SHA-256
+    """
+    digest = hashlib.sha256(text.encode()).hexdigest()
+    return f"embedding:v{EMBEDDING_VERSION}:{model}:{digest}"
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer applied elementwise (wrapping uint64 arithmetic)."""
+    x = (x ^ (x >> np.uint64(30))) * _MIX_1
+    x = (x ^ (x >> np.uint64(27))) * _MIX_2
+    return x ^ (x >> np.uint64(31))
+
+
+def compute_embeddings(texts: list[str], dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """Deterministic unit-norm pseudo-embeddings for a batch of texts.
+
+    Each text seeds a counter-based SplitMix64 stream from its SHA-256, so the
+    whole batch is one vectorized computation: uniform bits for every
+    (text, component) pair, a Box-Muller transform to Gaussians, and a row
+    normalization.
+
+    Args:
+        texts: Input texts
+        dim: Embedding dimension (must be even)
+
+    Returns:
+        np.ndarray: ``(len(texts), dim)`` float32 matrix with unit-norm rows
+    """
+    if dim % 2:
+        raise ValueError("Embedding dimension must be even")
+    seeds = np.array(
+        [
+            int.from_bytes(hashlib.sha256(t.encode()).digest()[:8], "little")
+            for t in texts
+        ],
+        dtype=np.uint64,
+    )
+    counters = np.arange(1, dim + 1, dtype=np.uint64) * _GOLDEN_GAMMA
+    bits = _splitmix64(seeds[:, None] + counters[None, :])
+
+    # Top 53 bits -> uniform in (0, 1]
+    uniform = ((bits >> np.uint64(11)).astype(np.float64) + 1.0) * 2.0**-53
+    u1, u2 = uniform[:, : dim // 2], uniform[:, dim // 2 :]
+    radius = np.sqrt(-2.0 * np.log(u1))
+    angle = 2.0 * np.pi * u2
+    gaussian = np.concatenate((radius * np.cos(angle), radius * np.sin(angle)), axis=1)
+
+    gaussian /= np.linalg.norm(gaussian, axis=1, keepdims=True)
+    return gaussian.astype(np.float32)
+
+
+def encode_base64(embeddings: np.ndarray) -> list[str]:
+    """Encode each row as base64 of little-endian float32 bytes.
+
+    Args:
+        embeddings: ``(n, dim)`` embedding matrix
+
+    Returns:
+        list[str]: One base64 string per embedding
+    """
+    rows = np.ascontiguousarray(embeddings, dtype="<f4")
+    return [base64.b64encode(row.tobytes()).decode("ascii") for row in rows]
+
+
+def encode_npy(embeddings: np.ndarray) -> bytes:
+    """Serialize an embedding matrix in NumPy ``.npy`` format.
+
+    Args:
+        embeddings: ``(n, dim)`` embedding matrix
+
+    Returns:
+        bytes: ``.npy`` file contents
+    """
+    buffer = io.BytesIO()
+    np.save(buffer, np.ascontiguousarray(embeddings, dtype="<f4"))
+    return buffer.getvalue()
+
+
+class LRUEmbeddingCache:
+    """In-process LRU cache of embedding vectors."""
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        """Initialize LRU cache.
+
+        Args:
+            max_entries: Maximum number of cached vectors
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Get cached vectors.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            dict[str, np.ndarray]: Vectors for the keys that were cached
+        """
+        found = {}
+        for key in keys:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                found[key] = vector
+        return found
+
+    def set_many(self, items: dict[str, np.ndarray]) -> None:
+        """Cache vectors, evicting the least recently used.
+
+        Args:
+            items: Vectors by cache key
+        """
+        for key, vector in items.items():
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached vectors."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class EmbeddingService:
+    """Batched embedding engine with an LRU and optional Redis cache."""
+
+    def __init__(
+        self,
+        cache: LRUEmbeddingCache | None = None,
+        redis: Redis | None = None,
+        redis_ttl: int = 86_400,
+        dim: int = EMBEDDING_DIM,
+    ) -> None:
+        """Initialize embedding service.
+
+        Args:
+            cache: In-process cache (default: a new LRU cache)
+            redis: Optional Redis client shared across workers
+            redis_ttl: Expiry of Redis entries in seconds
+            dim: Embedding dimension
+        """
+        self.cache = cache if cache is not None else LRUEmbeddingCache()
+        self.redis = redis
+        self.redis_ttl = redis_ttl
+        self.dim = dim
+
+    async def embed(self, texts: list[str], model: str) -> np.ndarray:
+        """Embed texts, computing only those not found in a cache.
+
+        Args:
+            texts: Input texts (duplicates are computed once)
+            model: Embedding model name
+
+        Returns:
+            np.ndarray: ``(len(texts), dim)`` float32 matrix in input order
+        """
+        keys = [text_key(model, text) for text in texts]
+        unique = list(dict.fromkeys(keys))
+        found = self.cache.get_many(unique)
+
+        missing = [key for key in unique if key not in found]
+        if missing and self.redis is not None:
+            from_redis = await self._redis_get_many(missing)
+            self.cache.set_many(from_redis)
+            found.update(from_redis)
+            missing = [key for key in missing if key not in from_redis]
+
+        if missing:
+            text_by_key = dict(zip(keys, texts))
+            computed = compute_embeddings(
+                [text_by_key[key] for key in missing], self.dim
+            )
+            # Copy rows so cached vectors do not pin the whole batch matrix
+            fresh = {key: row.copy() for key, row in zip(missing, computed)}
+            self.cache.set_many(fresh)
+            found.update(fresh)
+            if self.redis is not None:
+                await self._redis_set_many(fresh)
+
+        if not keys:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
+
+    async def _redis_get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Fetch vectors from Redis in one MGET; errors degrade to a miss."""
+        try:
+            values = await self.redis.mget(keys)
+        except Exception as e:
+            logger.warning(f"Embedding cache read failed: {str(e)}")
+            return {}
+        return {
+            key: np.frombuffer(base64.b64decode(value), dtype="<f4")
+            for key, value in zip(keys, values)
+            if value is not None
+        }
+
+    async def _redis_set_many(self, items: dict[str, Any]) -> None:
+        """Store vectors in Redis with one pipeline; errors are logged."""
+        try:
+            pipeline = self.redis.pipeline(transaction=False)
+            for key, vector in items.items():
+                encoded = base64.b64encode(np.asarray(vector, dtype="<f4").tobytes())
+                pipeline.set(key, encoded, ex=self.redis_ttl)
+            await pipeline.execute()
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed: {str(e)}")
+
+
+_embedding_service: EmbeddingService | None = None
+
+
+async def get_embedding_service() -> EmbeddingService:
+    """Get the shared embedding service.
+
+    Redis caching is enabled when the ``EMBEDDING_CACHE_REDIS`` setting is true
+    and Redis is reachable; otherwise only the in-process cache is used.
+    """
+    global _embedding_service
+    if _embedding_service is None:
+        from src.config import get_settings
+
+        redis = None
+        if getattr(get_settings(), "EMBEDDING_CACHE_REDIS", False):
+            try:
+                from src.services.redis_client import RedisClient
+
+                redis = await RedisClient.get_client()
+            except Exception as e:
+                logger.warning(f"Embedding cache using memory only: {str(e)}")
+        _embedding_service = EmbeddingService(redis=redis)
+    return _embedding_service
@@ -1,20 +1,213 @@
-"""Rate limiting service module."""
+"""Rate limiting service module.
 
+Each algorithm runs as a single Lua script on the Redis server, so a rate
+limit decision (allowed, remaining, reset) costs one atomic round trip.
+``LocalRateLimiter`` adds an in-process tier that skips Redis on the hot path.
+"""
+
+import asyncio
+import contextlib
+import logging
+import math
 import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
 
 from redis.asyncio import Redis
 
+# Every script returns {allowed, remaining, reset_ms, retry_after_ms}.
+# ARGV[1]=limit, ARGV[2]=window in ms, ARGV[3]=cost.
+
+FIXED_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local ttl = redis.call('PTTL', KEYS[1])
+if ttl < 0 then
+    ttl = window
+end
+
+if current + cost > limit then
+    return {0, math.max(limit - current, 0), ttl, ttl}
+end
+
+current = redis.call('INCRBY', KEYS[1], cost)
+if current == cost then
+    redis.call('PEXPIRE', KEYS[1], window)
+end
+return {1, math.max(limit - current, 0), ttl, 0}
+"""
+
+SLIDING_LOG_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local member = ARGV[4]
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+
+local function expires_in(rank)
+    local entry = redis.call('ZRANGE', KEYS[1], rank, rank, 'WITHSCORES')
+    if entry[2] then
+        return math.max(tonumber(entry[2]) + window - now, 0)
+    end
+    return window
+end
+
+if count + cost > limit then
+    local retry = window
+    if cost <= limit then
+        retry = expires_in(count + cost - limit - 1)
+    end
+    return {0, math.max(limit - count, 0), expires_in(0), retry}
+end
+
+for i = 1, cost do
+    redis.call('ZADD', KEYS[1], now, member .. ':' .. i)
+end
+redis.call('PEXPIRE', KEYS[1], window)
+return {1, limit - count - cost, expires_in(0), 0}
+"""
+
+GCRA_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+-- Emission interval; a full bucket tolerates `limit` back-to-back requests
+local interval = window / limit
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+
+local new_tat = tat + interval * cost
+local allow_at = new_tat - window
+if allow_at > now then
+    local remaining = math.floor((window - (tat - now)) / interval)
+    return {0, math.max(remaining, 0), math.ceil(tat - now), math.ceil(allow_at - now)}
+end
+
+local reset = math.ceil(new_tat - now)
+redis.call('SET', KEYS[1], string.format('%.3f', new_tat), 'PX', reset)
+return {1, math.floor((window - (new_tat - now)) / interval), reset, 0}
+"""
+
+
+class RateLimitAlgorithm(str, Enum):
+    """Supported rate limiting algorithms."""
+
+    FIXED_WINDOW = "fixed_window"
+    SLIDING_LOG = "sliding_log"
+    GCRA = "gcra"
+
+
+_SCRIPTS = {
+    RateLimitAlgorithm.FIXED_WINDOW: FIXED_WINDOW_SCRIPT,
+    RateLimitAlgorithm.SLIDING_LOG: SLIDING_LOG_SCRIPT,
+    RateLimitAlgorithm.GCRA: GCRA_SCRIPT,
+}
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Outcome of a single rate limit decision."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: int  # seconds until the limit fully or partially resets
+    retry_after: int  # seconds to wait before retrying, 0 when allowed
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Standard rate limit response headers for this decision."""
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(self.reset),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+
+def _ms_to_seconds(milliseconds: int) -> int:
+    """Round a millisecond duration up to whole seconds."""
+    return -(-int(milliseconds) // 1000)
+
 
 class RateLimitingService:
     """Service for managing rate limiting."""
 
-    def __init__(self, redis: Redis) -> None:
+    def __init__(
+        self,
+        redis: Redis,
+        algorithm: RateLimitAlgorithm | str = RateLimitAlgorithm.FIXED_WINDOW,
+    ) -> None:
         """Initialize rate limiting service.
 
         Args:
             redis: Redis client instance
+            algorithm: Default algorithm used by ``acquire``
         """
         self.redis = redis
+        self.algorithm = RateLimitAlgorithm(algorithm)
+        # Script objects run via EVALSHA and reload themselves on NOSCRIPT
+        self._scripts = {
+            name: redis.register_script(source) for name, source in _SCRIPTS.items()
+        }
+
+    async def acquire(
+        self,
+        client_id: str,
+        max_requests: int,
+        window_seconds: int,
+        cost: int = 1,
+        algorithm: RateLimitAlgorithm | str | None = None,
+    ) -> RateLimitResult:
+        """Atomically check and consume rate limit capacity.
+
+        Args:
+            client_id: Client identifier
+            max_requests: Maximum number of requests per window
+            window_seconds: Window size in seconds
+            cost: Number of requests this call consumes
+            algorithm: Override the service's default algorithm
+
+        Returns:
+            RateLimitResult: Decision with remaining quota and reset times
+        """
+        algorithm = RateLimitAlgorithm(algorithm or self.algorithm)
+        args = [max_requests, window_seconds * 1000, cost]
+        if algorithm is RateLimitAlgorithm.FIXED_WINDOW:
+            key = self._get_window_key(client_id, window_seconds)
+        else:
+            key = self._get_key(client_id, algorithm)
+            if algorithm is RateLimitAlgorithm.SLIDING_LOG:
+                args.append(uuid.uuid4().hex)
+
+        allowed, remaining, reset_ms, retry_ms = await self._scripts[algorithm](
+            keys=[key], args=args
+        )
+        return RateLimitResult(
+            allowed=bool(allowed),
+            limit=max_requests,
+            remaining=int(remaining),
+            reset=_ms_to_seconds(reset_ms),
+            retry_after=_ms_to_seconds(retry_ms),
+        )
 
     async def check_rate_limit(
         self,
@@ -32,27 +225,8 @@ class RateLimitingService:
         Returns:
             bool: True if client has not exceeded rate limit
         """
-        # Get current window key
-        window_key = self._get_window_key(client_id, window_seconds)
-
-        # Get current request count
-        count = await self.redis.get(window_key)
-        if not count:
-            # First request in window
-            pipeline = self.redis.pipeline()
-            pipeline.set(window_key, 1)
-            pipeline.expire(window_key, window_seconds)
-            await pipeline.execute()
-            return True
-
-        # Check if limit exceeded
-        count = int(count)
-        if count >= max_requests:
-            return False
-
-        # Increment request count
-        await self.redis.incr(window_key)
-        return True
+        result = await self.acquire(client_id, max_requests, window_seconds)
+        return result.allowed
 
     async def get_remaining_requests(
         self,
@@ -117,11 +291,24 @@ class RateLimitingService:
             client_id: Client identifier
             window_seconds: Window size in seconds
         """
-        # Get current window key
-        window_key = self._get_window_key(client_id, window_seconds)
+        # Delete window key and per-algorithm state
+        await self.redis.delete(
+            self._get_window_key(client_id, window_seconds),
+            self._get_key(client_id, RateLimitAlgorithm.SLIDING_LOG),
+            self._get_key(client_id, RateLimitAlgorithm.GCRA),
+        )
+
+    def _get_key(self, client_id: str, algorithm: RateLimitAlgorithm) -> str:
+        """Get Redis key holding a client's sliding log or GCRA state.
 
-        # Delete window key
-        await self.redis.delete(window_key)
+        Args:
+            client_id: Client identifier
+            algorithm: Rate limiting algorithm
+
+        Returns:
+            str: Redis key
+        """
+        return f"rate_limit:{algorithm.value}:{client_id}"
 
     def _get_window_key(self, client_id: str, window_seconds: int) -> str:
         """Get Redis key for rate limit window.
@@ -136,3 +323,185 @@ class RateLimitingService:
         # Calculate window start time
         window_start = int(time.time() / window_seconds) * window_seconds
         return f"rate_limit:{client_id}:{window_start}"
+
+
+@dataclass
+class _TokenBucket:
+    """Local token bucket state for one client and window size."""
+
+    tokens: float
+    updated: float
+    pending: int = 0  # admitted locally but not yet flushed to Redis
+
+
+class LocalRateLimiter:
+    """Process-local token buckets reconciled with Redis in batches.
+
+    Requests are admitted from an in-memory bucket per client (bounded LRU),
+    so the hot path makes no Redis call. Consumed counts are periodically
+    flushed with one pipeline into the same fixed-window keys used by
+    ``RateLimitingService``, and each bucket is clamped to the global
+    remaining quota returned by the flush.
+
+    Between flushes a process may admit at most ``max_unsynced`` requests per
+    client beyond the shared quota; reaching that bound forces an inline
+    flush.
+    """
+
+    def __init__(
+        self,
+        service: RateLimitingService,
+        max_keys: int = 10_000,
+        flush_interval: float = 1.0,
+        max_unsynced: int = 50,
+    ) -> None:
+        """Initialize local rate limiter.
+
+        Args:
+            service: Redis-backed service whose window keys are shared
+            max_keys: Maximum number of client buckets kept in memory
+            flush_interval: Seconds between background flushes
+            max_unsynced: Per-client over-admit bound between flushes
+        """
+        if max_keys <= 0 or flush_interval <= 0 or max_unsynced <= 0:
+            raise ValueError(
+                "max_keys, flush_interval and max_unsynced must be positive"
+            )
+        self.service = service
+        self.max_keys = max_keys
+        self.flush_interval = flush_interval
+        self.max_unsynced = max_unsynced
+        self._buckets: OrderedDict[tuple[str, int, int], _TokenBucket] = OrderedDict()
+        # Pending counts of evicted buckets, still owed to Redis
+        self._evicted: dict[tuple[str, int], int] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        self.logger = logging.getLogger(__name__)
+
+    async def acquire(
+        self,
+        client_id: str,
+        max_requests: int,
+        window_seconds: int,
+        cost: int = 1,
+        algorithm: RateLimitAlgorithm | str | None = None,
+    ) -> RateLimitResult:
+        """Admit or reject a request from the local bucket.
+
+        Args:
+            client_id: Client identifier
+            max_requests: Bucket capacity, refilled over ``window_seconds``
+            window_seconds: Window size in seconds
+            cost: Number of requests this call consumes
+            algorithm: Ignored; local buckets always use a token bucket
+
+        Returns:
+            RateLimitResult: Decision with remaining quota and reset times
+        """
+        self._ensure_flusher()
+        rate = max_requests / window_seconds
+        bucket = self._get_bucket(client_id, max_requests, window_seconds)
+        if bucket.pending >= self.max_unsynced:
+            await self.flush()
+
+        now = time.monotonic()
+        bucket.tokens = min(max_requests, bucket.tokens + (now - bucket.updated) * rate)
+        bucket.updated = now
+
+        allowed = bucket.tokens >= cost
+        if allowed:
+            bucket.tokens -= cost
+            bucket.pending += cost
+
+        return RateLimitResult(
+            allowed=allowed,
+            limit=max_requests,
+            remaining=int(bucket.tokens),
+            reset=math.ceil((max_requests - bucket.tokens) / rate),
+            retry_after=0 if allowed else math.ceil((cost - bucket.tokens) / rate),
+        )
+
+    async def flush(self) -> None:
+        """Push locally consumed counts to Redis in one pipeline."""
+        async with self._flush_lock:
+            batch: dict[tuple[str, int], int] = self._evicted
+            self._evicted = {}
+            owners: list[tuple[tuple[str, int], _TokenBucket, int]] = []
+            for (client_id, limit, window), bucket in self._buckets.items():
+                if bucket.pending:
+                    key = (client_id, window)
+                    batch[key] = batch.get(key, 0) + bucket.pending
+                    owners.append((key, bucket, limit))
+                    bucket.pending = 0
+            if not batch:
+                return
+
+            keys = list(batch)
+            pipeline = self.service.redis.pipeline(transaction=False)
+            for client_id, window in keys:
+                window_key = self.service._get_window_key(client_id, window)
+                pipeline.incrby(window_key, batch[(client_id, window)])
+                pipeline.expire(window_key, window)
+
+            try:
+                results = await pipeline.execute()
+            except Exception as e:
+                self.logger.warning(f"Failed to flush local rate limits: {str(e)}")
+                # Keep the counts so the next flush retries them
+                for key, count in batch.items():
+                    self._evicted[key] = self._evicted.get(key, 0) + count
+                return
+
+            totals = dict(zip(keys, results[::2]))
+            for key, bucket, limit in owners:
+                bucket.tokens = min(bucket.tokens, max(0, limit - int(totals[key])))
+
+    async def close(self) -> None:
+        """Stop the background flusher and flush remaining counts."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        await self.flush()
+
+    def _get_bucket(
+        self, client_id: str, max_requests: int, window_seconds: int
+    ) -> _TokenBucket:
+        """Get a client's bucket, evicting the least recently used one.
+
+        Args:
+            client_id: Client identifier
+            max_requests: Bucket capacity
+            window_seconds: Window size in seconds
+
+        Returns:
+            _TokenBucket: Bucket for this client and limit
+        """
+        key = (client_id, max_requests, window_seconds)
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            self._buckets.move_to_end(key)
+            return bucket
+
+        bucket = _TokenBucket(tokens=float(max_requests), updated=time.monotonic())
+        self._buckets[key] = bucket
+        if len(self._buckets) > self.max_keys:
+            (client, _, window), evicted = self._buckets.popitem(last=False)
+            if evicted.pending:
+                owed = (client, window)
+                self._evicted[owed] = self._evicted.get(owed, 0) + evicted.pending
+        return bucket
+
+    def _ensure_flusher(self) -> None:
+        """Start the background flush loop on the running event loop."""
+        loop = asyncio.get_running_loop()
+        task = self._flush_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._flush_task = loop.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """Flush pending counts every ``flush_interval`` seconds."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
@@ -0,0 +1,347 @@
+"""Usage accounting module.
+
+Per-user call counters with a write-behind buffer. The request path only
+touches counters (in memory, or Redis for the rate window when configured);
+``APICall`` rows and ``APIUsage`` increments are buffered and written in one
+transaction per flush, off the event loop.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import defaultdict, deque
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from redis.asyncio import Redis
+from sqlalchemy import case, insert, or_, select
+from sqlalchemy.orm import Session
+
+from src.models.api_call import APICall, APIUsage
+from src.services.usage_analytics import update_rollups, utc_naive
+
+
+class UsageAccountant:
+    """Counter-based rate and usage accounting with batched persistence.
+
+    Rate checks read a fixed per-minute window counter. Period usage is the
+    persisted ``APIUsage.calls_count`` (loaded once per user and billing
+    period, refreshed after every flush) plus this process's unflushed calls.
+    Each user has one ``APIUsage`` row; a flush restarts its count when the
+    row's ``last_reset`` predates the user's current period (see
+    ``set_period``). Flushes run every ``flush_interval`` seconds, or early
+    once ``max_buffer`` calls are pending.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] | None = None,
+        redis: Redis | None = None,
+        flush_interval: float = 5.0,
+        max_buffer: int = 1000,
+        max_backlog: int = 100_000,
+    ) -> None:
+        """Initialize usage accountant.
+
+        Args:
+            session_factory: Creates database sessions for flushes
+                (default: ``src.database.SessionLocal``)
+            redis: Optional Redis client sharing rate windows across workers
+            flush_interval: Seconds between background flushes
+            max_buffer: Pending calls that trigger an early flush
+            max_backlog: Pending ``APICall`` rows kept while the database is
+                unavailable; older rows are dropped beyond this (counters are
+                never dropped)
+        """
+        if flush_interval <= 0 or max_buffer <= 0 or max_backlog < max_buffer:
+            raise ValueError(
+                "flush_interval and max_buffer must be positive and "
+                "max_backlog at least max_buffer"
+            )
+        self._session_factory = session_factory
+        self.redis = redis
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._calls: deque[dict[str, Any]] = deque(maxlen=max_backlog)
+        self._pending: dict[str, int] = defaultdict(int)
+        # Increments being written by the current flush, still counted as usage
+        self._flushing: dict[str, int] = {}
+        self._baseline: dict[str, int] = {}
+        # User -> (start, end) of the current billing period, naive UTC
+        self._periods: dict[str, tuple[datetime, datetime | None]] = {}
+        # Window size -> (current window start, calls per user in that window)
+        self._windows: dict[int, tuple[int, dict[str, int]]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        self._early_flush: asyncio.Task | None = None
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def session_factory(self) -> Callable[[], Session]:
+        if self._session_factory is None:
+            from src.database import SessionLocal
+
+            self._session_factory = SessionLocal
+        return self._session_factory
+
+    @staticmethod
+    def _window_start(window_seconds: int) -> int:
+        return int(time.time()) // window_seconds * window_seconds
+
+    def _window_key(self, user_id: str, window_seconds: int) -> str:
+        start = self._window_start(window_seconds)
+        return f"usage:calls:{user_id}:{window_seconds}:{start}"
+
+    async def calls_in_window(self, user_id: str, window_seconds: int = 60) -> int:
+        """Number of calls recorded for a user in the current window.
+
+        Args:
+            user_id: User identifier
+            window_seconds: Fixed window size in seconds
+
+        Returns:
+            int: Calls counted so far in this window
+        """
+        if self.redis is not None:
+            try:
+                value = await self.redis.get(self._window_key(user_id, window_seconds))
+                return int(value or 0)
+            except Exception as e:
+                self.logger.warning(f"Usage window read failed: {str(e)}")
+        return self._local_window(window_seconds).get(user_id, 0)
+
+    def _local_window(self, window_seconds: int) -> dict[str, int]:
+        """In-memory counts for the current window, reset when it rolls over."""
+        start = self._window_start(window_seconds)
+        current = self._windows.get(window_seconds)
+        if current is None or current[0] != start:
+            current = self._windows[window_seconds] = (start, defaultdict(int))
+        return current[1]
+
+    def set_period(
+        self, user_id: str, start: datetime | None, end: datetime | None = None
+    ) -> None:
+        """Record a user's current billing period.
+
+        When the period rolls over, the persisted count is reloaded for the
+        new period and the next flush restarts the user's ``APIUsage`` row.
+
+        Args:
+            user_id: User identifier
+            start: Start of the current period (None: no period, counts
+                accumulate)
+            end: End of the current period, stored as ``next_reset``
+        """
+        if start is None:
+            return
+        start = utc_naive(start)
+        current = self._periods.get(user_id)
+        if current is None or start > current[0]:
+            self._baseline.pop(user_id, None)
+        if current is None or start >= current[0]:
+            self._periods[user_id] = (start, utc_naive(end) if end else None)
+
+    def period_usage(self, user_id: str, load_baseline: Callable[[], int]) -> int:
+        """Calls counted for a user in the current billing period.
+
+        Args:
+            user_id: User identifier
+            load_baseline: Returns the persisted count for the current
+                period; called the first time a user is seen by this process
+                and after the period rolls over
+
+        Returns:
+            int: Persisted count plus this process's unflushed calls
+        """
+        baseline = self._baseline.get(user_id)
+        if baseline is None:
+            baseline = self._baseline[user_id] = load_baseline()
+        return baseline + self._flushing.get(user_id, 0) + self._pending.get(user_id, 0)
+
+    async def record_call(
+        self,
+        user_id: str,
+        endpoint: str,
+        response_time: float,
+        status: int,
+        method: str | None = None,
+        window_seconds: int = 60,
+    ) -> None:
+        """Count a call and buffer its ``APICall`` row.
+
+        Args:
+            user_id: User identifier
+            endpoint: Endpoint path
+            response_time: Response time in seconds
+            status: HTTP status code
+            method: HTTP method, if known
+            window_seconds: Rate window the call is counted in
+        """
+        self._calls.append(
+            {
+                "user_id": user_id,
+                "endpoint": endpoint,
+                "method": method,
+                "status_code": status,
+                "response_time": int(round(response_time * 1000)),
+                "created_at": utc_naive(datetime.now(timezone.utc)),
+            }
+        )
+        self._pending[user_id] += 1
+        await self._count_in_window(user_id, window_seconds)
+
+        self._ensure_flusher()
+        if len(self._calls) >= self.max_buffer and (
+            self._early_flush is None or self._early_flush.done()
+        ):
+            self._early_flush = asyncio.get_running_loop().create_task(self.flush())
+
+    async def _count_in_window(self, user_id: str, window_seconds: int) -> None:
+        """Increment the rate window counter (Redis, falling back to memory)."""
+        if self.redis is not None:
+            key = self._window_key(user_id, window_seconds)
+            try:
+                pipeline = self.redis.pipeline(transaction=False)
+                pipeline.incr(key)
+                pipeline.expire(key, window_seconds * 2)
+                await pipeline.execute()
+                return
+            except Exception as e:
+                self.logger.warning(f"Usage window write failed: {str(e)}")
+
+        self._local_window(window_seconds)[user_id] += 1
+
+    async def flush(self) -> int:
+        """Write buffered calls and usage increments in one transaction.
+
+        Returns:
+            int: Number of ``APICall`` rows written
+        """
+        async with self._flush_lock:
+            calls = list(self._calls)
+            self._calls.clear()
+            increments = self._flushing = dict(self._pending)
+            self._pending.clear()
+            if not calls and not increments:
+                return 0
+
+            try:
+                periods = {u: self._periods.get(u) for u in increments}
+                totals = await asyncio.to_thread(
+                    self._write, calls, increments, periods
+                )
+            except Exception as e:
+                self.logger.error(f"Usage flush failed: {str(e)}")
+                # Keep everything for the next attempt, ahead of calls recorded
+                # meanwhile; the oldest rows are dropped beyond max_backlog
+                recorded = self._calls
+                self._calls = deque(calls, maxlen=recorded.maxlen)
+                self._calls.extend(recorded)
+                for user_id, count in increments.items():
+                    self._pending[user_id] += count
+                return 0
+            finally:
+                self._flushing = {}
+
+            self._baseline.update(totals)
+            return len(calls)
+
+    def _write(
+        self,
+        calls: list[dict[str, Any]],
+        increments: dict[str, int],
+        periods: dict[str, tuple[datetime, datetime | None] | None],
+    ) -> dict[str, int]:
+        """Bulk insert calls, update rollups and ``APIUsage``, return new totals."""
+        session = self.session_factory()
+        try:
+            if calls:
+                session.execute(insert(APICall), calls)
+                update_rollups(session, calls)
+
+            rows = session.scalars(
+                select(APIUsage)
+                .where(APIUsage.user_id.in_(increments))
+                .order_by(APIUsage.id)
+            ).all()
+            # One usage row per user; the newest wins if duplicates exist
+            usage = {row.user_id: row for row in rows}
+            for user_id, count in increments.items():
+                row = usage.get(user_id)
+                start, end = periods.get(user_id) or (None, None)
+                if row is None:
+                    usage[user_id] = APIUsage(
+                        user_id=user_id,
+                        calls_count=count,
+                        last_reset=start or utc_naive(datetime.now(timezone.utc)),
+                        next_reset=end,
+                    )
+                    session.add(usage[user_id])
+                elif start is None:
+                    # Evaluated in SQL, so concurrent workers do not lose counts
+                    row.calls_count = APIUsage.calls_count + count
+                else:
+                    # Restart the count in SQL when the row is from an earlier
+                    # period, so only one of several workers resets it
+                    stale = or_(
+                        APIUsage.last_reset.is_(None), APIUsage.last_reset < start
+                    )
+                    row.calls_count = case(
+                        (stale, count), else_=APIUsage.calls_count + count
+                    )
+                    row.last_reset = case((stale, start), else_=APIUsage.last_reset)
+                    row.next_reset = case((stale, end), else_=APIUsage.next_reset)
+            session.commit()
+
+            totals = session.execute(
+                select(APIUsage.user_id, APIUsage.calls_count)
+                .where(APIUsage.user_id.in_(increments))
+                .order_by(APIUsage.id)
+            ).all()
+            return {user_id: count for user_id, count in totals}
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    async def close(self) -> None:
+        """Stop the background flusher and flush remaining calls."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        await self.flush()
+
+    def _ensure_flusher(self) -> None:
+        """Start the background flush loop on the running event loop."""
+        loop = asyncio.get_running_loop()
+        task = self._flush_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._flush_task = loop.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """Flush buffered calls every ``flush_interval`` seconds."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+
+_usage_accountant: UsageAccountant | None = None
+
+
+def get_usage_accountant() -> UsageAccountant:
+    """Get the process-wide usage accountant."""
+    global _usage_accountant
+    if _usage_accountant is None:
+        _usage_accountant = UsageAccountant()
+    return _usage_accountant
+
+
+async def close_usage_accountant() -> None:
+    """Flush the process-wide accountant, if any (call on application shutdown)."""
+    if _usage_accountant is not None:
+        await _usage_accountant.close()
@@ -0,0 +1,215 @@
+"""Usage analytics module.
+
+Aggregates API calls in SQL. Whole hours are read from the
+``api_call_rollups`` table, which is maintained incrementally as buffered
+calls are flushed; only the partial hours at the edges of a range are
+grouped from raw ``api_calls`` rows, using the ``(user_id, created_at)``
+index.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Session
+
+from src.models.api_call import APICall, APICallRollup
+
+# Response time histogram: label, rollup column, lower bound, upper bound (ms)
+RESPONSE_TIME_BUCKETS = (
+    ("<100ms", "rt_lt_100", None, 100),
+    ("100-200ms", "rt_100_200", 100, 200),
+    ("200-300ms", "rt_200_300", 200, 300),
+    ("300-400ms", "rt_300_400", 300, 400),
+    (">400ms", "rt_ge_400", 400, None),
+)
+_SUM_FIELDS = ("calls", "errors", "total_response_time") + tuple(
+    column for _, column, _, _ in RESPONSE_TIME_BUCKETS
+)
+_HOUR = timedelta(hours=1)
+
+
+def utc_naive(value: datetime) -> datetime:
+    """Convert to naive UTC, the form datetimes are stored in."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(value: datetime) -> datetime:
+    floor = _floor_hour(value)
+    return floor if floor == value else floor + _HOUR
+
+
+def _bucket_column(response_time: int) -> str:
+    """Rollup column of the histogram bucket a response time falls in."""
+    for _, column, _, upper in RESPONSE_TIME_BUCKETS[:-1]:
+        if response_time < upper:
+            return column
+    return RESPONSE_TIME_BUCKETS[-1][1]
+
+
+def update_rollups(session: Session, calls: Iterable[dict[str, Any]]) -> None:
+    """Add a batch of calls to the hourly rollups (caller commits).
+
+    Args:
+        session: Session of the transaction that inserts the calls
+        calls: ``APICall`` column mappings (user_id, endpoint, status_code,
+            response_time in ms, created_at)
+    """
+    deltas: dict[tuple[str, datetime, str], dict[str, int]] = defaultdict(
+        lambda: dict.fromkeys(_SUM_FIELDS, 0)
+    )
+    for call in calls:
+        key = (
+            call["user_id"],
+            _floor_hour(utc_naive(call["created_at"])),
+            call["endpoint"],
+        )
+        delta = deltas[key]
+        response_time = call["response_time"] or 0
+        delta["calls"] += 1
+        delta["errors"] += int((call["status_code"] or 0) >= 400)
+        delta["total_response_time"] += response_time
+        delta[_bucket_column(response_time)] += 1
+    if not deltas:
+        return
+
+    users = {user_id for user_id, _, _ in deltas}
+    hours = {hour for _, hour, _ in deltas}
+    existing = {
+        (row.user_id, row.hour, row.endpoint): row
+        for row in session.scalars(
+            select(APICallRollup).where(
+                APICallRollup.user_id.in_(users), APICallRollup.hour.in_(hours)
+            )
+        )
+    }
+    for key, delta in deltas.items():
+        row = existing.get(key)
+        if row is None:
+            user_id, hour, endpoint = key
+            session.add(
+                APICallRollup(user_id=user_id, hour=hour, endpoint=endpoint, **delta)
+            )
+        else:
+            # Evaluated in SQL, so concurrent flushes do not lose counts
+            for field, value in delta.items():
+                setattr(row, field, getattr(APICallRollup, field) + value)
+
+
+class UsageAnalytics:
+    """GROUP BY analytics over hourly rollups and raw edge hours."""
+
+    def __init__(self, db: Session) -> None:
+        """Initialize usage analytics.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    def endpoint_stats(
+        self, start: datetime, end: datetime, user_id: str | None = None
+    ) -> dict[str, dict[str, int]]:
+        """Per-endpoint sums of calls, errors, response time and histogram.
+
+        Args:
+            start: Range start (inclusive)
+            end: Range end (exclusive)
+            user_id: Restrict to one user (default: all users)
+
+        Returns:
+            dict[str, dict[str, int]]: Sums by endpoint (see ``_SUM_FIELDS``)
+        """
+        start, end = utc_naive(start), utc_naive(end)
+        stats: dict[str, dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(_SUM_FIELDS, 0)
+        )
+
+        first_hour, last_hour = _ceil_hour(start), _floor_hour(end)
+        if first_hour < last_hour:
+            self._add(stats, self._rollup_rows(first_hour, last_hour, user_id))
+            edges = [(start, first_hour), (last_hour, end)]
+        else:
+            edges = [(start, end)]
+        for edge_start, edge_end in edges:
+            if edge_start < edge_end:
+                self._add(stats, self._raw_rows(edge_start, edge_end, user_id))
+        return dict(stats)
+
+    def summary(self, user_id: str, start: datetime, end: datetime) -> dict:
+        """Usage summary for a user's billing period.
+
+        Args:
+            user_id: User identifier
+            start: Period start
+            end: Period end
+
+        Returns:
+            dict: total_calls, response_time_distribution, endpoint_usage,
+            error_rate and average_response_time (seconds)
+        """
+        stats = self.endpoint_stats(start, end, user_id)
+        totals = dict.fromkeys(_SUM_FIELDS, 0)
+        for sums in stats.values():
+            for field in _SUM_FIELDS:
+                totals[field] += sums[field]
+
+        total_calls = totals["calls"]
+        return {
+            "total_calls": total_calls,
+            "response_time_distribution": {
+                label: totals[column] for label, column, _, _ in RESPONSE_TIME_BUCKETS
+            },
+            "endpoint_usage": {
+                endpoint: sums["calls"] for endpoint, sums in stats.items()
+            },
+            "error_rate": totals["errors"] / total_calls if total_calls else 0,
+            "average_response_time": (
+                totals["total_response_time"] / 1000 / total_calls if total_calls else 0
+            ),
+        }
+
+    def _rollup_rows(self, start: datetime, end: datetime, user_id: str | None):
+        columns = [getattr(APICallRollup, field) for field in _SUM_FIELDS]
+        query = select(
+            APICallRollup.endpoint, *(func.sum(column) for column in columns)
+        ).where(APICallRollup.hour >= start, APICallRollup.hour < end)
+        if user_id is not None:
+            query = query.where(APICallRollup.user_id == user_id)
+        return self.db.execute(query.group_by(APICallRollup.endpoint)).all()
+
+    def _raw_rows(self, start: datetime, end: datetime, user_id: str | None):
+        response_time = func.coalesce(APICall.response_time, 0)
+        buckets = []
+        for _, _, lower, upper in RESPONSE_TIME_BUCKETS:
+            condition = []
+            if lower is not None:
+                condition.append(response_time >= lower)
+            if upper is not None:
+                condition.append(response_time < upper)
+            buckets.append(func.sum(case((and_(*condition), 1), else_=0)))
+        query = select(
+            APICall.endpoint,
+            func.count(),
+            func.sum(case((APICall.status_code >= 400, 1), else_=0)),
+            func.sum(response_time),
+            *buckets,
+        ).where(APICall.created_at >= start, APICall.created_at < end)
+        if user_id is not None:
+            query = query.where(APICall.user_id == user_id)
+        return self.db.execute(query.group_by(APICall.endpoint)).all()
+
+    @staticmethod
+    def _add(stats: dict[str, dict[str, int]], rows) -> None:
+        for endpoint, *sums in rows:
+            target = stats[endpoint]
+            for field, value in zip(_SUM_FIELDS, sums):
+                target[field] += int(value or 0)
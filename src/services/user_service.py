@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 
 from src.models.user import User
 from src.schemas.user import UserCreate, UserResponse
+from src.services.auth_cache import auth_cache
 
 
 def _user_to_response(user: User) -> UserResponse:
@@ -99,6 +100,8 @@ class UserService:
             if key in allowed and hasattr(user, key):
                 setattr(user, key, value)
         self.db.commit()
+        # Cached logins carry a snapshot of the user (including is_active)
+        auth_cache.invalidate_user(user_id)
         self.db.refresh(user)
         return _user_to_response(user)
 
@@ -111,6 +114,7 @@ class UserService:
             return False
         self.db.delete(user)
         self.db.commit()
+        auth_cache.invalidate_user(user_id)
         return True
 
     async def list_users(self, skip: int = 0, limit: int = 100) -> List[UserResponse]:
@@ -0,0 +1,184 @@
+"""Tests for the database-backed job queue of the Python backend."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+# Runtime dependencies of the backend core package
+pytest.importorskip("psutil")
+pytest.importorskip("sentry_sdk")
+pytest.importorskip("structlog")
+
+from src.python.backend.core.database import Base, Job, upgrade_jobs_table
+from src.python.backend.core.job_queue import JobQueueManager
+
+CONFIG = SimpleNamespace(num_workers=2, retry_attempts=2)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Sessions on a private SQLite file shared by several managers."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'jobs.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _manager(session_factory, **kwargs):
+    kwargs.setdefault("config", CONFIG)
+    return JobQueueManager(
+        session_factory, poll_interval=0.01, flush_interval=0.01, **kwargs
+    )
+
+
+def _add_jobs(session_factory, *priorities, **values):
+    with session_factory() as session:
+        jobs = [
+            Job(user_id=1, job_type="cleanup", priority=priority, **values)
+            for priority in priorities
+        ]
+        session.add_all(jobs)
+        session.commit()
+        return [job.id for job in jobs]
+
+
+def _job(session_factory, job_id):
+    with session_factory() as session:
+        return session.get(Job, job_id)
+
+
+def test_claims_by_priority(session_factory):
+    """Test that higher priority jobs are claimed first, oldest first on ties."""
+    low, high, mid, high_later = _add_jobs(session_factory, 0, 5, 1, 5)
+    manager = _manager(session_factory)
+
+    claimed = [job["job_id"] for job in manager._claim_jobs(3)]
+    assert claimed == [high, high_later, mid]
+    assert [job["job_id"] for job in manager._claim_jobs(3)] == [low]
+    assert _job(session_factory, high).locked_by == manager.worker_id
+
+
+def test_managers_never_claim_the_same_job(session_factory):
+    """Test that concurrent claims from several managers do not overlap."""
+    job_ids = _add_jobs(session_factory, *range(60))
+    managers = [_manager(session_factory) for _ in range(4)]
+
+    def claim_all(manager):
+        claimed = []
+        while batch := manager._claim_jobs(3):
+            claimed.extend(job["job_id"] for job in batch)
+        return claimed
+
+    with ThreadPoolExecutor(len(managers)) as pool:
+        claims = list(pool.map(claim_all, managers))
+
+    flat = [job_id for claimed in claims for job_id in claimed]
+    assert sorted(flat) == sorted(job_ids)
+    for manager, claimed in zip(managers, claims):
+        for job_id in claimed:
+            assert _job(session_factory, job_id).locked_by == manager.worker_id
+
+
+def test_expired_lease_is_requeued_then_failed(session_factory):
+    """Test that jobs of a dead worker are retried until attempts run out."""
+    stale = datetime.utcnow() - timedelta(seconds=120)
+    retried, exhausted = (
+        _add_jobs(
+            session_factory,
+            0,
+            status="running",
+            attempts=attempts,
+            locked_by="dead-worker",
+            locked_at=stale,
+        )[0]
+        for attempts in (1, CONFIG.retry_attempts)
+    )
+    manager = _manager(session_factory, lease_timeout=60)
+
+    assert [job["job_id"] for job in manager._claim_jobs(5)] == [retried]
+    job = _job(session_factory, retried)
+    assert (job.status, job.attempts, job.locked_by) == (
+        "running",
+        2,
+        manager.worker_id,
+    )
+
+    job = _job(session_factory, exhausted)
+    assert (job.status, job.error) == ("failed", "Worker lease expired")
+    assert job.locked_by is None
+
+
+@pytest.mark.asyncio
+async def test_jobs_complete_through_buffered_flush(session_factory):
+    """Test that finished jobs are written by the flusher."""
+    manager = _manager(session_factory)
+    await manager.initialize()
+    job_id = await manager.enqueue_job("cleanup", {}, user_id=1)
+    for _ in range(500):
+        status = await manager.get_job_status(job_id)
+        if status["status"] == "completed":
+            break
+        await asyncio.sleep(0.01)
+    await manager.shutdown()
+
+    job = _job(session_factory, job_id)
+    assert (job.status, job.attempts, job.progress) == ("completed", 1, 1.0)
+    assert job.locked_by is None
+
+
+@pytest.mark.asyncio
+async def test_shutdown_returns_running_job_to_queue(session_factory, monkeypatch):
+    """Test that a job cut off by shutdown is pending again, attempt refunded."""
+    started = asyncio.Event()
+
+    async def slow(parameters):
+        started.set()
+        await asyncio.sleep(60)
+
+    manager = _manager(session_factory)
+    monkeypatch.setattr(manager, "_get_job_handler", lambda job_type: slow)
+    await manager.initialize()
+    job_id = await manager.enqueue_job("train_model", {"epochs": 1}, user_id=1)
+    await asyncio.wait_for(started.wait(), timeout=5)
+
+    await manager.shutdown(timeout=0.05)
+
+    job = _job(session_factory, job_id)
+    assert (job.status, job.attempts) == ("pending", 0)
+    assert (job.locked_by, job.started_at) == (None, None)
+
+
+def test_upgrade_adds_job_queue_columns(tmp_path):
+    """Test that a jobs table created before the queue columns is upgraded."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE jobs (id INTEGER PRIMARY KEY, user_id INTEGER, "
+                "job_type VARCHAR(50), status VARCHAR(20))"
+            )
+        )
+        connection.execute(text("INSERT INTO jobs VALUES (1, 1, 'cleanup', 'done')"))
+
+    assert upgrade_jobs_table(engine) == [
+        "priority",
+        "parameters",
+        "attempts",
+        "locked_by",
+        "locked_at",
+    ]
+    assert upgrade_jobs_table(engine) == []
+    indexes = {index["name"] for index in inspect(engine).get_indexes("jobs")}
+    assert "ix_jobs_status_priority" in indexes
+    with engine.connect() as connection:
+        row = connection.execute(text("SELECT priority, attempts FROM jobs")).one()
+    assert tuple(row) == (0, 0)
+    engine.dispose()
@@ -65,6 +65,16 @@ def db_engine():
         pass
 
 
+@pytest.fixture(autouse=True)
+def clear_auth_cache():
+    """Start every test without cached token validation results."""
+    from src.services.auth_cache import auth_cache
+
+    auth_cache.clear()
+    yield
+    auth_cache.clear()
+
+
 @pytest.fixture(scope="function")
 def db(db_engine):
     """Get a database session for testing."""
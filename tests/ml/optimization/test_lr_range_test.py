@@ -0,0 +1,64 @@
+"""Tests for the learning rate range test in bleu_ai adaptive learning."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("optuna")
+
+from src.bleu_ai.optimization.adaptive_learning import (
+    SCHEDULE_METHODS,
+    AdaptiveLearningRate,
+)
+
+
+@pytest.fixture
+def dataset():
+    """Linearly separable-ish binary classification data."""
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(2000, 8)).astype(np.float32)
+    noise = rng.normal(scale=0.5, size=len(features))
+    targets = (features[:, 0] - features[:, 1] + noise > 0).astype(float)
+    return features, targets
+
+
+def _finder(**kwargs):
+    return AdaptiveLearningRate(
+        n_steps=30, batch_size=128, eval_every=10, eval_size=400, **kwargs
+    )
+
+
+def test_single_sweep_matches_separate_runs(dataset):
+    """Test that sweeping all policies together equals running each alone."""
+    together = _finder().find_learning_rates(*dataset)
+    assert set(together) == set(SCHEDULE_METHODS)
+
+    for method in SCHEDULE_METHODS:
+        alone = _finder().calculate_optimal_rate(*dataset, method=method)
+        assert together[method] == pytest.approx(alone)
+
+
+def test_evaluates_held_out_subsample_every_k_steps(dataset):
+    """Test that scores are recorded only at evaluation steps."""
+    finder = _finder(min_lr=1e-4, max_lr=1e-1)
+    rates = finder.find_learning_rates(*dataset, ["cosine", "cyclic"])
+
+    steps = [(h["method"], h["step"]) for h in finder.learning_history]
+    assert steps == [(m, s) for m in ("cosine", "cyclic") for s in (10, 20, 30)]
+    assert all(0.5 < h["score"] <= 1.0 for h in finder.learning_history)
+    assert all(1e-4 <= lr <= 1e-1 for lr in rates.values())
+
+
+def test_best_rates_stay_within_bounds(dataset):
+    """Test that every policy reports a rate inside [min_lr, max_lr]."""
+    for min_lr, max_lr in ((1e-6, 1e-2), (1e-3, 1e-1)):
+        finder = _finder(min_lr=min_lr, max_lr=max_lr)
+        rates = finder.find_learning_rates(*dataset)
+        assert set(rates) == set(SCHEDULE_METHODS)
+        for method, lr in rates.items():
+            assert min_lr <= lr <= max_lr, method
+
+
+def test_rejects_unknown_policy(dataset):
+    """Test that unknown policies fail before any training."""
+    with pytest.raises(ValueError, match="Unsupported"):
+        _finder().find_learning_rates(*dataset, ["cosine", "bogus"])
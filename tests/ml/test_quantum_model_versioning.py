@@ -0,0 +1,106 @@
+"""Tests for the content-addressed quantum model version store."""
+
+import pytest
+
+pytest.importorskip("cryptography")
+pytest.importorskip("dill")
+
+from cryptography.exceptions import InvalidTag
+
+from src.ml.versioning.blob_store import BlobStore
+from src.ml.versioning.quantum_model_version import QuantumModelVersioning
+
+
+@pytest.fixture
+def store(tmp_path):
+    versioning = QuantumModelVersioning(tmp_path / "versions")
+    yield versioning
+    versioning.close()
+
+
+def _create(store, model, model_type="xgboost", **metrics):
+    return store.create_version(model, model_type, {"depth": 3}, metrics)
+
+
+def _blobs(store):
+    return [p for p in store.blobs.root.rglob("*") if p.is_file()]
+
+
+def test_round_trip_and_deduplication(store):
+    """Test that models load back and identical models share one blob."""
+    model = {"weights": list(range(1000)), "bias": 0.5}
+    first = _create(store, model, accuracy=0.9)
+    second = _create(store, dict(model), accuracy=0.8)
+
+    assert first.version_id != second.version_id
+    assert first.model_hash == second.model_hash
+    assert len(_blobs(store)) == 1
+
+    version, loaded = store.load_version(second.version_id)
+    assert loaded == model
+    assert version.metrics == {"accuracy": 0.8}
+    diff = store.compare_versions(first.version_id, second.version_id)
+    assert diff["metrics_diff"]["accuracy"] == pytest.approx(-0.1)
+
+
+def test_list_versions_filters_and_sorts_in_index(store):
+    """Test model type and metric filters, metric sorting and limits."""
+    a = _create(store, "a", accuracy=0.7, f1=0.5)
+    b = _create(store, "b", accuracy=0.9)
+    c = _create(store, "c", model_type="torch", accuracy=0.95, f1=0.9)
+
+    def ids(**kwargs):
+        return [v.version_id for v in store.list_versions(**kwargs)]
+
+    assert ids() == [c.version_id, b.version_id, a.version_id]
+    assert ids(model_type="xgboost") == [b.version_id, a.version_id]
+    assert ids(min_metric={"accuracy": 0.8}) == [c.version_id, b.version_id]
+    # Missing metrics count as zero
+    assert ids(min_metric={"f1": 0.1}) == [c.version_id, a.version_id]
+    assert ids(sort_by="accuracy", descending=False) == [
+        a.version_id,
+        b.version_id,
+        c.version_id,
+    ]
+    assert ids(sort_by="f1", limit=2) == [c.version_id, a.version_id]
+
+
+def test_reopened_store_reads_versions(tmp_path):
+    """Test that a new instance finds the index and decrypts with the key file."""
+    store = QuantumModelVersioning(tmp_path)
+    version = _create(store, [1, 2, 3], accuracy=1.0)
+    store.close()
+
+    reopened = QuantumModelVersioning(tmp_path)
+    assert reopened.load_version(version.version_id)[1] == [1, 2, 3]
+    assert reopened.list_versions()[0].version_id == version.version_id
+    reopened.close()
+
+
+def test_tampered_blob_is_rejected(store):
+    """Test that modified blobs fail authentication instead of loading."""
+    version = _create(store, {"weights": [0.1] * 100})
+    (path,) = _blobs(store)
+    data = bytearray(path.read_bytes())
+    data[-20] ^= 1
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(InvalidTag):
+        store.load_version(version.version_id)
+    with pytest.raises(KeyError):
+        store.get_version("missing")
+
+
+def test_blob_store_streams_multiple_chunks(tmp_path):
+    """Test blobs spanning several chunks, including an exact multiple."""
+    blobs = BlobStore(tmp_path, bytes(32), chunk_size=64)
+    for size in (0, 64, 200, 256):
+        data = bytes(range(256))[:size]
+
+        def write(f):
+            for i in range(0, size, 7):
+                f.write(data[i : i + 7])
+
+        digest = blobs.put(write)
+        with blobs.open(digest) as f:
+            assert f.read() == data
@@ -0,0 +1,99 @@
+"""Test the quantum circuit optimization passes."""
+
+import numpy as np
+import pytest
+
+from src.quantum_py.quantum.circuit_optimizer import (
+    CircuitOptimizer,
+    GateOp,
+    circuit_depth,
+    embed,
+    ops_from_qiskit,
+)
+
+
+def _unitary(ops, n_qubits):
+    """Full-register unitary of a list of ops."""
+    space = list(range(n_qubits))
+    total = np.eye(2**n_qubits, dtype=complex)
+    for op in ops:
+        total = embed(op.matrix, op.qubits, space) @ total
+    return total
+
+
+def _equivalent(a, b):
+    """Equal up to a global phase."""
+    index = np.unravel_index(np.argmax(np.abs(a)), a.shape)
+    phase = b[index] / a[index]
+    return np.allclose(a * phase, b)
+
+
+class TestCircuitOptimizer:
+    """Test CircuitOptimizer passes"""
+
+    def test_cancels_inverses_through_commuting_gates(self):
+        """Test that CX pairs cancel across an RZ on the control."""
+        ops = [
+            GateOp.from_name("cx", [0, 1]),
+            GateOp.from_name("rz", [0], [0.4]),
+            GateOp.from_name("cx", [0, 1]),
+        ]
+        optimized, report = CircuitOptimizer(fuse_single_qubit=False).run(ops)
+        assert [op.name for op in optimized] == ["rz"]
+        assert report.removed_by_pass["cancel_inverses"] == 2
+
+    def test_merges_rotations(self):
+        """Test that same-axis rotations merge and vanishing ones drop."""
+        ops = [
+            GateOp.from_name("rx", [1], [0.25]),
+            GateOp.from_name("rx", [1], [0.5]),
+            GateOp.from_name("ry", [0], [np.pi]),
+            GateOp.from_name("ry", [0], [-np.pi]),
+        ]
+        optimized, _ = CircuitOptimizer(fuse_single_qubit=False).run(ops)
+        assert len(optimized) == 1
+        assert np.isclose(optimized[0].params[0], 0.75)
+
+    def test_fusion_preserves_unitary(self):
+        """Test that fused circuits implement the same unitary."""
+        rng = np.random.default_rng(0)
+        names = ["h", "s", "t", "rx", "rz", "cx", "cz"]
+        ops = []
+        for _ in range(40):
+            name = names[rng.integers(len(names))]
+            if name in ("cx", "cz"):
+                ops.append(GateOp.from_name(name, rng.choice(3, 2, replace=False)))
+            elif name in ("rx", "rz"):
+                ops.append(GateOp.from_name(name, [rng.integers(3)], [rng.random()]))
+            else:
+                ops.append(GateOp.from_name(name, [rng.integers(3)]))
+
+        optimized, report = CircuitOptimizer().run(ops)
+        assert _equivalent(_unitary(ops, 3), _unitary(optimized, 3))
+        assert report.gates_after < report.gates_before
+        assert report.depth_after == circuit_depth(optimized)
+
+    def test_opaque_ops_block_optimization(self):
+        """Test that measurements are never crossed."""
+        ops = [
+            GateOp.from_name("x", [0]),
+            GateOp("measure", (0,)),
+            GateOp.from_name("x", [0]),
+        ]
+        optimized, report = CircuitOptimizer().run(ops)
+        assert [op.name for op in optimized] == ["x", "measure", "x"]
+        assert report.gates_removed == 0
+
+    def test_unbound_rotation_is_not_merged(self):
+        """Test that a symbolic rotation blocks a bound one of the same kind."""
+        qiskit = pytest.importorskip("qiskit")
+        circuit = qiskit.QuantumCircuit(1)
+        circuit.rx(qiskit.circuit.Parameter("t"), 0)
+        circuit.rx(0.1, 0)
+
+        optimized, report = CircuitOptimizer().run(ops_from_qiskit(circuit))
+        assert [(op.name, op.params) for op in optimized] == [
+            ("rx", ()),
+            ("rx", (0.1,)),
+        ]
+        assert report.gates_removed == 0
@@ -0,0 +1,39 @@
+"""Tests for batched quantum feature extraction."""
+
+import numpy as np
+import pytest
+
+from bleujs.quantum import QuantumFeatureExtractor
+
+
+def test_extract_batch_shape_and_normalization():
+    """Each row yields a probability distribution over 2**num_qubits states."""
+    extractor = QuantumFeatureExtractor(num_qubits=3)
+    data = np.random.default_rng(0).normal(size=(50, 5))
+
+    features = extractor.extract_batch(data, chunk_size=16)
+    assert features.shape == (50, 8)
+    assert np.allclose(features.sum(axis=1), 1.0)
+
+
+def test_extract_batch_cnot_ladder():
+    """|1>|0>|0> is mapped to |1>|1>|1> by the CNOT chain."""
+    extractor = QuantumFeatureExtractor(num_qubits=3)
+    # x = 2 encodes RY(pi), i.e. |1>, on qubit 0
+    features = extractor.extract_batch(np.array([[2.0, 0.0, 0.0]]))
+    assert np.isclose(features[0, 0b111], 1.0)
+
+    features = extractor.extract_batch(
+        np.array([[2.0, 0.0, 0.0]]), use_entanglement=False
+    )
+    assert np.isclose(features[0, 0b001], 1.0)
+
+
+def test_extract_batch_matches_qiskit():
+    """Batched features agree with the per-sample Qiskit circuit."""
+    pytest.importorskip("qiskit")
+    extractor = QuantumFeatureExtractor(num_qubits=4)
+    data = np.random.default_rng(1).normal(size=(5, 6))
+
+    expected = np.stack([extractor._extract_with_qiskit(row, True) for row in data])
+    assert np.allclose(extractor.extract_batch(data), expected)
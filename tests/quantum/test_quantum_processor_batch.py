@@ -0,0 +1,97 @@
+"""Test batched circuit evaluation in the bleu_ai quantum processor."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pennylane")
+torch = pytest.importorskip("torch")
+
+from src.bleu_ai.quantum.quantumProcessor import QuantumProcessor, simulate_expectations
+
+
+@pytest.mark.parametrize("n_qubits,n_features", [(4, 6), (3, 2)])
+def test_batched_kernel_matches_qnode(n_qubits, n_features):
+    """Test that the statevector kernel reproduces the per-row QNode."""
+    rng = np.random.default_rng(7)
+    data = rng.normal(size=(12, n_features))
+    data[3] = 1.5  # constant row
+    weights = rng.normal(size=(2, n_qubits, 3))
+    processor = QuantumProcessor(n_qubits=n_qubits, n_layers=2)
+    processor.initialize()
+
+    expected = []
+    for row in data:
+        normalized = np.interp(row, (row.min(), row.max()), (-np.pi, np.pi))
+        normalized = np.pad(normalized, (0, max(0, n_qubits - len(normalized))))
+        expected.append(processor.circuit(normalized[:n_qubits], weights))
+
+    enhanced = processor.enhance_input(data, weights)
+    assert enhanced.shape == (12, n_qubits)
+    np.testing.assert_allclose(enhanced, np.array(expected), atol=1e-10)
+
+
+def test_chunk_size_does_not_change_results():
+    """Test that chunked evaluation matches a single pass."""
+    rng = np.random.default_rng(3)
+    data = rng.normal(size=(25, 4))
+    weights = rng.normal(size=(2, 4, 3))
+    processor = QuantumProcessor()
+
+    np.testing.assert_allclose(
+        processor.enhance_input(data, weights, chunk_size=4),
+        processor.enhance_input(data, weights),
+        atol=1e-12,
+    )
+
+
+def test_kernel_gradients_match_qnode():
+    """Test that weight gradients agree with the torch-interfaced QNode."""
+    rng = np.random.default_rng(5)
+    angles = torch.as_tensor(rng.uniform(-np.pi, np.pi, size=(4, 3)))
+    weights = torch.tensor(rng.normal(size=(2, 3, 3)), requires_grad=True)
+    processor = QuantumProcessor(n_qubits=3, n_layers=2)
+    processor.initialize()
+
+    simulate_expectations(angles, weights).sum().backward()
+    kernel_grad, weights.grad = weights.grad.clone(), None
+    qnode = torch.stack([torch.stack(processor.circuit(a, weights)) for a in angles])
+    qnode.sum().backward()
+
+    np.testing.assert_allclose(kernel_grad, weights.grad, atol=1e-10)
+
+
+def test_optimize_weights_fits_target():
+    """Test that mini-batch training reduces the loss toward a known target."""
+    rng = np.random.default_rng(11)
+    data = rng.normal(size=(300, 4))
+    processor = QuantumProcessor()
+    target = processor.enhance_input(data, rng.normal(size=(2, 4, 3)))
+    initial = processor.rng.bit_generator.state
+
+    weights = processor.optimize_weights(
+        data, target, n_steps=150, batch_size=32, learning_rate=0.05
+    )
+
+    processor.rng.bit_generator.state = initial
+    start = processor.rng.standard_normal((2, 4, 3))
+    before = np.mean((processor.enhance_input(data, start) - target) ** 2)
+    after = np.mean((processor.enhance_input(data, weights) - target) ** 2)
+    assert after < before / 4
+
+
+def test_optimize_weights_stops_early(monkeypatch):
+    """Test that training stops once the loss stops improving."""
+    processor = QuantumProcessor()
+    data = np.random.default_rng(2).normal(size=(20, 4))
+    steps = []
+    original = processor._expectations
+
+    def counting(angles, weights):
+        steps.append(len(angles))
+        return original(angles, weights)
+
+    monkeypatch.setattr(processor, "_expectations", counting)
+    processor.optimize_weights(
+        data, np.zeros((20, 4)), n_steps=100, batch_size=8, patience=3, min_delta=10
+    )
+    assert steps == [8] * 4
@@ -0,0 +1,79 @@
+"""Test the dependency-free quantum simulator."""
+
+import numpy as np
+import pytest
+
+from src.quantum.core.quantum_circuit import (
+    QuantumCircuit,
+    QuantumSimulator,
+    QuantumState,
+)
+
+
+class TestQuantumState:
+    """Test QuantumState gate application"""
+
+    def test_hadamard_superposition(self):
+        """Test that H puts a qubit into equal superposition."""
+        state = QuantumState(2)
+        state.apply_gate(("h", 1))
+        assert np.allclose(state.get_probabilities(), [0.5, 0, 0.5, 0])
+
+    @pytest.mark.parametrize("control,target", [(0, 2), (2, 0)])
+    def test_cnot_flips_target(self, control, target):
+        """Test CNOT in both qubit orders."""
+        state = QuantumState(3)
+        state.apply_gate(("x", control))
+        state.apply_gate(("cx", control, target))
+        expected = (1 << control) | (1 << target)
+        assert np.isclose(state.get_probabilities()[expected], 1.0)
+
+    def test_measure_collapses(self):
+        """Test that measurement collapses a Bell pair consistently."""
+        state = QuantumState(2, rng=np.random.default_rng(3))
+        state.apply_gate(("h", 0))
+        state.apply_gate(("cx", 0, 1))
+        assert state.measure(0) == state.measure(1)
+
+    def test_unsupported_gate(self):
+        """Test that unknown gates are rejected."""
+        with pytest.raises(ValueError):
+            QuantumState(1).apply_gate(("swap", 0))
+
+
+class TestQuantumSimulator:
+    """Test QuantumSimulator execution"""
+
+    def test_run_ghz_counts(self):
+        """Test that a GHZ circuit only yields all-zeros or all-ones."""
+        circuit = QuantumCircuit(5).h(0)
+        for qubit in range(4):
+            circuit.cx(qubit, qubit + 1)
+
+        counts = QuantumSimulator(seed=0).run(circuit, shots=1000)
+        assert set(counts) == {"00000", "11111"}
+        assert sum(counts.values()) == 1000
+
+    def test_run_with_measurements(self):
+        """Test that declared measurements select the reported bits."""
+        circuit = QuantumCircuit(3).x(2)
+        circuit.measure(2, 0)
+        counts = QuantumSimulator(seed=0).run(circuit, shots=10)
+        assert counts == {"1": 10}
+
+    def test_probabilities_cached_by_structure(self):
+        """Test that identical circuits reuse cached probabilities."""
+        simulator = QuantumSimulator(seed=0)
+        first = simulator.probabilities(QuantumCircuit(2).h(0))
+        second = simulator.probabilities(QuantumCircuit(2).h(0))
+        assert first is second
+
+    def test_cached_probabilities_are_read_only(self):
+        """Test that callers cannot corrupt cached probabilities."""
+        simulator = QuantumSimulator(seed=0)
+        probs = simulator.probabilities(QuantumCircuit(1).h(0))
+        with pytest.raises(ValueError):
+            probs[0] = 1.0
+        np.testing.assert_allclose(
+            simulator.probabilities(QuantumCircuit(1).h(0)), [0.5, 0.5]
+        )
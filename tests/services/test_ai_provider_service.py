@@ -0,0 +1,243 @@
+"""Test AI provider failover, pooled sessions, circuit breakers and hedging."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.services import ai_provider_service
+from src.services.ai_provider_service import (
+    HedgeBudget,
+    ProviderCircuitBreaker,
+    get_chat_completion,
+    stream_chat_completion,
+)
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+@pytest.fixture(autouse=True)
+async def reset_providers():
+    """Start every test with closed circuits and no pooled sessions."""
+    for breaker in ai_provider_service._breakers.values():
+        breaker.reset()
+    yield
+    await ai_provider_service.close_provider_sessions()
+
+
+@pytest.fixture
+async def backend(monkeypatch):
+    """Local BleuJS backend whose behavior tests can switch."""
+    calls = []
+    behavior = {"status": 200}
+
+    async def chat(request):
+        calls.append(request.remote)
+        if behavior["status"] != 200:
+            return web.Response(status=behavior["status"])
+        if (await request.json()).get("stream"):
+            response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+            await response.prepare(request)
+            for token in ("from ", "backend"):
+                chunk = {"choices": [{"delta": {"content": token}}]}
+                await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            await response.write(b"data: [DONE]\n\n")
+            return response
+        return web.json_response({"content": "from backend"})
+
+    app = web.Application()
+    app.router.add_post("/api/v1/chat", chat)
+    server = TestServer(app)
+    await server.start_server()
+
+    settings = SimpleNamespace(BLEUJS_BACKEND_URL=str(server.make_url("")))
+    monkeypatch.setattr(ai_provider_service, "get_settings", lambda: settings)
+    yield SimpleNamespace(calls=calls, behavior=behavior)
+    await server.close()
+
+
+def test_breaker_opens_on_consecutive_failures():
+    """Test that the circuit opens and then lets a single probe through."""
+    breaker = ProviderCircuitBreaker("test", failure_threshold=3, recovery_timeout=0)
+    for _ in range(3):
+        assert breaker.allow_request()
+        breaker.record_failure(0.1)
+    assert breaker.state == "OPEN"
+
+    # Recovery timeout elapsed: exactly one probe at a time
+    assert breaker.allow_request()
+    assert breaker.state == "HALF_OPEN"
+    assert not breaker.allow_request()
+
+    breaker.record_success(0.1)
+    assert breaker.state == "CLOSED"
+    assert breaker.latency_quantile(0.95) == pytest.approx(0.1)
+
+
+def test_breaker_counts_slow_calls_as_errors():
+    """Test that latency above the slow-call limit degrades health."""
+    breaker = ProviderCircuitBreaker(
+        "test", slow_call_seconds=1.0, error_rate_threshold=0.3, min_samples=2
+    )
+    breaker.record_success(5.0)
+    assert breaker.state == "CLOSED"
+    breaker.record_success(5.0)
+    assert breaker.state == "OPEN"
+    assert breaker.snapshot()["latency_ewma"] == pytest.approx(5.0)
+
+
+@pytest.mark.asyncio
+async def test_session_is_reused(backend):
+    """Test that repeated calls share one pooled session."""
+    for _ in range(3):
+        content, provider = await get_chat_completion(MESSAGES)
+        assert (content, provider) == ("from backend", "bleujs")
+
+    assert list(ai_provider_service._sessions) == ["bleujs"]
+    assert len(backend.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_skips_provider(backend):
+    """Test that a failing provider stops being called once its circuit opens."""
+    backend.behavior["status"] = 503
+    threshold = ai_provider_service._breakers["bleujs"].failure_threshold
+    for _ in range(threshold + 3):
+        _, provider = await get_chat_completion(MESSAGES)
+        assert provider == "in_process"
+
+    assert len(backend.calls) == threshold
+    assert ai_provider_service.get_provider_health()["bleujs"]["state"] == "OPEN"
+
+
+@pytest.mark.asyncio
+async def test_hedge_takes_first_answer(monkeypatch):
+    """Test that a slow primary is raced against the next provider."""
+    cancelled = []
+
+    async def slow_primary(*args):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("bleujs")
+            raise
+
+    async def fast_secondary(*args):
+        return "from openai"
+
+    monkeypatch.setitem(ai_provider_service._PROVIDERS, "bleujs", slow_primary)
+    monkeypatch.setitem(ai_provider_service._PROVIDERS, "openai", fast_secondary)
+    monkeypatch.setattr(ai_provider_service, "_hedge_budget", HedgeBudget())
+
+    result = await get_chat_completion(MESSAGES, hedge=True, hedge_delay=0.01)
+    assert result == ("from openai", "openai")
+    assert cancelled == ["bleujs"]
+
+
+@pytest.mark.asyncio
+async def test_hedge_budget_limits_extra_calls(monkeypatch):
+    """Test that an exhausted budget falls back to waiting on the primary."""
+    started = []
+
+    async def primary(*args):
+        started.append("bleujs")
+        await asyncio.sleep(0.05)
+        return "from backend"
+
+    async def secondary(*args):
+        started.append("openai")
+        return "from openai"
+
+    monkeypatch.setitem(ai_provider_service._PROVIDERS, "bleujs", primary)
+    monkeypatch.setitem(ai_provider_service._PROVIDERS, "openai", secondary)
+    monkeypatch.setattr(ai_provider_service, "_hedge_budget", HedgeBudget(burst=0))
+
+    result = await get_chat_completion(MESSAGES, hedge=True, hedge_delay=0.01)
+    assert result == ("from backend", "bleujs")
+    assert started == ["bleujs"]
+
+
+@pytest.mark.asyncio
+async def test_hedge_fails_over_on_error(monkeypatch):
+    """Test that a failed call is replaced without waiting for the delay."""
+
+    async def failing(*args):
+        return None
+
+    async def secondary(*args):
+        return "from openai"
+
+    monkeypatch.setitem(ai_provider_service._PROVIDERS, "bleujs", failing)
+    monkeypatch.setitem(ai_provider_service._PROVIDERS, "openai", secondary)
+
+    result = await get_chat_completion(MESSAGES, hedge=True, hedge_delay=60)
+    assert result == ("from openai", "openai")
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_provider_deltas(backend):
+    """Test that provider SSE deltas are passed through as they arrive."""
+    chunks = [item async for item in stream_chat_completion(MESSAGES)]
+    assert chunks == [("from ", "bleujs"), ("backend", "bleujs")]
+
+
+@pytest.mark.asyncio
+async def test_stream_fails_over_before_first_delta(backend):
+    """Test that a provider failing before any output falls back."""
+    backend.behavior["status"] = 500
+    chunks = [item async for item in stream_chat_completion(MESSAGES)]
+    assert len(chunks) == 1
+    assert chunks[0][1] == "in_process"
+
+
+@pytest.mark.asyncio
+async def test_stream_closed_early_settles_probe(backend, monkeypatch):
+    """Test that a HALF_OPEN probe is settled when the consumer stops early."""
+    breaker = ai_provider_service._breakers["bleujs"]
+    monkeypatch.setattr(breaker, "recovery_timeout", 0)
+    breaker.state, breaker.opened_at = "OPEN", 0.0
+
+    stream = stream_chat_completion(MESSAGES)
+    assert await stream.__anext__() == ("from ", "bleujs")
+    await stream.aclose()
+
+    assert breaker.state == "CLOSED"
+    assert breaker.allow_request()
+
+
+@pytest.mark.asyncio
+async def test_chat_route_streams_events(backend):
+    """Test that /chat with stream=true returns completion chunk events."""
+    from fastapi import FastAPI
+    from httpx import ASGITransport, AsyncClient
+
+    from src.database import get_db
+    from src.routes import ai_models
+    from src.services.auth_service import get_current_user_dep
+
+    app = FastAPI()
+    app.include_router(ai_models.router)
+    app.dependency_overrides[get_current_user_dep] = lambda: SimpleNamespace(id=1)
+    app.dependency_overrides[get_db] = lambda: None
+
+    payload = {"messages": MESSAGES, "stream": True}
+    async with AsyncClient(transport=ASGITransport(app), base_url="http://t") as c:
+        response = await c.post("/api/v1/chat", json=payload)
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [
+        line[len("data: ") :]
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    assert events[-1] == "[DONE]"
+    chunks = [json.loads(event) for event in events[:-1]]
+    assert [c["choices"][0]["delta"].get("content") for c in chunks] == [
+        "from ",
+        "backend",
+        None,
+    ]
+    assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
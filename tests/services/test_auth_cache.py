@@ -0,0 +1,171 @@
+"""Test the token validation cache."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import jwt
+import pytest
+from sqlalchemy import event
+
+from src.models.subscription import APIToken, APITokenCreate
+from src.schemas.user import UserResponse
+from src.services import auth_cache as auth_cache_module
+from src.services.api_token_service import APITokenService
+from src.services.auth_cache import AuthCache, AuthEntry, AuthStatus, authenticate_jwt
+from src.services.user_service import UserService
+
+SECRET = "test-secret-key-at-least-32-characters-long"
+
+
+def _token(sub="user-1", minutes=15):
+    exp = datetime.now(timezone.utc) + timedelta(minutes=minutes)
+    return jwt.encode({"sub": sub, "exp": exp}, SECRET, algorithm="HS256")
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    """Count JWT signature checks made by the auth cache."""
+    calls = []
+    real_decode = jwt.decode
+
+    def counting(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth_cache_module.jwt, "decode", counting)
+    return calls
+
+
+def test_negative_entries_use_short_ttl():
+    """Test that invalid tokens expire sooner than valid ones."""
+    cache = AuthCache(ttl=60, negative_ttl=0)
+    cache.set("bad", AuthEntry(AuthStatus.INVALID))
+    cache.set("good", AuthEntry(AuthStatus.ACTIVE, user_id="u"))
+    assert cache.get("bad") is None
+    assert cache.get("good").is_active
+
+
+def test_entry_never_outlives_token_expiry():
+    """Test that an already-expired token is not cached."""
+    cache = AuthCache()
+    cache.set("key", AuthEntry(AuthStatus.ACTIVE, user_id="u"), expires_at=0)
+    assert cache.get("key") is None
+
+
+def test_lru_bound_and_user_invalidation():
+    """Test eviction at capacity and invalidation by user id."""
+    cache = AuthCache(max_entries=2)
+    cache.set("a", AuthEntry(AuthStatus.ACTIVE, user_id="u1"))
+    cache.set("b", AuthEntry(AuthStatus.ACTIVE, user_id="u2"))
+    cache.set("c", AuthEntry(AuthStatus.ACTIVE, user_id="u2"))
+    assert cache.get("a") is None
+    cache.invalidate_user("u2")
+    assert len(cache) == 0
+
+
+def test_invalid_jwt_is_negatively_cached(decode_calls):
+    """Test that repeated bad tokens skip decoding and user lookups."""
+    loads = []
+    for _ in range(3):
+        entry, user = authenticate_jwt("not-a-jwt", SECRET, ["HS256"], loads.append)
+        assert entry.status is AuthStatus.INVALID
+        assert user is None
+    assert len(decode_calls) == 1
+    assert loads == []
+
+
+def test_valid_jwt_skips_signature_check(decode_calls):
+    """Test that a cached token is resolved by user id only."""
+    token = _token()
+    user = SimpleNamespace(id="user-1", is_active=True, subscription=None)
+
+    for _ in range(3):
+        entry, resolved = authenticate_jwt(token, SECRET, ["HS256"], lambda _: user)
+        assert resolved is user
+        assert entry.is_active
+    assert len(decode_calls) == 1
+
+    # Deactivation is picked up on the next request
+    user.is_active = False
+    entry, _ = authenticate_jwt(token, SECRET, ["HS256"], lambda _: user)
+    assert entry.status is AuthStatus.INACTIVE
+
+
+def test_cached_jwt_is_bound_to_verification_key():
+    """Test that a token cached under one key is not accepted with another."""
+    token = _token()
+    user = SimpleNamespace(id="user-1", is_active=True, subscription=None)
+    authenticate_jwt(token, SECRET, ["HS256"], lambda _: user)
+
+    other = "another-secret-key-at-least-32-characters"
+    entry, resolved = authenticate_jwt(token, other, ["HS256"], lambda _: user)
+    assert entry.status is AuthStatus.INVALID
+    assert resolved is None
+
+
+def _user_response(user) -> UserResponse:
+    return UserResponse.model_validate(user.to_response_dict())
+
+
+@pytest.mark.asyncio
+async def test_validate_token_is_cached(db_session, test_user, test_subscription):
+    """Test that a validated API token is answered from cache with its tier."""
+    service = APITokenService(db_session)
+    created = await service.create_token(
+        _user_response(test_user), APITokenCreate(name="Cached")
+    )
+    assert await service.validate_token(created.token)
+
+    # Remove the row behind the cache's back: the cached result still applies
+    db_session.query(APIToken).filter(APIToken.id == created.id).delete()
+    db_session.commit()
+    entry = service.resolve_token(created.token)
+    assert entry.is_active
+    assert entry.user_id == test_user.id
+    assert entry.tier == "premium"
+
+
+@pytest.mark.asyncio
+async def test_revoke_and_rotate_invalidate(db_session, test_user, test_subscription):
+    """Test that revoking or rotating a token takes effect immediately."""
+    service = APITokenService(db_session)
+    user = _user_response(test_user)
+    revoked = await service.create_token(user, APITokenCreate(name="Revoke"))
+    rotated = await service.create_token(user, APITokenCreate(name="Rotate"))
+    assert await service.validate_token(revoked.token)
+    assert await service.validate_token(rotated.token)
+
+    await service.revoke_token(revoked.id, user)
+    await service.rotate_token(rotated.id, user)
+
+    assert not await service.validate_token(revoked.token)
+    assert not await service.validate_token(rotated.token)
+
+
+@pytest.mark.asyncio
+async def test_cached_jwt_user_needs_no_query(db_session, test_user):
+    """Test that a cached login attaches the user without SQL until deactivated."""
+    token = _token(sub=test_user.id)
+    users = UserService(db_session)
+    statements = []
+    event.listen(
+        db_session.bind, "before_cursor_execute", lambda *a: statements.append(a[2])
+    )
+
+    authenticate_jwt(token, SECRET, ["HS256"], users.get_user, session=db_session)
+    db_session.expunge_all()
+    statements.clear()
+    entry, user = authenticate_jwt(
+        token, SECRET, ["HS256"], users.get_user, session=db_session
+    )
+    assert entry.is_active
+    assert (user.id, user.email) == (test_user.id, "test@example.com")
+    assert user in db_session
+    assert statements == []
+
+    await users.update_user(test_user.id, {"is_active": False})
+    entry, user = authenticate_jwt(
+        token, SECRET, ["HS256"], users.get_user, session=db_session
+    )
+    assert entry.status is AuthStatus.INACTIVE
+    assert not user.is_active
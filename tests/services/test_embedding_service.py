@@ -0,0 +1,129 @@
+"""Test the batched embedding engine and its caches."""
+
+import base64
+import io
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.services import embedding_service
+from src.services.embedding_service import (
+    EMBEDDING_DIM,
+    EmbeddingService,
+    LRUEmbeddingCache,
+    compute_embeddings,
+    encode_base64,
+    encode_npy,
+    text_key,
+)
+
+TEXTS = ["hello world", "quantum", "hello world"]
+
+
+def test_compute_embeddings_is_deterministic_unit_norm():
+    """Test that a text maps to the same float32 unit vector in any batch."""
+    batch = compute_embeddings(["a", "b", "c"])
+    assert batch.shape == (3, EMBEDDING_DIM)
+    assert batch.dtype == np.float32
+    np.testing.assert_allclose(np.linalg.norm(batch, axis=1), 1.0, rtol=1e-5)
+    np.testing.assert_array_equal(compute_embeddings(["b"])[0], batch[1])
+    assert not np.allclose(batch[0], batch[2])
+
+
+def test_encodings_round_trip():
+    """Test that base64 and npy encodings decode to the same matrix."""
+    matrix = compute_embeddings(["a", "b"])
+
+    decoded = [
+        np.frombuffer(base64.b64decode(s), dtype="<f4") for s in encode_base64(matrix)
+    ]
+    np.testing.assert_array_equal(np.stack(decoded), matrix)
+    np.testing.assert_array_equal(np.load(io.BytesIO(encode_npy(matrix))), matrix)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test that reading a key protects it from eviction."""
+    cache = LRUEmbeddingCache(max_entries=2)
+    cache.set_many({"a": np.zeros(2), "b": np.ones(2)})
+    cache.get_many(["a"])
+    cache.set_many({"c": np.ones(2)})
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+
+@pytest.mark.asyncio
+async def test_embed_computes_each_text_once(monkeypatch):
+    """Test that duplicates and cached texts skip the computation."""
+    batches = []
+
+    def counting(texts, dim):
+        batches.append(list(texts))
+        return compute_embeddings(texts, dim)
+
+    monkeypatch.setattr(embedding_service, "compute_embeddings", counting)
+    service = EmbeddingService()
+
+    first = await service.embed(TEXTS, "bleu-embed-1")
+    np.testing.assert_array_equal(first[0], first[2])
+    assert batches == [["hello world", "quantum"]]
+
+    second = await service.embed(["quantum", "new"], "bleu-embed-1")
+    np.testing.assert_array_equal(second[0], first[1])
+    assert batches[-1] == ["new"]
+
+    # Model is part of the cache key
+    await service.embed(["quantum"], "other-model")
+    assert batches[-1] == ["quantum"]
+
+
+@pytest.mark.asyncio
+async def test_embed_shares_vectors_through_redis(monkeypatch):
+    """Test that a second worker reads vectors cached by the first."""
+    fakeredis = pytest.importorskip("fakeredis")
+    redis = fakeredis.FakeAsyncRedis()
+
+    writer = EmbeddingService(redis=redis)
+    expected = await writer.embed(TEXTS, "bleu-embed-1")
+    assert await redis.exists(text_key("bleu-embed-1", "quantum"))
+
+    reader = EmbeddingService(redis=redis)
+    monkeypatch.setattr(embedding_service, "compute_embeddings", None)
+    actual = await reader.embed(TEXTS, "bleu-embed-1")
+    np.testing.assert_array_equal(actual, expected)
+
+
+@pytest.mark.asyncio
+async def test_embed_route_encodings(monkeypatch):
+    """Test that /embed returns float, base64 and npy payloads."""
+    from fastapi import FastAPI
+    from httpx import ASGITransport, AsyncClient
+
+    from src.database import get_db
+    from src.routes import ai_models
+    from src.services.auth_service import get_current_user_dep
+
+    monkeypatch.setattr(embedding_service, "_embedding_service", EmbeddingService())
+    app = FastAPI()
+    app.include_router(ai_models.router)
+    app.dependency_overrides[get_current_user_dep] = lambda: SimpleNamespace(id=1)
+    app.dependency_overrides[get_db] = lambda: None
+    expected = compute_embeddings(["a b", "c"])
+
+    async with AsyncClient(transport=ASGITransport(app), base_url="http://t") as c:
+        url = "/api/v1/embed"
+        floats = (await c.post(url, json={"inputs": ["a b", "c"]})).json()
+        b64 = (
+            await c.post(
+                url, json={"inputs": ["a b", "c"], "encoding_format": "base64"}
+            )
+        ).json()
+        npy = await c.post(url, json={"inputs": ["a b", "c"], "encoding_format": "npy"})
+
+    np.testing.assert_array_equal(
+        np.array(floats["embeddings"], dtype=np.float32), expected
+    )
+    assert floats["usage"] == {"prompt_tokens": 3, "total_tokens": 3}
+    assert b64["embeddings"] == encode_base64(expected)
+    assert npy.headers["content-type"] == "application/x-npy"
+    assert npy.headers["x-usage-total-tokens"] == "3"
+    np.testing.assert_array_equal(np.load(io.BytesIO(npy.content)), expected)
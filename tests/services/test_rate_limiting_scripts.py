@@ -0,0 +1,177 @@
+"""Test the Lua-script and process-local rate limiters."""
+
+import pytest
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+from src.middleware.rate_limiter import RateLimiterMiddleware
+from src.services.rate_limiting import (
+    LocalRateLimiter,
+    RateLimitAlgorithm,
+    RateLimitingService,
+)
+
+
+@pytest.fixture
+def redis():
+    """Fake Redis server with Lua scripting."""
+    return fakeredis.FakeAsyncRedis()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("algorithm", list(RateLimitAlgorithm))
+async def test_acquire_enforces_limit(redis, algorithm):
+    """Test that each algorithm admits exactly the limit, then rejects."""
+    service = RateLimitingService(redis, algorithm=algorithm)
+
+    results = [await service.acquire("client", 3, 60) for _ in range(4)]
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert [r.remaining for r in results[:3]] == [2, 1, 0]
+
+    rejected = results[-1]
+    assert 0 < rejected.retry_after <= 60
+    assert rejected.headers["Retry-After"] == str(rejected.retry_after)
+
+
+@pytest.mark.asyncio
+async def test_gcra_spaces_requests(redis):
+    """Test that GCRA frees one slot per emission interval."""
+    service = RateLimitingService(redis, algorithm="gcra")
+    for _ in range(10):
+        await service.acquire("client", 10, 60)
+
+    rejected = await service.acquire("client", 10, 60)
+    assert not rejected.allowed
+    assert rejected.retry_after == 6  # 60s / 10 requests
+
+
+@pytest.mark.asyncio
+async def test_acquire_is_single_round_trip(redis):
+    """Test that a decision does not issue plain Redis commands."""
+    service = RateLimitingService(redis, algorithm="sliding_log")
+    redis.get = redis.incr = redis.ttl = None  # any direct call would fail
+
+    result = await service.acquire("client", 5, 60, cost=2)
+    assert result.allowed
+    assert result.remaining == 3
+
+    await service.clear_rate_limit("client", 60)
+
+
+def test_middleware_uses_script_result(redis):
+    """Test that the middleware rejects and sets headers from one decision."""
+    app = FastAPI()
+
+    @app.get("/")
+    async def root():
+        return {"message": "Hello World"}
+
+    app.add_middleware(
+        RateLimiterMiddleware,
+        rate_limiter=RateLimitingService(redis),
+        max_requests=2,
+        window_seconds=60,
+    )
+    client = TestClient(app)
+
+    first = client.get("/")
+    assert first.status_code == 200
+    assert first.headers["X-RateLimit-Remaining"] == "1"
+    assert client.get("/").status_code == 200
+
+    response = client.get("/")
+    assert response.status_code == 429
+    assert response.headers["X-RateLimit-Remaining"] == "0"
+    assert "Retry-After" in response.headers
+
+
+def test_middleware_local_mode(redis):
+    """Test that the middleware can admit from process-local buckets."""
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    app.add_middleware(
+        RateLimiterMiddleware,
+        rate_limiter=RateLimitingService(redis),
+        max_requests=2,
+        window_seconds=60,
+        mode="local",
+    )
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
+        assert client.get("/health").status_code == 200
+        assert client.get("/health").status_code == 429
+
+
+def test_middleware_local_mode_flushes_on_shutdown():
+    """Test that counts admitted since the last flush reach Redis on shutdown."""
+    server = fakeredis.FakeServer()
+    service = RateLimitingService(fakeredis.FakeAsyncRedis(server=server))
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    app.add_middleware(
+        RateLimiterMiddleware,
+        rate_limiter=service,
+        max_requests=5,
+        window_seconds=60,
+        mode="local",
+        local_options={"flush_interval": 3600},
+    )
+    window_key = service._get_window_key("testclient:/health", 60)
+    with TestClient(app) as client:
+        for _ in range(3):
+            assert client.get("/health").status_code == 200
+        assert fakeredis.FakeRedis(server=server).get(window_key) is None
+
+    assert fakeredis.FakeRedis(server=server).get(window_key) == b"3"
+
+
+@pytest.mark.asyncio
+async def test_local_limiter_admits_without_redis(redis):
+    """Test that local buckets decide in memory and flush counts in one batch."""
+    service = RateLimitingService(redis)
+    limiter = LocalRateLimiter(service, flush_interval=60)
+    redis.get = redis.incr = redis.ttl = None  # any direct call would fail
+
+    results = [await limiter.acquire("client", 3, 60) for _ in range(4)]
+    assert [r.allowed for r in results] == [True, True, True, False]
+
+    await limiter.close()
+    window_key = service._get_window_key("client", 60)
+    assert int(await type(redis).get(redis, window_key)) == 3
+
+
+@pytest.mark.asyncio
+async def test_local_limiter_clamps_to_global_quota(redis):
+    """Test that a flush applies usage recorded by other processes."""
+    service = RateLimitingService(redis)
+    limiter = LocalRateLimiter(service, flush_interval=60, max_unsynced=1)
+    await redis.set(service._get_window_key("client", 60), 9)
+
+    assert (await limiter.acquire("client", 10, 60)).allowed
+    # The unsynced bound forces a flush, which sees the quota is spent
+    assert not (await limiter.acquire("client", 10, 60)).allowed
+    await limiter.close()
+
+
+@pytest.mark.asyncio
+async def test_local_limiter_flushes_evicted_buckets(redis):
+    """Test that LRU eviction does not lose consumed counts."""
+    service = RateLimitingService(redis)
+    limiter = LocalRateLimiter(service, max_keys=1, flush_interval=60)
+    await limiter.acquire("first", 5, 60)
+    await limiter.acquire("second", 5, 60)
+
+    await limiter.close()
+    assert int(await redis.get(service._get_window_key("first", 60))) == 1
+    assert int(await redis.get(service._get_window_key("second", 60))) == 1
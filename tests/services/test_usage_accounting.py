@@ -0,0 +1,235 @@
+"""Test counter-based usage accounting and its write-behind flush."""
+
+import asyncio
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.models.api_call import APICall, APIUsage
+from src.models.declarative_base import Base
+from src.services import usage_accounting
+from src.services.api_service import APIService
+from src.services.usage_accounting import UsageAccountant
+
+
+@pytest.fixture
+def session_factory():
+    """Sessions on a private in-memory database, counting how many are opened."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    opened = []
+
+    def open_session():
+        opened.append(1)
+        return factory()
+
+    open_session.opened = opened
+    open_session.factory = factory
+    yield open_session
+    engine.dispose()
+
+
+PERIOD_START = datetime(2026, 3, 1)
+NEXT_PERIOD_START = datetime(2026, 4, 1)
+
+
+def _user(rate_limit=100, api_calls_limit=1000):
+    subscription = SimpleNamespace(
+        rate_limit=rate_limit,
+        api_calls_limit=api_calls_limit,
+        plan_type="basic",
+        current_period_start=PERIOD_START,
+        current_period_end=NEXT_PERIOD_START,
+    )
+    return SimpleNamespace(id="user-1", subscription=subscription)
+
+
+@pytest.mark.asyncio
+async def test_request_path_only_touches_counters(session_factory):
+    """Test that calls are counted in memory and written in one flush."""
+    usage = UsageAccountant(session_factory, flush_interval=60)
+    for status in (200, 200, 500):
+        await usage.record_call("user-1", "/api/v1/chat", 0.25, status)
+
+    assert session_factory.opened == []
+    assert await usage.calls_in_window("user-1") == 3
+    assert usage.period_usage("user-1", lambda: 10) == 13
+
+    assert await usage.flush() == 3
+    assert len(session_factory.opened) == 1
+    with session_factory.factory() as session:
+        calls = session.query(APICall).all()
+        assert [c.status_code for c in calls] == [200, 200, 500]
+        assert calls[0].response_time == 250
+        assert session.query(APIUsage.calls_count).scalar() == 3
+
+    # Totals are refreshed from the database after a flush
+    assert usage.period_usage("user-1", lambda: 0) == 3
+    await usage.close()
+
+
+@pytest.mark.asyncio
+async def test_flush_adds_to_existing_usage(session_factory):
+    """Test that increments are added in SQL to the persisted count."""
+    with session_factory.factory() as session:
+        session.add(APIUsage(user_id="user-1", calls_count=40))
+        session.commit()
+
+    usage = UsageAccountant(session_factory, flush_interval=60)
+    await usage.record_call("user-1", "/api/v1/embed", 0.1, 200)
+    await usage.record_call("user-1", "/api/v1/embed", 0.1, 200)
+    await usage.close()
+
+    with session_factory.factory() as session:
+        assert session.query(APIUsage.calls_count).scalar() == 42
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_triggers_background_flush(session_factory):
+    """Test that reaching max_buffer flushes without waiting for the interval."""
+    usage = UsageAccountant(session_factory, flush_interval=60, max_buffer=2)
+    await usage.record_call("user-1", "/a", 0.1, 200)
+    await usage.record_call("user-1", "/a", 0.1, 200)
+    await asyncio.wait_for(usage._early_flush, timeout=5)
+
+    with session_factory.factory() as session:
+        assert session.query(APICall).count() == 2
+    await usage.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_buffer(session_factory):
+    """Test that a database error leaves calls and counts for the next flush."""
+    failures = [RuntimeError("database unavailable")]
+
+    def flaky():
+        if failures:
+            raise failures.pop()
+        return session_factory()
+
+    usage = UsageAccountant(flaky, flush_interval=60)
+    await usage.record_call("user-1", "/a", 0.1, 200)
+
+    assert await usage.flush() == 0
+    assert usage.period_usage("user-1", lambda: 0) == 1
+    assert await usage.flush() == 1
+    await usage.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_drops_oldest_backlog(session_factory):
+    """Test that restored rows beyond max_backlog are dropped oldest first."""
+    entered, release = threading.Event(), threading.Event()
+
+    def failing():
+        entered.set()
+        release.wait(5)
+        raise RuntimeError("database unavailable")
+
+    usage = UsageAccountant(failing, flush_interval=60, max_buffer=3, max_backlog=3)
+    for endpoint in ("/1", "/2"):
+        await usage.record_call("user-1", endpoint, 0.1, 200)
+    flush = asyncio.create_task(usage.flush())
+    await asyncio.to_thread(entered.wait, 5)
+    # Recorded while the failing flush is in progress
+    for endpoint in ("/3", "/4"):
+        await usage.record_call("user-1", endpoint, 0.1, 200)
+    release.set()
+
+    assert await flush == 0
+    assert [call["endpoint"] for call in usage._calls] == ["/2", "/3", "/4"]
+    assert usage.period_usage("user-1", lambda: 0) == 4
+    usage._session_factory = session_factory
+    await usage.close()
+
+
+def test_app_shutdown_closes_usage_accountant(monkeypatch):
+    """Test that the product app flushes buffered usage when it shuts down."""
+    from fastapi.testclient import TestClient
+
+    from src.main import app
+
+    closed = []
+
+    class Accountant:
+        async def close(self):
+            closed.append(True)
+
+    monkeypatch.setattr(usage_accounting, "_usage_accountant", Accountant())
+    with TestClient(app):
+        assert closed == []
+    assert closed == [True]
+
+
+@pytest.mark.asyncio
+async def test_rate_window_shared_through_redis():
+    """Test that workers sharing Redis see each other's calls."""
+    fakeredis = pytest.importorskip("fakeredis")
+    redis = fakeredis.FakeAsyncRedis()
+    first = UsageAccountant(lambda: None, redis=redis, flush_interval=60)
+    second = UsageAccountant(lambda: None, redis=redis, flush_interval=60)
+
+    await first.record_call("user-1", "/a", 0.1, 200)
+    await second.record_call("user-1", "/a", 0.1, 200)
+    assert await first.calls_in_window("user-1") == 2
+    for usage in (first, second):
+        usage._flush_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_api_service_limits_use_counters(session_factory):
+    """Test that APIService rate and usage checks read the counters."""
+    usage = UsageAccountant(session_factory, flush_interval=60)
+    service = APIService(session_factory.factory(), usage=usage)
+    user = _user(rate_limit=2, api_calls_limit=3)
+
+    assert await service.check_rate_limit(user)
+    await service.track_api_call(user, "/api/v1/chat", 0.05, 200)
+    await service.track_api_call(user, "/api/v1/chat", 0.05, 200)
+    assert not await service.check_rate_limit(user)
+    assert await service.check_usage_limit(user)
+
+    await service.track_api_call(user, "/api/v1/chat", 0.05, 200)
+    assert not await service.check_usage_limit(user)
+    await usage.close()
+
+
+@pytest.mark.asyncio
+async def test_usage_restarts_when_period_rolls_over(session_factory):
+    """Test that a new billing period starts from zero on the same row."""
+    with session_factory.factory() as session:
+        session.add(APIUsage(user_id="user-1", calls_count=3, last_reset=PERIOD_START))
+        session.commit()
+
+    usage = UsageAccountant(session_factory, flush_interval=60)
+    service = APIService(session_factory.factory(), usage=usage)
+    user = _user(api_calls_limit=3)
+    assert not await service.check_usage_limit(user)
+
+    user.subscription.current_period_start = NEXT_PERIOD_START
+    user.subscription.current_period_end = datetime(2026, 5, 1)
+    assert await service.check_usage_limit(user)
+    await service.track_api_call(user, "/api/v1/chat", 0.05, 200)
+    await service.track_api_call(user, "/api/v1/chat", 0.05, 200)
+    await usage.flush()
+
+    with session_factory.factory() as session:
+        row = session.query(APIUsage).one()
+        assert row.calls_count == 2
+        assert (row.last_reset, row.next_reset) == (
+            NEXT_PERIOD_START,
+            datetime(2026, 5, 1),
+        )
+    assert usage.period_usage("user-1", lambda: 0) == 2
+    assert await service.check_usage_limit(user)
+    await usage.close()
@@ -0,0 +1,180 @@
+"""Test SQL-side usage analytics over hourly rollups."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.models.api_call import APICall, APICallRollup
+from src.models.declarative_base import Base
+from src.services.api_service import APIService
+from src.services.usage_accounting import UsageAccountant
+from src.services.usage_analytics import UsageAnalytics, update_rollups
+
+BASE = datetime(2026, 3, 1, 10, 0)
+
+
+@pytest.fixture
+def factory():
+    """Sessions on a private in-memory database."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _call(minutes, endpoint="/api/v1/chat", ms=50, status=200, user_id="user-1"):
+    return {
+        "user_id": user_id,
+        "endpoint": endpoint,
+        "method": "POST",
+        "status_code": status,
+        "response_time": ms,
+        "created_at": BASE + timedelta(minutes=minutes),
+    }
+
+
+def _store(factory, calls):
+    with factory() as session:
+        session.execute(insert(APICall), calls)
+        update_rollups(session, calls)
+        session.commit()
+
+
+def _expected(calls, start, end):
+    """Brute-force summary over raw calls, in the units of the old code."""
+    selected = [c for c in calls if start <= c["created_at"] < end]
+    seconds = [c["response_time"] / 1000 for c in selected]
+    endpoints = {}
+    for call in selected:
+        endpoints[call["endpoint"]] = endpoints.get(call["endpoint"], 0) + 1
+    return {
+        "total_calls": len(selected),
+        "response_time_distribution": {
+            "<100ms": len([t for t in seconds if t < 0.1]),
+            "100-200ms": len([t for t in seconds if 0.1 <= t < 0.2]),
+            "200-300ms": len([t for t in seconds if 0.2 <= t < 0.3]),
+            "300-400ms": len([t for t in seconds if 0.3 <= t < 0.4]),
+            ">400ms": len([t for t in seconds if t >= 0.4]),
+        },
+        "endpoint_usage": endpoints,
+        "error_rate": len([c for c in selected if c["status_code"] >= 400])
+        / len(selected),
+        "average_response_time": sum(seconds) / len(seconds),
+    }
+
+
+CALLS = [
+    _call(-30, ms=99),
+    _call(5, ms=100),
+    _call(15, "/api/v1/embed", ms=250, status=500),
+    _call(59, ms=399),
+    _call(60, "/api/v1/embed", ms=400, status=429),
+    _call(125, ms=1200),
+    _call(170, "/api/v1/embed", ms=180),
+    _call(200, ms=30),
+    _call(20, ms=5000, user_id="user-2"),
+]
+
+
+def test_rollups_accumulate_across_batches(factory):
+    """Test that a second batch adds to existing hourly rows."""
+    _store(factory, CALLS[:3])
+    _store(factory, [_call(50, ms=150, status=503)])
+
+    with factory() as session:
+        row = (
+            session.query(APICallRollup)
+            .filter_by(user_id="user-1", hour=BASE, endpoint="/api/v1/chat")
+            .one()
+        )
+        assert (row.calls, row.errors, row.total_response_time) == (2, 1, 250)
+        assert (row.rt_lt_100, row.rt_100_200) == (0, 2)
+        assert session.query(APICallRollup).count() == 3
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [
+        (BASE - timedelta(hours=1), BASE + timedelta(hours=4)),
+        (BASE + timedelta(minutes=10), BASE + timedelta(minutes=190)),
+        (BASE + timedelta(minutes=1), BASE + timedelta(minutes=59)),
+    ],
+)
+def test_summary_matches_raw_calls(factory, start, end):
+    """Test that rollups plus raw edge hours equal a scan of every call."""
+    _store(factory, CALLS)
+    with factory() as session:
+        summary = UsageAnalytics(session).summary("user-1", start, end)
+    expected = _expected([c for c in CALLS if c["user_id"] == "user-1"], start, end)
+    for field in ("error_rate", "average_response_time"):
+        assert summary.pop(field) == pytest.approx(expected.pop(field))
+    assert summary == expected
+
+
+def test_summary_accepts_aware_datetimes(factory):
+    """Test that timezone-aware bounds are compared as UTC."""
+    _store(factory, CALLS)
+    start = (BASE + timedelta(hours=1)).replace(tzinfo=timezone.utc)
+    with factory() as session:
+        summary = UsageAnalytics(session).summary(
+            "user-1",
+            start.astimezone(timezone(timedelta(hours=2))),
+            start + timedelta(hours=2),
+        )
+    assert summary["total_calls"] == 3
+    assert summary["endpoint_usage"] == {"/api/v1/embed": 2, "/api/v1/chat": 1}
+
+
+@pytest.mark.asyncio
+async def test_flush_maintains_rollups(factory):
+    """Test that the usage accountant's flush updates rollups."""
+    usage = UsageAccountant(factory, flush_interval=60)
+    await usage.record_call("user-1", "/api/v1/chat", 0.25, 200)
+    await usage.record_call("user-1", "/api/v1/chat", 0.05, 500)
+    await usage.flush()
+    await usage.close()
+
+    now = datetime.now(timezone.utc)
+    with factory() as session:
+        assert session.query(APICallRollup).one().calls == 2
+        stats = UsageAnalytics(session).endpoint_stats(now - timedelta(hours=2), now)
+    assert stats["/api/v1/chat"]["calls"] == 2
+    assert stats["/api/v1/chat"]["errors"] == 1
+    assert stats["/api/v1/chat"]["total_response_time"] == 300
+
+
+@pytest.mark.asyncio
+async def test_api_service_analytics(factory):
+    """Test usage analytics and performance recommendations from rollups."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    calls = [
+        dict(_call(0, ms=100), created_at=now - timedelta(hours=3)),
+        dict(_call(0, ms=100), created_at=now - timedelta(hours=2)),
+        dict(_call(0, "/api/v1/embed", ms=2000), created_at=now - timedelta(hours=1)),
+        dict(_call(0, ms=100), created_at=now - timedelta(hours=30)),
+    ]
+    _store(factory, calls)
+
+    with factory() as session:
+        service = APIService(session, usage=UsageAccountant(factory))
+        subscription = SimpleNamespace(
+            current_period_start=now - timedelta(days=2),
+            current_period_end=now + timedelta(days=1),
+        )
+        user = SimpleNamespace(id="user-1", subscription=subscription)
+        analytics = await service.get_usage_analytics(user)
+        performance = await service.optimize_api_performance()
+
+    assert analytics["total_calls"] == 4
+    assert analytics["endpoint_usage"] == {"/api/v1/chat": 3, "/api/v1/embed": 1}
+    assert performance["average_response_time"] == pytest.approx(2.2 / 3)
+    assert performance["slow_endpoints"] == {"/api/v1/embed": pytest.approx(2.0)}
+    assert performance["recommendations"][0]["issue"] == "High response time"
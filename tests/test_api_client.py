@@ -25,9 +25,11 @@ from bleujs.api_client import (
     EmbeddingResponse,
     GenerationResponse,
     InvalidRequestError,
+    MemoryCache,
     Model,
     NetworkError,
     RateLimitError,
+    SQLiteCache,
     ValidationError,
 )
 
@@ -632,6 +634,230 @@ class TestErrorHandling:
             client.chat([{"role": "user", "content": "Hello"}])
 
 
+SSE_BODY = (
+    'data: {"choices": [{"index": 0, "delta": {"content": "Hel"}}]}\n\n'
+    ": keep-alive\n\n"
+    'data: {"choices": [{"index": 0, "delta": {"content": "lo"}}]}\n\n'
+    'data: {"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}\n\n'
+    "data: [DONE]\n\n"
+)
+
+
+def _stream_client(api_key, handler):
+    """Client whose HTTP transport is served by handler(request)."""
+    client = BleuAPIClient(api_key=api_key)
+    client._client = httpx.Client(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestChatStream:
+    """Test streaming chat completions"""
+
+    def test_chat_stream_yields_deltas(self, mock_api_key):
+        """Test that SSE chunks are yielded as text deltas"""
+        if not HTTPX_AVAILABLE:
+            pytest.skip("httpx not installed")
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(
+                200,
+                text=SSE_BODY,
+                headers={"Content-Type": "text/event-stream"},
+            )
+
+        client = _stream_client(mock_api_key, handler)
+        deltas = list(client.chat_stream([{"role": "user", "content": "Hello"}]))
+
+        assert deltas == ["Hel", "lo"]
+        assert requests[0].headers["Accept"] == "text/event-stream"
+        assert b'"stream":true' in requests[0].content
+
+    def test_chat_stream_error_event(self, mock_api_key):
+        """Test that an error event in the stream raises"""
+        if not HTTPX_AVAILABLE:
+            pytest.skip("httpx not installed")
+
+        def handler(request):
+            return httpx.Response(200, text='data: {"error": {"message": "boom"}}\n\n')
+
+        client = _stream_client(mock_api_key, handler)
+        with pytest.raises(BleuAPIError, match="boom"):
+            list(client.chat_stream([{"role": "user", "content": "Hello"}]))
+
+    def test_chat_stream_http_error(self, mock_api_key):
+        """Test that a non-200 status is mapped like non-streaming calls"""
+        if not HTTPX_AVAILABLE:
+            pytest.skip("httpx not installed")
+
+        def handler(request):
+            return httpx.Response(401, json={"error": {"message": "bad key"}})
+
+        client = _stream_client(mock_api_key, handler)
+        with pytest.raises(AuthenticationError):
+            list(client.chat_stream([{"role": "user", "content": "Hello"}]))
+
+
+def _embed_handler(requests, rate_limited=()):
+    """Embed endpoint encoding each text's number as its vector.
+
+    Requests whose first text is in rate_limited get one 429 first.
+    """
+    import json
+
+    rate_limited = set(rate_limited)
+
+    def handler(request):
+        texts = json.loads(request.content)["input"]
+        requests.append(texts)
+        if texts[0] in rate_limited:
+            rate_limited.discard(texts[0])
+            return httpx.Response(
+                429,
+                json={"error": {"message": "slow down"}},
+                headers={"Retry-After": "0"},
+            )
+        data = [{"embedding": [float(t)], "index": i} for i, t in enumerate(texts)]
+        return httpx.Response(200, json={"object": "list", "data": data})
+
+    return handler
+
+
+class TestEmbedMany:
+    """Test batched, concurrent embeddings"""
+
+    def test_embed_many_preserves_order(self, mock_api_key):
+        """Test that inputs beyond 100 are batched and yielded in order"""
+        if not HTTPX_AVAILABLE:
+            pytest.skip("httpx not installed")
+        requests = []
+        client = _stream_client(mock_api_key, _embed_handler(requests))
+
+        texts = (str(i) for i in range(250))
+        vectors = list(client.embed_many(texts, batch_size=100, concurrency=3))
+
+        assert vectors == [[float(i)] for i in range(250)]
+        assert sorted(len(batch) for batch in requests) == [50, 100, 100]
+
+    def test_embed_many_retries_rate_limited_batch(self, mock_api_key):
+        """Test that a RateLimitError is waited out and the batch retried"""
+        if not HTTPX_AVAILABLE:
+            pytest.skip("httpx not installed")
+        requests = []
+        client = _stream_client(mock_api_key, _embed_handler(requests, {"10"}))
+
+        vectors = list(client.embed_many(map(str, range(30)), batch_size=10))
+
+        assert vectors == [[float(i)] for i in range(30)]
+        assert [batch[0] for batch in requests].count("10") == 2
+
+    def test_embed_many_rate_limit_retries_once_per_attempt(self, mock_api_key):
+        """Test that batches get max_retries attempts, or one without retries"""
+        if not HTTPX_AVAILABLE:
+            pytest.skip("httpx not installed")
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(
+                429,
+                json={"error": {"message": "slow down"}},
+                headers={"Retry-After": "0"},
+            )
+
+        client = _stream_client(mock_api_key, handler)
+        with pytest.raises(RateLimitError):
+            list(client.embed_many(["text"]))
+        assert len(requests) == client.max_retries
+
+        requests.clear()
+        client.retry_on_rate_limit = False
+        with pytest.raises(RateLimitError):
+            list(client.embed_many(["text"]))
+        assert len(requests) == 1
+
+    def test_embed_many_is_lazy(self, mock_api_key):
+        """Test that only the in-flight window of texts is consumed"""
+        if not HTTPX_AVAILABLE:
+            pytest.skip("httpx not installed")
+        consumed = []
+
+        def texts():
+            for i in range(10_000):
+                consumed.append(i)
+                yield str(i)
+
+        client = _stream_client(mock_api_key, _embed_handler([]))
+        vectors = client.embed_many(texts(), batch_size=10, concurrency=2)
+        assert next(vectors) == [0.0]
+        vectors.close()
+        assert len(consumed) <= 30
+
+    def test_embed_many_invalid_batch_size(self, client):
+        """Test that batch_size above the API limit is rejected"""
+        with pytest.raises(ValidationError):
+            list(client.embed_many(["text"], batch_size=101))
+
+
+MODELS_BODY = {
+    "object": "list",
+    "data": [
+        {"id": "bleu-chat-v1", "object": "model", "created": 1, "owned_by": "bleujs"}
+    ],
+}
+
+
+class TestResponseCache:
+    """Test client-side response caching"""
+
+    def test_memory_cache_ttl_and_lru(self):
+        """Test that entries expire and the least recently used is evicted"""
+        cache = MemoryCache(max_entries=2)
+        cache.set("a", "1", ttl=60)
+        cache.set("b", "2", ttl=60)
+        cache.get("a")
+        cache.set("c", "3", ttl=60)
+        assert (cache.get("a"), cache.get("b"), cache.get("c")) == ("1", None, "3")
+
+        cache.set("d", "4", ttl=0)
+        assert cache.get("d") is None
+
+    def test_sqlite_cache_persists(self, tmp_path):
+        """Test that a SQLite cache survives reopening"""
+        path = str(tmp_path / "cache" / "responses.db")
+        first = SQLiteCache(path)
+        first.set("key", '{"x": 1}', ttl=60)
+        first.set("old", "{}", ttl=-1)
+        first.close()
+
+        second = SQLiteCache(path)
+        assert second.get("key") == '{"x": 1}'
+        assert second.get("old") is None
+        second.close()
+
+    def test_client_caches_idempotent_calls(self, mock_api_key):
+        """Test that list_models is cached and chat is not"""
+        if not HTTPX_AVAILABLE:
+            pytest.skip("httpx not installed")
+        paths = []
+
+        def handler(request):
+            paths.append(request.url.path)
+            if request.url.path.endswith("/models"):
+                return httpx.Response(200, json=MODELS_BODY)
+            return httpx.Response(200, json={"content": "Hi"})
+
+        client = _stream_client(mock_api_key, handler)
+        client.cache = MemoryCache()
+        assert client.list_models()[0].id == "bleu-chat-v1"
+        assert client.list_models()[0].id == "bleu-chat-v1"
+        client.chat([{"role": "user", "content": "Hello"}])
+        client.chat([{"role": "user", "content": "Hello"}])
+
+        assert paths == ["/api/v1/models", "/api/v1/chat", "/api/v1/chat"]
+
+
 class TestRequestRetry:
     """Test request retry logic"""
 
@@ -2,6 +2,7 @@
 Tests for AsyncBleuAPIClient (async API client).
 """
 
+import asyncio
 import os
 from unittest.mock import AsyncMock, Mock, patch
 
@@ -21,6 +22,8 @@ try:
         ChatCompletionResponse,
         EmbeddingResponse,
         GenerationResponse,
+        MemoryCache,
+        RateLimitError,
     )
 
     ASYNC_CLIENT_AVAILABLE = True
@@ -88,6 +91,74 @@ class TestAsyncChat:
         assert isinstance(response, ChatCompletionResponse)
         assert response.content == "Hi!"
 
+    @pytest.mark.asyncio
+    async def test_async_chat_stream_yields_deltas(self, async_client):
+        """Async chat_stream yields deltas from server-sent events."""
+        body = (
+            'data: {"choices": [{"delta": {"content": "Hi"}}]}\n\n'
+            'data: {"choices": [{"delta": {"content": "!"}}]}\n\n'
+            "data: [DONE]\n\n"
+        )
+        async_client._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, text=body)
+            )
+        )
+        deltas = [
+            delta
+            async for delta in async_client.chat_stream(
+                [{"role": "user", "content": "Hello"}]
+            )
+        ]
+        assert deltas == ["Hi", "!"]
+
+    @pytest.mark.asyncio
+    async def test_async_embed_many_preserves_order(self, async_client):
+        """Async embed_many batches large inputs and yields vectors in order."""
+        import json
+
+        sizes = []
+
+        def handler(request):
+            texts = json.loads(request.content)["input"]
+            sizes.append(len(texts))
+            data = [{"embedding": [float(t)]} for t in texts]
+            return httpx.Response(200, json={"object": "list", "data": data})
+
+        async_client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        vectors = [
+            vector
+            async for vector in async_client.embed_many(
+                (str(i) for i in range(250)), concurrency=3
+            )
+        ]
+        assert vectors == [[float(i)] for i in range(250)]
+        assert sorted(sizes) == [50, 100, 100]
+
+    @pytest.mark.asyncio
+    async def test_async_embed_many_rate_limit_retries(self, async_client):
+        """Async embed_many retries 429s once per attempt, or not at all."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(
+                429,
+                json={"error": {"message": "slow down"}},
+                headers={"Retry-After": "0"},
+            )
+
+        async_client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with pytest.raises(RateLimitError):
+            [vector async for vector in async_client.embed_many(["text"])]
+        assert len(requests) == async_client.max_retries
+
+        requests.clear()
+        async_client.retry_on_rate_limit = False
+        with pytest.raises(RateLimitError):
+            [vector async for vector in async_client.embed_many(["text"])]
+        assert len(requests) == 1
+
 
 class TestAsyncHealth:
     """Test async health()."""
@@ -103,3 +174,49 @@ class TestAsyncHealth:
         result = await async_client.health()
         assert isinstance(result, dict)
         assert result.get("status") == "ok"
+
+
+MODEL = {"id": "bleu-chat-v1", "object": "model", "created": 1, "owned_by": "bleujs"}
+
+
+class TestAsyncCoalescing:
+    """Test single-flight coalescing and caching of idempotent calls."""
+
+    @staticmethod
+    def _models_transport(calls):
+        async def handler(request):
+            calls.append(request.url.path)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"object": "list", "data": [MODEL]})
+
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_request(self, async_client):
+        """Concurrent identical list_models() calls make one HTTP request."""
+        calls = []
+        async_client._client = self._models_transport(calls)
+
+        results = await asyncio.gather(*(async_client.list_models() for _ in range(20)))
+
+        assert calls == ["/api/v1/models"]
+        assert all(r[0].id == "bleu-chat-v1" for r in results)
+        # Without a cache, a later call goes to the network again
+        await async_client.list_models()
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_call(self, async_client):
+        """Cancelling one waiter leaves the shared request running for others."""
+        calls = []
+        async_client._client = self._models_transport(calls)
+        async_client.cache = MemoryCache()
+
+        first = asyncio.ensure_future(async_client.list_models())
+        second = asyncio.ensure_future(async_client.list_models())
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert (await second)[0].id == "bleu-chat-v1"
+        await async_client.list_models()
+        assert calls == ["/api/v1/models"]
@@ -9,7 +9,7 @@ by patching sys.argv during invoke so the runner doesn't see them.
 import os
 import sys
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -155,6 +155,25 @@ class TestCLIHealthNoKey:
         assert "API key" in result.output or "key" in result.output.lower()
 
 
+class TestCLIChatStream:
+    """Test bleu chat --stream."""
+
+    def test_chat_stream_prints_deltas(self, runner):
+        """bleu chat --stream prints deltas as one line."""
+        client = MagicMock()
+        client.chat_stream.return_value = iter(["Hel", "lo"])
+        with patch("src.bleujs.cli.get_client", return_value=client):
+            result = runner.invoke(cli, ["chat", "Hello", "--stream"])
+        assert result.exit_code == 0
+        assert result.output == "Hello\n"
+        client.chat.assert_not_called()
+
+    def test_chat_stream_rejects_json(self, runner):
+        """bleu chat --stream --json exits non-zero."""
+        result = runner.invoke(cli, ["chat", "Hello", "--stream", "--json"])
+        assert result.exit_code != 0
+
+
 class TestCLIHelp:
     """Test top-level help."""
 
@@ -16,6 +16,7 @@ from src.ml.enhanced_xgboost import (
     PerformanceConfig,
     PerformanceOptimizer,
     QuantumFeatureConfig,
+    QuantumFeatureProcessor,
     SecurityConfig,
 )
 from src.ml.factory import ModelFactory
@@ -105,6 +106,49 @@ class TestEnhancedXGBoost:
         assert loaded.feature_importance is not None
         assert len(loaded.training_history) == len(model.training_history)
 
+    def test_quantum_transformation_chunking(self):
+        """Test that the vectorized transformation is chunk-size independent."""
+        pytest.importorskip("qiskit")
+        X = np.random.default_rng(0).normal(size=(50, 4))
+        whole = QuantumFeatureProcessor(
+            QuantumFeatureConfig(n_qubits=4, random_state=7)
+        ).process_features(X)
+        processor = QuantumFeatureProcessor(
+            QuantumFeatureConfig(n_qubits=4, random_state=7, chunk_size=8)
+        )
+        np.testing.assert_array_equal(processor.process_features(X), whole)
+
+        streamed = np.concatenate(
+            list(processor.iter_process_features([X[:13], X[13:]]))
+        )
+        np.testing.assert_array_equal(streamed, whole)
+
+        buffer = X.astype(np.float32)
+        result = processor.process_features(buffer, out=buffer)
+        assert result is buffer
+        assert result.dtype == np.float32
+
+    def test_optimize_hyperparameters_processes_features_once(self, monkeypatch):
+        """Test that tuning reuses one processed feature matrix across trials."""
+        model = EnhancedXGBoost(
+            quantum_config=QuantumFeatureConfig(n_qubits=4, random_state=42),
+            performance_config=PerformanceConfig(use_gpu=False),
+        )
+        calls = []
+        original = model.quantum_processor.process_features
+
+        def counting_process_features(features, *args, **kwargs):
+            calls.append(len(features))
+            return original(features, *args, **kwargs)
+
+        monkeypatch.setattr(
+            model.quantum_processor, "process_features", counting_process_features
+        )
+        X, y = make_classification(n_samples=120, n_features=4, random_state=42)
+        best = model.optimize_hyperparameters(X, y, n_trials=4, n_jobs=2, n_splits=3)
+        assert calls == [120]
+        assert {"max_depth", "learning_rate", "n_estimators"} <= set(best)
+
 
 class TestModelFactory:
     """Test ModelFactory functionality."""
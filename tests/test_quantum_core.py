@@ -145,6 +145,81 @@ class TestQuantumState:
         assert state.state_vector is not None
         assert len(state.state_vector) == 4
 
+    def test_apply_gate_matches_qiskit(self):
+        """Test native gate application against Qiskit's statevector."""
+        from qiskit.quantum_info import Statevector, random_unitary
+
+        state = QuantumState(4, seed=0)
+        for seed, targets in enumerate([[0], [2, 1], [3], [1, 3, 0], [2]]):
+            unitary = random_unitary(2 ** len(targets), seed=seed).data
+            state.apply_gate(unitary, targets)
+
+        expected = Statevector.from_instruction(state.circuit).data
+        assert np.allclose(state.get_state_vector(), expected)
+        assert np.isclose(state.get_probabilities().sum(), 1.0)
+
+    def test_bell_state_probabilities(self):
+        """Test probabilities of a Bell state built from H and CNOT."""
+        hadamard = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
+        cnot = np.array(
+            [[1, 0, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0], [0, 1, 0, 0]], dtype=complex
+        )
+        state = QuantumState(2, record_circuit=False)
+        state.apply_gate(hadamard, [0])
+        state.apply_gate(cnot, [0, 1])
+
+        assert state.circuit is None
+        assert np.allclose(state.get_probabilities(), [0.5, 0, 0, 0.5])
+
+    def test_reduced_density_matrix_matches_qiskit(self):
+        """Test the vectorized partial trace against Qiskit."""
+        from qiskit.quantum_info import partial_trace, random_statevector
+
+        statevector = random_statevector(2**5, seed=7)
+        state = QuantumState(5)
+        state.amplitudes = statevector.data.copy()
+
+        expected = partial_trace(statevector, [0, 3]).data
+        assert np.allclose(state.get_reduced_density_matrix([4, 1, 2]), expected)
+
+    def test_bell_state_entanglement(self):
+        """Test entropy and concurrence of a Bell pair inside a larger state."""
+        state = QuantumState(3)
+        state.amplitudes = np.zeros(8, dtype=complex)
+        state.amplitudes[[0b000, 0b101]] = 1 / np.sqrt(2)
+
+        assert np.isclose(state.get_entanglement_entropy([0]), 1.0)
+        assert np.isclose(state.get_entanglement_entropy([1]), 0.0)
+        assert np.isclose(state.get_concurrence(0, 2), 1.0)
+        assert np.isclose(state.get_concurrence(0, 1), 0.0)
+        assert np.isclose(state.get_purity(), 1.0)
+
+    def test_sample_counts(self):
+        """Test vectorized shot sampling on a GHZ state."""
+        state = QuantumState(3, seed=1)
+        state.amplitudes = np.zeros(8, dtype=complex)
+        state.amplitudes[[0b000, 0b111]] = 1 / np.sqrt(2)
+
+        counts = state.sample_counts(1000)
+        assert set(counts) == {"000", "111"}
+        assert sum(counts.values()) == 1000
+        assert set(state.sample_counts(200, qubits=[2, 0])) == {"00", "11"}
+
+    def test_measure_all_collapses_state(self):
+        """Test that measuring every qubit leaves a basis state."""
+        state = QuantumState(3, seed=2)
+        state.amplitudes = np.full(8, 1 / np.sqrt(8), dtype=complex)
+
+        results = state.measure_all()
+        index = sum(bit << qubit for qubit, bit in results.items())
+        assert np.isclose(state.get_probabilities()[index], 1.0)
+
+    def test_apply_gate_rejects_invalid_targets(self):
+        """Test that out-of-range target qubits are rejected."""
+        state = QuantumState(2)
+        with pytest.raises(ValueError):
+            state.apply_gate(np.eye(2, dtype=complex), [2])
+
 
 class TestQuantumProcessor:
     """Test quantum processor functionality."""
@@ -0,0 +1,111 @@
+"""Tests for the chunked AES-GCM stream format in bleu_ai EncryptionManager."""
+
+import io
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cryptography")
+pytest.importorskip("msgpack")
+
+from cryptography.exceptions import InvalidTag
+
+from src.bleu_ai.security import stream_cipher
+from src.bleu_ai.security.encryption_manager import STREAM_MAGIC, EncryptionManager
+
+
+@pytest.fixture
+def manager():
+    return EncryptionManager()
+
+
+@pytest.fixture
+def array():
+    return np.random.default_rng(0).normal(size=(500, 13))
+
+
+def _encrypt(manager, array, chunk_size=1000):
+    sink = io.BytesIO()
+    manager.encrypt_array_stream(array, sink, chunk_size=chunk_size)
+    return sink.getvalue()
+
+
+def test_encrypt_data_round_trip(manager, array):
+    """Test that arrays use the stream format and decrypt unchanged."""
+    encrypted = manager.encrypt_data(array)
+    assert encrypted.startswith(STREAM_MAGIC)
+    np.testing.assert_array_equal(manager.decrypt_data(encrypted), array)
+    empty = manager.decrypt_data(manager.encrypt_data(np.zeros((0, 3))))
+    assert empty.shape == (0, 3)
+
+
+def test_decrypts_into_preallocated_buffer_and_memmap(manager, array, tmp_path):
+    """Test decryption into a caller's array and into a .npy memory map."""
+    source = tmp_path / "features.enc"
+    manager.encrypt_array_stream(array, str(source), chunk_size=1000)
+
+    out = np.empty_like(array)
+    assert manager.decrypt_array_stream(str(source), out=out) is out
+    np.testing.assert_array_equal(out, array)
+
+    mapped = manager.decrypt_array_stream(str(source), mmap_path=tmp_path / "f.npy")
+    assert isinstance(mapped, np.memmap)
+    np.testing.assert_array_equal(np.load(tmp_path / "f.npy"), array)
+
+
+def test_random_access_reads_only_needed_chunks(manager, array, monkeypatch):
+    """Test that reading a row range decrypts just the chunks it spans."""
+    reader = manager.open_stream(io.BytesIO(_encrypt(manager, array)))
+    decrypted = []
+    original = reader.read_chunk
+    monkeypatch.setattr(
+        reader, "read_chunk", lambda i: decrypted.append(i) or original(i)
+    )
+
+    np.testing.assert_array_equal(reader.read_rows(100, 110), array[100:110])
+    # Rows 100-109 are bytes 10400-11439, inside chunks 10 and 11
+    assert decrypted == [10, 11]
+
+
+@pytest.mark.parametrize(
+    "tamper",
+    [
+        lambda data: data[:-100],  # truncated final chunk
+        lambda data: data[:60] + bytes([data[60] ^ 1]) + data[61:],  # header
+        lambda data: data[:-1] + bytes([data[-1] ^ 1]),  # tag
+    ],
+)
+def test_tampering_is_detected(manager, array, tamper):
+    """Test that modified or truncated streams fail authentication."""
+    with pytest.raises((InvalidTag, ValueError)):
+        manager.decrypt_data(tamper(_encrypt(manager, array)))
+
+
+def test_streams_use_their_own_keys(manager, array, monkeypatch):
+    """Test that streams sharing a nonce prefix still never share a keystream."""
+    urandom = os.urandom
+    monkeypatch.setattr(
+        stream_cipher.os, "urandom", lambda n: bytes(n) if n == 7 else urandom(n)
+    )
+    first, second = _encrypt(manager, array), _encrypt(manager, array)
+
+    offset = manager.open_stream(io.BytesIO(first))._data_offset
+    assert first[offset : offset + 1016] != second[offset : offset + 1016]
+    for encrypted in (first, second):
+        np.testing.assert_array_equal(manager.decrypt_data(encrypted), array)
+
+
+def test_file_stream_round_trip(manager, tmp_path):
+    """Test constant-memory file encryption and atomic decryption."""
+    source = tmp_path / "model.bin"
+    source.write_bytes(os.urandom(3 * 4096 + 7))
+    manager.encrypt_file_stream(str(source), str(tmp_path / "model.enc"), 4096)
+    manager.decrypt_file_stream(str(tmp_path / "model.enc"), str(tmp_path / "out"))
+    assert (tmp_path / "out").read_bytes() == source.read_bytes()
+
+    other = EncryptionManager()
+    with pytest.raises(InvalidTag):
+        other.decrypt_file_stream(str(tmp_path / "model.enc"), str(tmp_path / "bad"))
+    assert not (tmp_path / "bad").exists()
+    assert not (tmp_path / "bad.partial").exists()